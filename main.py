@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import argparse
 import sys
 import time
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Optional
 
 import shutil
@@ -16,14 +17,17 @@ from rich.table import Table
 
 from src.config import load_config
 from src.discovery.web_sources import build_default_sources
-from src.discovery.fetch import fetch_listings
-from src.ranking.score import score_listings
-from src.storage.save import (
-    ensure_dirs,
-    save_listings_json,
-    load_seen_urls,
-    save_seen_urls,
-)
+from src.monitor.dashboard import stream_monitor
+from src.monitor.metrics import MonitorMetrics, start_metrics_server
+from src.monitor.pipeline import run_guarded, run_tick
+from src.monitor.profiles import load_profiles, run_shared_monitor
+from src.monitor.soak import run_soak
+from src.ranking.companies import load_company_matcher
+from src.ranking.rescore import rescore_archive
+from src.storage.save import ensure_dirs
+from src.storage.index import search_index, count_indexed
+from src.storage.export import ROW_GROUP_SIZE, export_listings, parquet_available
+from src.storage.retention import RetentionReport, run_retention, search_cold
 
 # Outreach imports
 from src.outreach.generate import (
@@ -37,27 +41,37 @@ from src.outreach.generate import (
     write_personligt_brev_docx,
     write_cv_highlights_docx,
 )
+from src.outreach.tracker import FOLLOW_UP_DAYS, open_tracker
 
 
-def run_monitor(console: Console) -> None:
+def run_monitor(console: Console, live: bool = False, metrics: Optional[MonitorMetrics] = None) -> None:
     cfg = load_config("config.yaml")
     ensure_dirs(cfg)
 
     sources = build_default_sources(cfg)
     console.print(f"[bold]Sources:[/bold] {len(sources)}")
 
-    listings = fetch_listings(cfg, sources)
-    scored = score_listings(cfg, listings)
-    save_listings_json(cfg, scored)
-
-    seen = load_seen_urls(cfg)
-    new_items = [x for x in scored if x.url not in seen]
-
-    # Update seen with all current URLs
-    seen_updated = set(seen)
-    for x in scored:
-        seen_updated.add(x.url)
-    save_seen_urls(cfg, seen_updated)
+    def on_retention(report: RetentionReport) -> None:
+        console.print(
+            f"[dim]Retention: {report.expired} closed ad(s) moved to {cfg.output.data_dir}/cold/, "
+            f"{report.hot} open in listings.db, {report.blobs_removed} blob(s) removed "
+            f"({report.seconds:.2f}s)[/dim]"
+        )
+
+    # Score and show each query's results as soon as they arrive
+    stream = (lambda *a: stream_monitor(console, *a)) if live else None
+    tick = run_tick(
+        cfg,
+        sources,
+        matcher=load_company_matcher("companies.yaml"),
+        metrics=metrics,
+        stream=stream,
+        on_retention=on_retention,
+    )
+    if tick.queries < tick.all_queries:
+        console.print(f"[bold]Queries:[/bold] {tick.queries} of {tick.all_queries} (adaptive plan)")
+    new_items = tick.new_items
+    seen_count = tick.seen_count
 
     table = Table(title="NEW matches (Java + LIA) — since last run")
     table.add_column("Score", justify="right")
@@ -68,37 +82,363 @@ def run_monitor(console: Console) -> None:
 
     if not new_items:
         console.print("[yellow]No new matches since last run.[/yellow]")
-    else:
+    elif not live:  # the dashboard already shows them
         for item in new_items[:25]:
+            company = (item.company or "")[:28]
+            if item.target_company:
+                company = f"[bold magenta]★ {company[:26]}[/bold magenta]"
             table.add_row(
                 f"{item.score:.1f}",
                 (item.title or "")[:50],
-                (item.company or "")[:28],
+                company,
                 (item.location or "")[:18],
                 (item.url or "")[:80],
             )
         console.print(table)
 
-    console.print(f"\nSaved full list: [bold]{cfg.output.data_dir}/listings.json[/bold]")
-    console.print(f"Saved seen URLs: [bold]{cfg.output.data_dir}/seen_ads.json[/bold]")
+    targets = [x for x in new_items if x.target_company]
+    if targets:
+        console.print(
+            f"[bold magenta]★ {len(targets)} new ad(s) from companies in companies.yaml:[/bold magenta] "
+            + ", ".join(sorted({x.target_company for x in targets}))
+        )
+
+    console.print(f"\nAll open listings: [bold]{cfg.output.data_dir}/listings.json[/bold]")
+    console.print(f"Seen index: [bold]{seen_count}[/bold] ads in [bold]{cfg.output.data_dir}/seen/[/bold]")
+    console.print(f"Indexed history: [bold]{cfg.output.data_dir}/listings.db[/bold]")
 
 
-def run_monitor_daemon(console: Console, interval_minutes: int = 30) -> None:
+def run_monitor_profiles(console: Console, args: list[str]) -> None:
+    # Accept: python main.py profiles [profiles.yaml]
+    path = args[0] if args else "profiles.yaml"
+    if not Path(path).exists():
+        console.print(f"[red]{path} not found.[/red] Copy profiles.example.yaml and add one entry per student.")
+        return
+
+    profiles = load_profiles(path)
+    if not profiles:
+        console.print(f"[yellow]No profiles in {path}.[/yellow]")
+        return
+
+    web = [p.name for p in profiles if p.cfg.web_search.enabled]
+    if web:
+        console.print(
+            f"[yellow]web_search is not run in profiles mode[/yellow] (enabled for {', '.join(web)}); "
+            "those profiles only get JobTech results here."
+        )
+
+    sources = build_default_sources(profiles[0].cfg)
+    report = run_shared_monitor(profiles, sources)
+
+    console.print(
+        f"[bold]Profiles:[/bold] {len(report.profiles)} — "
+        f"{report.requests} JobTech requests instead of {report.requests_separate} "
+        f"({report.seconds:.1f}s)"
+    )
+
+    summary = Table(title="Per-profile results")
+    summary.add_column("Profile")
+    summary.add_column("Queries", justify="right")
+    summary.add_column("Kept", justify="right")
+    summary.add_column("New", justify="right")
+    summary.add_column("Seen", justify="right")
+    for r in report.profiles:
+        summary.add_row(r.name, str(r.queries), str(r.kept), str(len(r.new_items)), str(r.seen_count))
+    console.print(summary)
+
+    for r in report.profiles:
+        if not r.new_items:
+            continue
+        table = Table(title=f"NEW for {r.name}")
+        table.add_column("Score", justify="right")
+        table.add_column("Title")
+        table.add_column("Company")
+        table.add_column("Link")
+        for item in r.new_items[:10]:
+            company = (item.company or "")[:28]
+            if item.target_company:
+                company = f"[bold magenta]★ {company[:26]}[/bold magenta]"
+            table.add_row(f"{item.score:.1f}", (item.title or "")[:50], company, (item.url or "")[:80])
+        console.print(table)
+
+
+def run_monitor_daemon(console: Console, interval_minutes: Optional[int] = None) -> None:
+    cfg = load_config("config.yaml")
+    interval_minutes = interval_minutes or cfg.monitor.interval_minutes
+
+    metrics = MonitorMetrics()
+    server = start_metrics_server(metrics, cfg.monitor.metrics_host, cfg.monitor.metrics_port)
+
     console.print(
         f"[bold green]Monitor daemon started[/bold green] — checking every {interval_minutes} minutes. "
         "Press [bold]Stop[/bold] in PyCharm to end.\n"
     )
+    if server is not None:
+        host, port = server.server_address[:2]
+        console.print(f"[dim]Metrics: http://{host}:{port}/metrics[/dim]\n")
+
     while True:
-        try:
-            console.print(f"[dim]{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}[/dim] Running monitor…")
-            run_monitor(console)
-        except Exception as e:
-            console.print(f"[red]Monitor error:[/red] {e}")
+        console.print(f"[dim]{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}[/dim] Running monitor…")
+        run_guarded(
+            lambda: run_monitor(console, metrics=metrics),
+            metrics,
+            on_error=lambda e: console.print(f"[red]Monitor error:[/red] {e}"),
+        )
 
         console.print(f"[dim]Sleeping {interval_minutes} minutes…[/dim]\n")
         time.sleep(interval_minutes * 60)
 
 
+def run_search(console: Console, args: list[str]) -> None:
+    # Accept: python main.py search <words...> [--days N] [--limit N] [--include-cold]
+    parser = argparse.ArgumentParser(prog="main.py search")
+    parser.add_argument("words", nargs="*")
+    parser.add_argument("--days", type=int, default=None)
+    parser.add_argument("--limit", type=int, default=25)
+    parser.add_argument("--include-cold", action="store_true", help="also search listings retention has expired")
+    ns = parser.parse_args(args)
+
+    query = " ".join(ns.words).strip()
+    if not query:
+        query = input("Search history for: ").strip()
+
+    cfg = load_config("config.yaml")
+
+    started = time.perf_counter()
+    hits = search_index(cfg, query, days=ns.days, limit=ns.limit)
+    if ns.include_cold and len(hits) < ns.limit:
+        # Ranked open listings first, then closed ones newest first.
+        hits += search_cold(cfg, query, days=ns.days, limit=ns.limit - len(hits))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if not hits:
+        where = "indexed or cold" if ns.include_cold else "indexed"
+        console.print(f"[yellow]No {where} listings match:[/yellow] {query}")
+        return
+
+    window = f", last {ns.days} days" if ns.days else ""
+    table = Table(title=f"History search: {query}{window}")
+    table.add_column("First seen")
+    table.add_column("Score", justify="right")
+    table.add_column("Title")
+    table.add_column("Company")
+    table.add_column("Location")
+    table.add_column("Link")
+
+    for h in hits:
+        table.add_row(
+            h.first_seen[:10],
+            f"{h.score:.1f}",
+            (h.title or "")[:50] + (" [dim](closed)[/dim]" if h.closed else ""),
+            (h.company or "")[:28],
+            (h.location or "")[:18],
+            (h.url or "")[:80],
+        )
+    console.print(table)
+    console.print(
+        f"[dim]{len(hits)} hits from {count_indexed(cfg)} indexed listings"
+        f"{' and the cold archive' if ns.include_cold else ''} in {elapsed_ms:.1f} ms[/dim]"
+    )
+
+
+def run_rescore(console: Console, args: list[str]) -> None:
+    # Accept: python main.py rescore [--baseline old_config.yaml] [--days N] [--workers N]
+    parser = argparse.ArgumentParser(prog="main.py rescore")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--days", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    ns = parser.parse_args(args)
+
+    cfg = load_config("config.yaml")
+    baseline = load_config(ns.baseline) if ns.baseline else None
+
+    report = rescore_archive(
+        cfg,
+        baseline=baseline,
+        days=ns.days,
+        workers=ns.workers,
+        matcher=load_company_matcher("companies.yaml"),
+    )
+    if not report.partitions:
+        console.print(f"[yellow]No archived hits under {cfg.output.data_dir}/archive/raw yet.[/yellow]")
+        return
+
+    against = ns.baseline or "outcome at fetch time"
+    console.print(
+        f"[bold]Rescored[/bold] {report.records} raw hits ({report.ads} distinct ads) "
+        f"from {report.partitions} partitions in {report.seconds:.2f}s — baseline: {against}"
+    )
+    console.print(
+        f"Kept: {report.kept_before} → {report.kept_now}  "
+        f"([green]+{len(report.added)}[/green] / [red]-{len(report.removed)}[/red])"
+    )
+    console.print(
+        "Dropped now: " + ", ".join(f"{reason}={n}" for reason, n in report.dropped_now.items())
+    )
+    if report.partial:
+        console.print(
+            f"[yellow]Skipped {report.partial} headline-only hits[/yellow] (dropped by the title gates during a "
+            "two-phase fetch, so the full ad was never downloaded); relaxing title rules can't bring those back."
+        )
+
+    if report.added:
+        table = Table(title="ADDED by current config")
+        table.add_column("Score", justify="right")
+        table.add_column("Title")
+        table.add_column("Company")
+        table.add_column("Link")
+        for item in report.added[:25]:
+            table.add_row(
+                f"{item.score:.1f}",
+                (item.title or "")[:50],
+                (item.company or "")[:28],
+                (item.url or "")[:80],
+            )
+        console.print(table)
+
+    if report.removed:
+        table = Table(title="REMOVED by current config")
+        table.add_column("Gate")
+        table.add_column("Title")
+        table.add_column("Company")
+        table.add_column("Link")
+        for item, reason in report.removed[:25]:
+            table.add_row(
+                reason,
+                (item.title or "")[:50],
+                (item.company or "")[:28],
+                (item.url or "")[:80],
+            )
+        console.print(table)
+
+
+def run_export(console: Console, args: list[str]) -> None:
+    # Accept: python main.py export [--format parquet|csv] [--out DIR] [--days N] [--descriptions] [--row-group N]
+    #                               [--include-cold]
+    parser = argparse.ArgumentParser(prog="main.py export")
+    parser.add_argument("--format", choices=("parquet", "csv"), default="parquet")
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--days", type=int, default=None)
+    parser.add_argument("--descriptions", action="store_true")
+    parser.add_argument("--row-group", type=int, default=ROW_GROUP_SIZE)
+    parser.add_argument("--include-cold", action="store_true", help="also export listings retention has expired")
+    ns = parser.parse_args(args)
+
+    cfg = load_config("config.yaml")
+    if ns.format == "parquet" and not parquet_available():
+        console.print("[yellow]pyarrow is not installed[/yellow] (pip install pyarrow) — writing CSV instead.")
+
+    report = export_listings(
+        cfg,
+        format=ns.format,
+        out=Path(ns.out) if ns.out else None,
+        days=ns.days,
+        descriptions=ns.descriptions,
+        row_group_size=max(1, ns.row_group),
+        include_cold=ns.include_cold,
+    )
+    if not report.rows:
+        where = f"{cfg.output.data_dir}/listings.db"
+        if ns.include_cold:
+            where += f" and the cold archive ({cfg.output.data_dir}/cold/)"
+        window = f" from the last {ns.days} days" if ns.days else ""
+        console.print(f"[yellow]Nothing to export[/yellow] — {where} has no listings{window}; previous export left as is.")
+        return
+
+    console.print(
+        f"[bold]Exported[/bold] {report.rows} listings to {len(report.files)} {report.format} file(s) "
+        f"in {report.seconds:.2f}s"
+    )
+    for path in report.files[:12]:
+        console.print(f"  {path}")
+    if len(report.files) > 12:
+        console.print(f"  [dim]… {len(report.files) - 12} more[/dim]")
+
+
+def run_retention_now(console: Console, args: list[str]) -> None:
+    # Accept: python main.py retention [--if-due]
+    parser = argparse.ArgumentParser(prog="main.py retention")
+    parser.add_argument("--if-due", action="store_true", help="only run if compact_every_hours has passed")
+    ns = parser.parse_args(args)
+
+    cfg = load_config("config.yaml")
+    report = run_retention(cfg, force=not ns.if_due)
+    if not report.ran:
+        console.print("[yellow]Nothing to do[/yellow] — no listings.db yet, or the last run is recent.")
+        return
+
+    console.print(
+        f"[bold]Retention[/bold] in {report.seconds:.2f}s: {report.expired} closed ad(s) moved to the cold archive, "
+        f"{report.hot} open listing(s) left in listings.db"
+    )
+    console.print(
+        f"Seen index: -{report.seen_removed}   Blobs: -{report.blobs_removed}   Cache files: -{report.cache_removed}"
+    )
+    for path in report.cold_files:
+        console.print(f"  {path}")
+
+
+def run_soak_test(console: Console, args: list[str]) -> None:
+    # Accept: python main.py soak [--days 180] [--tick-minutes 30] [--ads-per-day 40]
+    #                             [--lifetime-days 21] [--fault-rate 0.002] [--seed 1] [--out DIR]
+    parser = argparse.ArgumentParser(prog="main.py soak")
+    parser.add_argument("--days", type=float, default=180)
+    parser.add_argument("--tick-minutes", type=float, default=30)
+    parser.add_argument("--ads-per-day", type=float, default=40)
+    parser.add_argument("--lifetime-days", type=float, default=21)
+    parser.add_argument("--fault-rate", type=float, default=0.002)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default=None)
+    ns = parser.parse_args(args)
+
+    cfg = load_config("config.yaml")
+    out = Path(ns.out or Path(cfg.output.data_dir) / "soak" / datetime.now().strftime("%Y%m%d-%H%M%S"))
+    console.print(
+        f"[bold]Soak:[/bold] {ns.days:g} simulated days of {ns.tick_minutes:g}-minute ticks "
+        f"against a stub board ({ns.ads_per_day:g} ads/day) → {out}"
+    )
+
+    def progress(tick: int, total: int) -> None:
+        if tick and tick % int(30 * 24 * 60 / ns.tick_minutes) == 0:
+            console.print(f"[dim]  day {tick * ns.tick_minutes / 1440:.0f}: tick {tick}/{total}[/dim]")
+
+    report = run_soak(
+        cfg,
+        out,
+        days=ns.days,
+        tick_minutes=ns.tick_minutes,
+        ads_per_day=ns.ads_per_day,
+        mean_lifetime_days=ns.lifetime_days,
+        fault_rate=ns.fault_rate,
+        seed=ns.seed,
+        progress=progress,
+    )
+
+    growth = report.latency_growth
+    colour = "red" if growth > 3 else "yellow" if growth > 1.5 else "green"
+    mb = lambda n: f"{n / 1e6:.1f} MB" if n is not None else "n/a"
+    errors = ", ".join(f"{k}={v}" for k, v in report.error_types.items()) or "none"
+
+    console.print(
+        f"{report.ticks} ticks in {report.seconds:.1f}s ({report.ticks / max(report.seconds, 1e-9):.0f} ticks/s), "
+        f"{report.ads_created} ads published, {report.seen} in the seen index, {report.expired} expired to cold"
+    )
+    console.print(f"Tick errors: {report.errors} ({errors})")
+    console.print(
+        f"Tick latency: day {report.baseline_day} {report.baseline_latency * 1000:.1f} ms → last day "
+        f"{report.last_day_latency * 1000:.1f} ms ([{colour}]x{growth:.1f}[/{colour}])"
+    )
+    console.print(f"RSS: {mb(report.rss_start)} → {mb(report.rss_end)}")
+
+    table = Table(title="Storage at end of run")
+    table.add_column("Part")
+    table.add_column("Size", justify="right")
+    for part, size in report.storage_end.items():
+        table.add_row(part, mb(size))
+    console.print(table)
+    console.print(f"Per-tick curves: [bold]{report.csv_path}[/bold]")
+
+
 def run_outreach(console: Console, mode: str = "cold") -> None:
     cfg = load_config("config.yaml")
     ensure_dirs(cfg)
@@ -139,25 +479,145 @@ def run_outreach(console: Console, mode: str = "cold") -> None:
     console.print(f"\nSaved outreach packs under: [bold]{cfg.output.applications_dir}[/bold]")
 
 
+def _iso_date(value: str) -> str:
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a date as YYYY-MM-DD, got {value!r}")
+
+
+def run_track(console: Console, args: list[str]) -> None:
+    # Accept:
+    #   python main.py track sent "Company AB" [--url URL] [--note TEXT] [--follow-up-days N]
+    #   python main.py track replied|rejected "Company AB" [--url URL] [--note TEXT]
+    #   python main.py track follow-up "Company AB" --on YYYY-MM-DD
+    #   python main.py track due [--days N]
+    #   python main.py track uncontacted
+    #   python main.py track history "Company AB"
+    parser = argparse.ArgumentParser(prog="main.py track")
+    sub = parser.add_subparsers(dest="cmd")
+    for name in ("sent", "replied", "rejected"):
+        p = sub.add_parser(name)
+        p.add_argument("company", nargs="+")
+        p.add_argument("--url", default="")
+        p.add_argument("--note", default="")
+        if name == "sent":
+            p.add_argument("--follow-up-days", type=int, default=FOLLOW_UP_DAYS)
+    p = sub.add_parser("follow-up")
+    p.add_argument("company", nargs="+")
+    p.add_argument("--on", required=True, type=_iso_date)
+    p.add_argument("--note", default="")
+    p = sub.add_parser("due")
+    p.add_argument("--days", type=int, default=7)
+    sub.add_parser("uncontacted")
+    p = sub.add_parser("history")
+    p.add_argument("company", nargs="+")
+    ns = parser.parse_args(args)
+
+    cfg = load_config("config.yaml")
+    ensure_dirs(cfg)
+
+    with open_tracker(cfg) as tracker:
+        company = " ".join(getattr(ns, "company", []) or []).strip()
+
+        if ns.cmd == "sent":
+            tracker.sent(company, url=ns.url, note=ns.note, follow_up_days=ns.follow_up_days)
+            state = tracker.get(company)
+            due = f", follow up {state.follow_up_due}" if state.follow_up_due else ""
+            console.print(f"[green]Sent:[/green] {company}{due}")
+        elif ns.cmd in ("replied", "rejected"):
+            tracker.record(ns.cmd, company, url=ns.url, note=ns.note)
+            console.print(f"[green]{ns.cmd.capitalize()}:[/green] {company}")
+        elif ns.cmd == "follow-up":
+            tracker.record("follow_up_due", company, due=ns.on, note=ns.note)
+            console.print(f"[green]Follow-up due {ns.on}:[/green] {company}")
+        elif ns.cmd == "uncontacted":
+            names = [c.name for c in load_companies("companies.yaml") if c.name]
+            todo = tracker.not_contacted(names)
+            console.print(f"[bold]Not contacted yet:[/bold] {len(todo)} of {len(names)} companies in companies.yaml")
+            for name in todo:
+                console.print(f"  {name}  [dim]{cfg.output.applications_dir}/{slugify(name)}[/dim]")
+        elif ns.cmd == "history":
+            events = tracker.history(company)
+            if not events:
+                console.print(f"[yellow]No events for:[/yellow] {company}")
+                return
+            table = Table(title=f"History: {company}")
+            table.add_column("When")
+            table.add_column("Event")
+            table.add_column("Due")
+            table.add_column("Listing")
+            table.add_column("Note")
+            for e in events:
+                table.add_row(e.ts[:16].replace("T", " "), e.type, e.due, e.url[:60], e.note[:40])
+            console.print(table)
+        else:
+            days = ns.days if ns.cmd == "due" else 7
+            started = time.perf_counter()
+            due = tracker.follow_ups_due(date.today() + timedelta(days=days))
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            if not due:
+                console.print(f"[green]No follow-ups due in the next {days} days.[/green]")
+            else:
+                today = date.today().isoformat()
+                table = Table(title=f"Follow-ups due within {days} days")
+                table.add_column("Due")
+                table.add_column("Company")
+                table.add_column("Status")
+                table.add_column("First contact")
+                for state in due:
+                    when = state.follow_up_due
+                    if when < today:
+                        when = f"[red]{when}[/red]"
+                    table.add_row(when, state.name, state.status, state.first_contact[:10])
+                console.print(table)
+            console.print(
+                f"[dim]{len(tracker.companies)} companies, {tracker.seq} events "
+                f"({tracker.tail} since last snapshot), query {elapsed_ms:.2f} ms[/dim]"
+            )
+
+
 def choose_mode(console: Console) -> str:
     console.print("\n[bold]Choose what to run:[/bold]")
     console.print("  1) Monitor LIA (run once)")
     console.print("  2) Outreach Builder (generate emails/letters)")
     console.print("  3) Monitor daemon (run continuously)")
-
-    choice = input("Enter 1, 2 or 3: ").strip()
+    console.print("  4) Search listing history")
+    console.print("  5) Rescore archived hits with current config (offline)")
+    console.print("  6) Monitor LIA with live dashboard")
+    console.print("  7) Monitor all profiles in profiles.yaml (shared fetch)")
+    console.print("  8) Follow-ups due (application tracker)")
+    console.print("  9) Export listing history (Parquet/CSV)")
+
+    choice = input("Enter 1-9: ").strip()
     if choice == "2":
         return "outreach"
     if choice == "3":
         return "daemon"
+    if choice == "4":
+        return "search"
+    if choice == "5":
+        return "rescore"
+    if choice == "6":
+        return "live"
+    if choice == "7":
+        return "profiles"
+    if choice == "8":
+        return "track"
+    if choice == "9":
+        return "export"
     return "monitor"
 
 
 def parse_arg(argv: list[str]) -> Optional[str]:
-    # Accept: python main.py monitor|outreach|daemon
+    # Accept: python main.py monitor|live|profiles|outreach|daemon|search|rescore|track|export|retention|soak
     if len(argv) >= 2:
         v = argv[1].strip().lower()
-        if v in ("monitor", "outreach", "daemon"):
+        if v in (
+            "monitor", "live", "profiles", "outreach", "daemon", "search",
+            "rescore", "track", "export", "retention", "soak",
+        ):
             return v
     return None
 
@@ -168,7 +628,23 @@ def main() -> None:
     mode = parse_arg(sys.argv) or choose_mode(console)
 
     if mode == "daemon":
-        run_monitor_daemon(console, interval_minutes=30)
+        run_monitor_daemon(console)
+    elif mode == "search":
+        run_search(console, sys.argv[2:])
+    elif mode == "live":
+        run_monitor(console, live=True)
+    elif mode == "profiles":
+        run_monitor_profiles(console, sys.argv[2:])
+    elif mode == "rescore":
+        run_rescore(console, sys.argv[2:])
+    elif mode == "track":
+        run_track(console, sys.argv[2:])
+    elif mode == "export":
+        run_export(console, sys.argv[2:])
+    elif mode == "retention":
+        run_retention_now(console, sys.argv[2:])
+    elif mode == "soak":
+        run_soak_test(console, sys.argv[2:])
     elif mode == "outreach":
         OUTREACH_MODE = "cold"  # change to "application" when replying to an ad
         run_outreach(console, mode=OUTREACH_MODE)
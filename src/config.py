@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 import yaml
 
@@ -22,6 +22,21 @@ class QueryConfig:
     max_per_query: int = 50
     add_remote_queries: bool = True
 
+    # Adaptive planning (see src/discovery/planner.py)
+    adaptive: bool = False
+    max_queries_per_run: int = 0  # 0 = run every query, only reorder
+    exploration: float = 1.0
+
+    # Server-side filtering (see build_search_params in src/discovery/fetch.py)
+    server_filters: bool = True
+    incremental: bool = False
+    incremental_overlap_minutes: int = 60
+
+    # Two-phase fetch (see src/discovery/details.py): search for headlines
+    # only, then GET /ad/{id} for the ads that pass the title gates.
+    two_phase: bool = True
+    detail_concurrency: int = 8
+
 
 @dataclass(frozen=True)
 class LinkedInConfig:
@@ -31,6 +46,18 @@ class LinkedInConfig:
     not_lia_terms: List[str] = None
 
 
+@dataclass(frozen=True)
+class WebSearchConfig:
+    enabled: bool = False
+    engines: List[str] = None          # "duckduckgo", "bing"
+    sites: List[str] = None            # restrict results with site:...
+    queries: List[str] = None          # empty = linkedin.queries
+    concurrency: int = 4
+    cache_ttl_hours: int = 6
+    # After a bot check (or 403/429) an engine isn't queried for this long.
+    backoff_hours: int = 12
+
+
 @dataclass(frozen=True)
 class SearchConfig:
     locations: List[str]
@@ -43,6 +70,9 @@ class SearchConfig:
     strict: StrictConfig
     query: QueryConfig
 
+    # Extra "name: municipality:<id>" / "name: region:<id>" taxonomy mappings
+    location_concepts: Dict[str, str] = None
+
 
 # -----------------------------
 # LIA timing / target
@@ -68,6 +98,35 @@ class LIAConfig:
 class OutputConfig:
     data_dir: str
     applications_dir: str
+    archive_raw_hits: bool = True
+
+
+# -----------------------------
+# Monitor daemon
+# -----------------------------
+
+@dataclass(frozen=True)
+class MonitorConfig:
+    interval_minutes: int = 30
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 9108  # 0 = no metrics endpoint
+
+
+# -----------------------------
+# Retention
+# -----------------------------
+
+@dataclass(frozen=True)
+class RetentionConfig:
+    enabled: bool = False
+    # An ad is closed this many days after its application deadline...
+    grace_days: int = 2
+    # ...or, without a deadline, once it hasn't been seen for this long
+    # (only without search.query.incremental, see retention.expire_listings).
+    unseen_days: int = 45
+    compact_every_hours: int = 24
+    # Cached full ads (data/cache/ads) unused for this long are deleted.
+    ad_cache_days: int = 30
 
 
 @dataclass(frozen=True)
@@ -76,6 +135,9 @@ class AppConfig:
     lia: LIAConfig
     output: OutputConfig
     linkedin: LinkedInConfig
+    web_search: WebSearchConfig = WebSearchConfig()
+    monitor: MonitorConfig = MonitorConfig()
+    retention: RetentionConfig = RetentionConfig()
 
 
 # -----------------------------
@@ -99,6 +161,7 @@ def load_config(path: str) -> AppConfig:
         not_lia_terms=list(raw_search.get("not_lia_terms", []) or []),
         strict=strict,
         query=query,
+        location_concepts=dict(raw_search.get("location_concepts", {}) or {}),
     )
 
     # ---- linkedin ----
@@ -110,6 +173,18 @@ def load_config(path: str) -> AppConfig:
         not_lia_terms=list(raw_linkedin.get("not_lia_terms", []) or []),
     )
 
+    # ---- web search ----
+    raw_web = raw.get("web_search", {}) or {}
+    web_search = WebSearchConfig(
+        enabled=bool(raw_web.get("enabled", False)),
+        engines=list(raw_web.get("engines", ["duckduckgo"]) or []),
+        sites=list(raw_web.get("sites", []) or []),
+        queries=list(raw_web.get("queries", []) or []),
+        concurrency=int(raw_web.get("concurrency", 4)),
+        cache_ttl_hours=int(raw_web.get("cache_ttl_hours", 6)),
+        backoff_hours=int(raw_web.get("backoff_hours", 12)),
+    )
+
     # ---- lia ----
     raw_lia = raw.get("lia", {}) or {}
     raw_target = raw_lia.get("target", {}) or {}
@@ -128,6 +203,33 @@ def load_config(path: str) -> AppConfig:
     output = OutputConfig(
         data_dir=str(raw_output.get("data_dir", "data")),
         applications_dir=str(raw_output.get("applications_dir", "data/applications")),
+        archive_raw_hits=bool(raw_output.get("archive_raw_hits", True)),
+    )
+
+    # ---- monitor ----
+    raw_monitor = raw.get("monitor", {}) or {}
+    monitor = MonitorConfig(
+        interval_minutes=int(raw_monitor.get("interval_minutes", 30)),
+        metrics_host=str(raw_monitor.get("metrics_host", "127.0.0.1")),
+        metrics_port=int(raw_monitor.get("metrics_port", 9108) or 0),
     )
 
-    return AppConfig(search=search, lia=lia, output=output, linkedin=linkedin)
+    # ---- retention ----
+    raw_retention = raw.get("retention", {}) or {}
+    retention = RetentionConfig(
+        enabled=bool(raw_retention.get("enabled", False)),
+        grace_days=int(raw_retention.get("grace_days", 2)),
+        unseen_days=int(raw_retention.get("unseen_days", 45)),
+        compact_every_hours=int(raw_retention.get("compact_every_hours", 24)),
+        ad_cache_days=int(raw_retention.get("ad_cache_days", 30)),
+    )
+
+    return AppConfig(
+        search=search,
+        lia=lia,
+        output=output,
+        linkedin=linkedin,
+        web_search=web_search,
+        monitor=monitor,
+        retention=retention,
+    )
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+from src.config import AppConfig
+from src.discovery.gates import Gates, gate_title
+from src.discovery.web_sources import Source
+from src.storage.atomic import atomic_write_bytes
+
+
+# Phase one: what the title gates, hit_to_listing (minus the description)
+# and the detail cache key need.
+SEARCH_FIELDS_MINIMAL = (
+    "total{value},"
+    "hits{id,headline,webpage_url,employer{name},"
+    "workplace_address{municipality,city},timestamp,publication_date}"
+)
+
+# Phase two: one full ad.
+AD_FIELDS = (
+    "id,headline,webpage_url,employer{name},"
+    "workplace_address{municipality,city},description{text},"
+    "timestamp,publication_date,application_deadline"
+)
+
+
+def two_phase_enabled(cfg: AppConfig) -> bool:
+    """
+    Two-phase needs the X-Fields mask: without server_filters every search
+    already returns full ads, and fetching them again would only add requests.
+    """
+    q = cfg.search.query
+    return q.two_phase and q.server_filters
+
+
+def ad_modified(hit: Dict[str, Any]) -> str:
+    """Version of an ad: JobSearch's update timestamp, else its publication date."""
+    return str(hit.get("timestamp") or hit.get("publication_date") or "")
+
+
+# =============================
+# Detail cache
+# =============================
+
+class AdCache:
+    """
+    Full ads under <root>/<id[:2]>/<id>.json.gz, one file per ad id storing
+    the modification time it was fetched at. A hit whose timestamp differs
+    (the ad was edited) is a miss and overwrites the file. Writes and cache
+    hits set the file's mtime to `clock()`, so it is when the ad was last
+    used (on the soak harness's simulated clock too).
+    """
+
+    def __init__(self, root: Path, clock: Optional[Callable[[], datetime]] = None):
+        self.root = Path(root)
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+
+    def _touch(self, path: Path) -> None:
+        t = self.clock().timestamp()
+        try:
+            os.utime(path, (t, t))
+        except OSError:
+            pass
+
+    def _path(self, ad_id: str) -> Path:
+        safe = "".join(c for c in ad_id if c.isalnum() or c in "-_") or "_"
+        return self.root / safe[:2] / f"{safe}.json.gz"
+
+    def get(self, ad_id: str, modified: str) -> Optional[Dict[str, Any]]:
+        path = self._path(ad_id)
+        try:
+            rec = json.loads(gzip.decompress(path.read_bytes()))
+        except (OSError, EOFError, ValueError):
+            return None
+        if rec.get("modified") != modified:
+            return None
+        self._touch(path)
+        return rec.get("ad")
+
+    def put(self, ad_id: str, modified: str, ad: Dict[str, Any]) -> None:
+        path = self._path(ad_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rec = {"modified": modified, "ad": ad}
+        data = gzip.compress(json.dumps(rec, ensure_ascii=False).encode("utf-8"), 6)
+        atomic_write_bytes(path, data, mtime=self.clock().timestamp())
+
+    def sweep(self, older_than: float) -> int:
+        """Delete ads not used since `older_than` (epoch seconds); returns how many."""
+        removed = 0
+        for path in self.root.glob("*/*.json.gz"):
+            try:
+                if path.stat().st_mtime < older_than:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+def ad_cache(cfg: AppConfig, clock: Optional[Callable[[], datetime]] = None) -> AdCache:
+    return AdCache(Path(cfg.output.data_dir) / "cache" / "ads", clock)
+
+
+# =============================
+# Phase two
+# =============================
+
+def fetch_ad(client: httpx.Client, source: Source, ad_id: str) -> Dict[str, Any]:
+    resp = client.get(f"{source.base_url}/ad/{ad_id}", headers={"X-Fields": AD_FIELDS})
+    resp.raise_for_status()
+    return resp.json()
+
+
+def worth_fetching(gates: Sequence[Gates], hit: Dict[str, Any]) -> bool:
+    """True if the headline passes the title gates of at least one config."""
+    title_l = (hit.get("headline") or hit.get("title") or "").lower()
+    return any(gate_title(g, title_l) is None for g in gates)
+
+
+@dataclass
+class Details:
+    """Search hits after phase two."""
+    hits: List[Dict[str, Any]]
+    # per hit: True if it is still the headline-only search result
+    partial: List[bool]
+    # hits dropped because their detail request kept failing
+    failed: int = 0
+
+
+# Tries per detail request; only connection errors, 429 and 5xx are retried.
+DETAIL_ATTEMPTS = 2
+
+
+def _retryable(e: Exception) -> bool:
+    if isinstance(e, httpx.TransportError):
+        return True
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code == 429 or e.response.status_code >= 500
+    return False
+
+
+def fill_details(
+    client: httpx.Client,
+    source: Source,
+    hits: List[Dict[str, Any]],
+    gates: Sequence[Gates],
+    cache: AdCache,
+    pool: Optional[ThreadPoolExecutor] = None,
+) -> Details:
+    """
+    Replace every minimal hit that `worth_fetching` with its full ad, from
+    the cache when the timestamp matches, otherwise GET /ad/{id} (through
+    `pool` when given). Hits the title gates drop stay minimal and are
+    flagged partial: gating them again with the full gates drops them for
+    the same reason, and the archive marks them so rescore skips them.
+
+    A detail request that still fails after DETAIL_ATTEMPTS drops its hit
+    (counted in Details.failed) rather than passing it on headline-only.
+    """
+    out = list(hits)
+    partial = [True] * len(hits)
+    todo: List[int] = []
+    for i, h in enumerate(hits):
+        ad_id = str(h.get("id") or "")
+        if not ad_id or not worth_fetching(gates, h):
+            continue
+        cached = cache.get(ad_id, ad_modified(h))
+        if cached is not None:
+            out[i] = cached
+            partial[i] = False
+        else:
+            todo.append(i)
+    if not todo:
+        return Details(out, partial)
+
+    def one(i: int) -> Optional[Dict[str, Any]]:
+        ad_id = str(hits[i]["id"])
+        for attempt in range(DETAIL_ATTEMPTS):
+            try:
+                ad = fetch_ad(client, source, ad_id)
+            except (httpx.HTTPError, ValueError) as e:
+                if attempt + 1 < DETAIL_ATTEMPTS and _retryable(e):
+                    continue
+                return None
+            cache.put(ad_id, ad_modified(hits[i]), ad)
+            return ad
+        return None
+
+    results = pool.map(one, todo) if pool is not None else map(one, todo)
+    failed = set()
+    for i, ad in zip(todo, results):
+        if ad is None:
+            failed.add(i)
+        else:
+            out[i] = ad
+            partial[i] = False
+
+    if failed:
+        keep = [i for i in range(len(out)) if i not in failed]
+        return Details([out[i] for i in keep], [partial[i] for i in keep], failed=len(failed))
+    return Details(out, partial)
@@ -1,21 +1,78 @@
 from __future__ import annotations
 
+import math
 import os
-from typing import List
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from typing import Any, Callable, Container, Dict, Iterator, List, Optional
 
 import httpx
 
 from src.config import AppConfig
+from src.discovery.details import SEARCH_FIELDS_MINIMAL, ad_cache, fill_details, two_phase_enabled
+from src.discovery.gates import (
+    DROP_REASONS,
+    ParsedHit,
+    QueryBatch,
+    build_gates,
+    gate_batch,
+    record_batch,
+)
+from src.discovery.normalize import normalize_text, normalize_timestamp
+from src.discovery.taxonomy import resolve_location_params
+from src.discovery.web_search import iter_web_search
 from src.discovery.web_sources import Source
 from src.models import Listing
+from src.storage.archive import RawArchive
+from src.storage.blobs import BlobStore
 
 
-def _contains_any(text: str, terms: list[str]) -> bool:
-    t = text.lower()
-    return any(term.lower() in t for term in terms)
+# Field mask (X-Fields) so JobSearch only serialises what we actually read.
+_SEARCH_FIELDS = (
+    "total{value},"
+    "hits{id,headline,webpage_url,employer{name},"
+    "workplace_address{municipality,city},description{text},"
+    "publication_date,application_deadline}"
+)
 
+# Single words are safe to exclude server-side with "-term". Phrases and
+# punctuated terms ("fast anställning", "full-time") stay local-only.
+_PLAIN_TERM = re.compile(r"^\w+$")
 
-def _build_queries(cfg: AppConfig) -> list[str]:
+
+def hit_to_listing(source: Source, h: Dict[str, Any]) -> Listing:
+    """Map one JobSearch hit to a Listing with a normalized, full description."""
+    title = h.get("headline") or h.get("title") or ""
+    employer = (h.get("employer") or {}).get("name") or ""
+
+    workplace = h.get("workplace_address") or {}
+    location = workplace.get("municipality") or workplace.get("city") or ""
+
+    ad_id = h.get("id") or ""
+    webpage_url = h.get("webpage_url") or ""
+    url_ = webpage_url or (f"{source.base_url}/ad/{ad_id}" if ad_id else "")
+
+    d = h.get("description")
+    if isinstance(d, dict):
+        d = d.get("text")
+    desc = normalize_text(d) if isinstance(d, str) else ""
+
+    return Listing(
+        title=title,
+        company=employer,
+        location=location,
+        url=url_,
+        description=desc or None,
+        source=source.name,
+        published=normalize_timestamp(h.get("publication_date")),
+        deadline=normalize_timestamp(h.get("application_deadline")),
+    )
+
+
+def build_queries(cfg: AppConfig) -> list[str]:
     locations = cfg.search.locations or ["Stockholm"]
     loc = " ".join(locations)
 
@@ -57,7 +114,77 @@ def _build_queries(cfg: AppConfig) -> list[str]:
     return uniq
 
 
-def fetch_listings(cfg: AppConfig, sources: List[Source]) -> List[Listing]:
+def _minutes_since(iso_ts: str, now: Optional[datetime] = None) -> Optional[int]:
+    try:
+        ts = datetime.fromisoformat(iso_ts)
+    except (TypeError, ValueError):
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    delta = (now or datetime.now(timezone.utc)) - ts
+    return max(1, math.ceil(delta.total_seconds() / 60))
+
+
+def server_exclusions(cfg: AppConfig) -> List[str]:
+    """The single-word not_lia_terms sent to JobSearch as "-term" exclusions in q."""
+    if not cfg.search.query.server_filters:
+        return []
+    return [t.strip() for t in cfg.search.not_lia_terms if _PLAIN_TERM.match(t.strip())]
+
+
+def build_search_params(
+    cfg: AppConfig,
+    q: str,
+    location_params: Optional[Dict[str, List[str]]] = None,
+    last_run: Optional[str] = None,
+    now: Optional[datetime] = None,
+    exclusions: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Translate one query into JobSearch parameters, pushing as much of the
+    local filtering as the API understands to the server:
+      - location text -> municipality/region concept IDs
+      - single-word not_lia_terms -> "-term" exclusions in q
+      - last successful run of this query -> published-after (minutes before `now`)
+    The exclusions are not a strict subset of the local gate: JobSearch
+    matches "-term" against employer, occupation and description as well as
+    the headline, so it can drop an ad the local gate would have kept (e.g.
+    a LIA ad whose employer description mentions "senior"). Set
+    server_filters: false if that matters more than the saved downloads.
+    exclusions: use these "-term"s instead of server_exclusions(cfg).
+    """
+    params: Dict[str, Any] = {"q": q, "limit": cfg.search.query.max_per_query}
+    q_cfg = cfg.search.query
+    if not q_cfg.server_filters:
+        return params
+
+    loc_text = " ".join(cfg.search.locations or ["Stockholm"])
+    if location_params and q.endswith(f" {loc_text}"):
+        q = q[: -len(loc_text)].rstrip()
+        params.update(location_params)
+
+    excluded = server_exclusions(cfg) if exclusions is None else exclusions
+    params["q"] = " ".join([q] + [f"-{t}" for t in excluded])
+
+    if q_cfg.incremental and last_run:
+        minutes = _minutes_since(last_run, now)
+        if minutes is not None:
+            params["published-after"] = minutes + q_cfg.incremental_overlap_minutes
+
+    return params
+
+
+def parse_hits(source: Source, hits: List[Dict[str, Any]]) -> List[ParsedHit]:
+    parsed = []
+    for h in hits:
+        listing = hit_to_listing(source, h)
+        title_l = listing.title.lower()
+        parsed.append(ParsedHit(listing, title_l, f"{title_l}\n{(listing.description or '').lower()}"))
+    return parsed
+
+
+def jobtech_headers(cfg: AppConfig, two_phase: Optional[bool] = None) -> Dict[str, str]:
+    """two_phase overrides search.query.two_phase (the shared multi-profile fetch)."""
     api_key = os.getenv("JOBTECH_API_KEY", "").strip()
     if not api_key:
         raise RuntimeError(
@@ -69,99 +196,129 @@ def fetch_listings(cfg: AppConfig, sources: List[Source]) -> List[Listing]:
         "api-key": api_key,
         "User-Agent": "LIA_FINDER_AI_ASSISTANT/1.0",
     }
+    if cfg.search.query.server_filters:
+        if two_phase is None:
+            two_phase = two_phase_enabled(cfg)
+        headers["X-Fields"] = SEARCH_FIELDS_MINIMAL if two_phase else _SEARCH_FIELDS
+    return headers
+
+
+def search_hits(client: httpx.Client, source: Source, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    resp = client.get(f"{source.base_url}/search", params=params)
+    resp.raise_for_status()
+    data = resp.json()
+    return data.get("hits", []) or []
+
 
-    queries = _build_queries(cfg)
-    limit = cfg.search.query.max_per_query
+def iter_fetch(
+    cfg: AppConfig,
+    sources: List[Source],
+    queries: Optional[List[str]] = None,
+    last_runs: Optional[Dict[str, str]] = None,
+    blobs: Optional[BlobStore] = None,
+    archive: Optional[RawArchive] = None,
+    seen: Optional[Container[str]] = None,
+    transport: Optional[httpx.BaseTransport] = None,
+    now: Optional[datetime] = None,
+) -> Iterator[QueryBatch]:
+    """
+    Yield one gated QueryBatch per (source, query) as soon as it returns,
+    so callers can score/show results while the rest are still in flight.
 
+    queries:   explicit query list (e.g. from the planner); defaults to build_queries.
+    last_runs: query -> ISO timestamp of its last successful run (incremental mode).
+    blobs:     if given, full descriptions go to the blob store and listings
+               only carry a snippet + description_hash.
+    archive:   if given, every raw hit (kept or dropped) is appended to it.
+    seen:      web-search results already in it are skipped (see web_search.py).
+    transport: httpx transport for the JobTech client (e.g. a stub board).
+    now:       the tick's time for published-after and the ad cache's mtimes
+               (default: the wall clock).
+
+    With search.query.two_phase, searches only return headlines and the full
+    ad is fetched (or read from data/cache/ads) for hits that pass the title
+    gates; see details.py.
+    """
+    jobtech = [s for s in sources if getattr(s, "kind", "") == "jobtech_jobsearch"]
+    if jobtech:
+        headers = jobtech_headers(cfg)
+
+        if queries is None:
+            queries = build_queries(cfg)
+        last_runs = last_runs or {}
+        location_params = resolve_location_params(cfg.search.locations, cfg.search.location_concepts)
+        gates = build_gates(cfg)
+        two_phase = two_phase_enabled(cfg)
+        cache = ad_cache(cfg, (lambda: now) if now is not None else None) if two_phase else None
+
+        with ExitStack() as stack:
+            client = stack.enter_context(httpx.Client(headers=headers, timeout=25.0, transport=transport))
+            pool = None
+            if two_phase:
+                pool = stack.enter_context(ThreadPoolExecutor(max_workers=max(1, cfg.search.query.detail_concurrency)))
+            for s in jobtech:
+                for q in queries:
+                    started = time.perf_counter()
+                    params = build_search_params(cfg, q, location_params, last_runs.get(q), now)
+                    hits = search_hits(client, s, params)
+                    partial, failed = None, 0
+                    if two_phase:
+                        details = fill_details(client, s, hits, [gates], cache, pool)
+                        hits, partial, failed = details.hits, details.partial, details.failed
+                    batch = gate_batch(gates, s, q, hits, parse_hits(s, hits), blobs, archive, partial, failed)
+                    batch.seconds = time.perf_counter() - started
+                    yield batch
+
+    yield from iter_web_search(cfg, sources, seen=seen, blobs=blobs)
+
+
+def fetch_listings(
+    cfg: AppConfig,
+    sources: List[Source],
+    queries: Optional[List[str]] = None,
+    yields: Optional[Dict[str, Dict[str, Any]]] = None,
+    last_runs: Optional[Dict[str, str]] = None,
+    blobs: Optional[BlobStore] = None,
+    archive: Optional[RawArchive] = None,
+    seen: Optional[Container[str]] = None,
+    on_batch: Optional[Callable[[QueryBatch], None]] = None,
+    transport: Optional[httpx.BaseTransport] = None,
+    now: Optional[datetime] = None,
+) -> List[Listing]:
+    """
+    Run every query and return the kept listings, deduplicated by URL.
+    yields:   if given, filled with per-query {"hits": int, "urls": [kept urls]}.
+    on_batch: called with every QueryBatch (e.g. to record metrics).
+    See iter_fetch for the other parameters.
+    """
     # Debug counters (helps tuning)
     kept = 0
-    dropped_not_lia = 0
-    dropped_not_java = 0
-    dropped_not_lia_title = 0
-    dropped_not_lia_terms = 0
+    dropped = {reason: 0 for reason in DROP_REASONS}
 
     listings: List[Listing] = []
 
-    with httpx.Client(headers=headers, timeout=25.0) as client:
-        for s in sources:
-            if getattr(s, "kind", "") != "jobtech_jobsearch":
-                continue
-
-            search_url = f"{s.base_url}/search"
-
-            for q in queries:
-                resp = client.get(search_url, params={"q": q, "limit": limit})
-                resp.raise_for_status()
-                data = resp.json()
-
-                for h in data.get("hits", []) or []:
-                    title = h.get("headline") or h.get("title") or ""
-                    employer = (h.get("employer") or {}).get("name") or ""
-
-                    workplace = h.get("workplace_address") or {}
-                    location = workplace.get("municipality") or workplace.get("city") or ""
-
-                    ad_id = h.get("id") or ""
-                    webpage_url = h.get("webpage_url") or ""
-                    url_ = webpage_url or (f"{s.base_url}/ad/{ad_id}" if ad_id else "")
-
-                    desc = None
-                    d = h.get("description")
-                    if isinstance(d, dict):
-                        desc = d.get("text")
-                    elif isinstance(d, str):
-                        desc = d
-
-                    title_l = title.lower()
-                    combined_l = f"{title}\n{desc or ''}".lower()
-
-                    # Exclude obvious non-LIA/permanent jobs
-                    if _contains_any(combined_l, cfg.search.not_lia_terms):
-                        dropped_not_lia += 1
-                        continue
-
-                    # LIA gate
-                    if cfg.search.strict.title_must_contain_lia:
-                        if not _contains_any(title_l, cfg.search.lia_terms):
-                            dropped_not_lia_title += 1
-                            continue
-                    else:
-                        if not _contains_any(combined_l, cfg.search.lia_terms):
-                            dropped_not_lia_terms += 1
-                            continue
-
-                    # Java gate
-                    if cfg.search.strict.must_contain_java:
-                        if not _contains_any(combined_l, cfg.search.java_terms):
-                            dropped_not_java += 1
-                            continue
-
-                    if title and url_:
-                        listings.append(
-                            Listing(
-                                title=title,
-                                company=employer,
-                                location=location,
-                                url=url_,
-                                description=desc,
-                                source=s.name,
-                            )
-                        )
-                        kept += 1
+    for batch in iter_fetch(cfg, sources, queries, last_runs, blobs, archive, seen, transport, now):
+        if yields is not None:
+            record_batch(yields, batch)
+        if on_batch is not None:
+            on_batch(batch)
+        listings.extend(batch.kept)
+        kept += len(batch.kept)
+        for reason, n in batch.dropped.items():
+            dropped[reason] += n
 
     # Print debug summary (super useful while tuning)
     print(
-        f"Filter summary: kept={kept}, dropped_not_lia={dropped_not_lia}, "
-        f"dropped_not_java={dropped_not_java}, dropped_not_lia_title={dropped_not_lia_title}, "
-        f"dropped_not_lia_terms={dropped_not_lia_terms}"
+        f"Filter summary: kept={kept}, "
+        + ", ".join(f"dropped_{reason}={n}" for reason, n in dropped.items())
     )
 
     # Deduplicate by URL
-    seen = set()
+    urls = set()
     uniq: List[Listing] = []
     for l in listings:
-        if l.url not in seen:
-            seen.add(l.url)
+        if l.url not in urls:
+            urls.add(l.url)
             uniq.append(l)
 
     return uniq
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.config import AppConfig
+from src.discovery.normalize import make_snippet
+from src.discovery.web_sources import Source
+from src.models import Listing
+from src.storage.archive import RawArchive
+from src.storage.blobs import BlobStore
+
+
+# Gates shared by every source (JobTech, web search) and by offline rescore.
+
+def _contains_any(text_l: str, terms_l: tuple[str, ...]) -> bool:
+    # Both sides are already lowercased by the caller (once per ad / once per run).
+    return any(term in text_l for term in terms_l)
+
+
+def _lower_terms(terms: list[str]) -> tuple[str, ...]:
+    return tuple(t.lower() for t in terms if t)
+
+
+# Drop reasons, in filter-summary order. detail_error isn't a gate: the
+# two-phase fetch couldn't download the full ad (see details.fill_details).
+GATE_REASONS = ("not_lia", "not_java", "not_lia_title", "not_lia_terms")
+DROP_REASONS = GATE_REASONS + ("detail_error",)
+
+
+@dataclass(frozen=True)
+class Gates:
+    not_lia: tuple[str, ...]
+    lia: tuple[str, ...]
+    java: tuple[str, ...]
+    title_must_contain_lia: bool
+    must_contain_java: bool
+
+
+def build_gates(cfg: AppConfig) -> Gates:
+    return Gates(
+        not_lia=_lower_terms(cfg.search.not_lia_terms),
+        lia=_lower_terms(cfg.search.lia_terms),
+        java=_lower_terms(cfg.search.java_terms),
+        title_must_contain_lia=cfg.search.strict.title_must_contain_lia,
+        must_contain_java=cfg.search.strict.must_contain_java,
+    )
+
+
+def gate_listing(gates: Gates, title: str, description: str) -> Optional[str]:
+    """Return the drop reason for an ad, or None if it passes every gate."""
+    title_l = title.lower()
+    return gate_lowered(gates, title_l, f"{title_l}\n{description.lower()}")
+
+
+def gate_lowered(gates: Gates, title_l: str, combined_l: str) -> Optional[str]:
+    """gate_listing for text that is already lowercased (shared across profiles)."""
+    # Exclude obvious non-LIA/permanent jobs
+    if _contains_any(combined_l, gates.not_lia):
+        return "not_lia"
+
+    # LIA gate
+    if gates.title_must_contain_lia:
+        if not _contains_any(title_l, gates.lia):
+            return "not_lia_title"
+    elif not _contains_any(combined_l, gates.lia):
+        return "not_lia_terms"
+
+    # Java gate
+    if gates.must_contain_java and not _contains_any(combined_l, gates.java):
+        return "not_java"
+
+    return None
+
+
+def gate_title(gates: Gates, title_l: str) -> Optional[str]:
+    """
+    The part of gate_lowered that only needs the headline. Anything it drops,
+    gate_lowered drops for the same reason whatever the description says, so
+    it is safe to decide what is worth fetching in full.
+    """
+    if _contains_any(title_l, gates.not_lia):
+        return "not_lia"
+    if gates.title_must_contain_lia and not _contains_any(title_l, gates.lia):
+        return "not_lia_title"
+    return None
+
+
+@dataclass
+class ParsedHit:
+    """A hit parsed and lowercased once, ready to be gated by any number of configs."""
+    listing: Listing
+    title_l: str
+    combined_l: str
+
+
+@dataclass
+class QueryBatch:
+    """Result of one search request, already gated."""
+    source: str
+    query: str
+    hits: int
+    kept: List[Listing]
+    dropped: Dict[str, int]
+    seconds: float
+
+
+def record_batch(yields: Dict[str, Dict[str, Any]], batch: QueryBatch) -> None:
+    """Fold a batch into the planner's per-query {"hits", "urls"} yields."""
+    y = yields.setdefault(batch.query, {"hits": 0, "urls": []})
+    y["hits"] += batch.hits
+    y["urls"].extend(l.url for l in batch.kept)
+
+
+def gate_batch(
+    gates: Gates,
+    source: Source,
+    query: str,
+    hits: List[Dict[str, Any]],
+    parsed: List[ParsedHit],
+    blobs: Optional[BlobStore] = None,
+    archive: Optional[RawArchive] = None,
+    partial: Optional[Sequence[bool]] = None,
+    failed: int = 0,
+) -> QueryBatch:
+    """
+    Gate already-parsed hits for one config. Kept listings are copies, so the
+    same parsed hits can be gated again for another profile.
+    partial: per hit, True if it is headline-only (see details.fill_details);
+             passed on to the archive.
+    failed:  hits the search returned but whose details couldn't be fetched;
+             counted as hits and as detail_error drops.
+    """
+    batch = QueryBatch(
+        source=source.name,
+        query=query,
+        hits=len(hits) + failed,
+        kept=[],
+        dropped={reason: 0 for reason in DROP_REASONS},
+        seconds=0.0,
+    )
+    batch.dropped["detail_error"] = failed
+
+    outcomes: List[Optional[str]] = []
+    for p in parsed:
+        reason = gate_lowered(gates, p.title_l, p.combined_l)
+        outcomes.append(reason)
+        if reason:
+            batch.dropped[reason] += 1
+            continue
+
+        if p.listing.title and p.listing.url:
+            listing = replace(p.listing)
+            if blobs is not None and listing.description:
+                listing.description_hash = blobs.put(listing.description)
+                listing.description = make_snippet(listing.description)
+            batch.kept.append(listing)
+
+    if archive is not None and hits:
+        archive.append(source, query, hits, outcomes, partial)
+    return batch
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from datetime import datetime, timezone
+from typing import Optional
+
+import lxml.html
+from lxml import etree
+
+
+SNIPPET_CHARS = 280
+
+# Elements that end a line of text when the HTML is flattened.
+_BLOCK_TAGS = (
+    "br", "p", "div", "li", "ul", "ol", "tr", "table",
+    "h1", "h2", "h3", "h4", "h5", "h6", "section", "article",
+)
+
+_MARKUP_HINT = re.compile(r"<[a-zA-Z/!]|&[#a-zA-Z0-9]+;")
+_SPACES = re.compile(r"[ \t\f\v\u00a0\u2000-\u200b\u202f\u205f\u3000]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def html_to_text(raw: str) -> str:
+    """
+    Strip HTML (if any) with lxml, keeping block boundaries as newlines.
+    Plain text skips the parser entirely.
+    """
+    if not _MARKUP_HINT.search(raw):
+        return raw
+    try:
+        root = lxml.html.fragment_fromstring(raw, create_parent="div")
+    except (etree.ParserError, ValueError):
+        return raw
+
+    etree.strip_elements(root, "script", "style", with_tail=False)
+    for el in root.iter(*_BLOCK_TAGS):
+        el.tail = "\n" + (el.tail or "")
+    return root.text_content()
+
+
+def normalize_text(raw: Optional[str]) -> str:
+    """
+    One-shot cleanup for ad descriptions: HTML -> text, Unicode NFC,
+    collapsed whitespace, at most one blank line in a row.
+    """
+    if not raw:
+        return ""
+    text = unicodedata.normalize("NFC", html_to_text(raw))
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = [_SPACES.sub(" ", line).strip() for line in text.split("\n")]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def make_snippet(text: str, limit: int = SNIPPET_CHARS) -> str:
+    """Short single-line preview, cut on a word boundary."""
+    flat = " ".join(text.split())
+    if len(flat) <= limit:
+        return flat
+    cut = flat[:limit].rsplit(" ", 1)[0]
+    return cut + "…"
+
+
+def normalize_timestamp(raw: Optional[str]) -> Optional[str]:
+    """
+    JobTech dates ("2026-11-30T23:59:59", sometimes with an offset) as
+    UTC ISO seconds, the format first_seen/last_seen use, so they compare
+    as strings. Naive times are taken as UTC; None if unparseable.
+    """
+    if not raw or not isinstance(raw, str):
+        return None
+    try:
+        ts = datetime.fromisoformat(raw.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc).isoformat(timespec="seconds")
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import math
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Container, Dict, List, Optional
+
+from src.config import AppConfig
+
+
+# How much a kept-but-already-seen ad is worth compared to a brand new one.
+_KEPT_WEIGHT = 0.25
+
+# Exponential moving average factor for per-query reward (recent runs matter more).
+_EMA_ALPHA = 0.3
+
+
+# =============================
+# Persistence
+# =============================
+
+def _stats_path(cfg: AppConfig) -> Path:
+    return Path(cfg.output.data_dir) / "query_stats.json"
+
+
+def load_query_stats(cfg: AppConfig) -> Dict[str, Any]:
+    """
+    {"ticks": int, "queries": {query: {runs, hits, kept, unique, new, reward, last_run, last_new}}}
+    """
+    path = _stats_path(cfg)
+    if path.exists():
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(data, dict) and isinstance(data.get("queries"), dict):
+                data.setdefault("ticks", 0)
+                return data
+        except Exception:
+            pass
+    return {"ticks": 0, "queries": {}}
+
+
+def save_query_stats(cfg: AppConfig, stats: Dict[str, Any]) -> Path:
+    path = _stats_path(cfg)
+    path.write_text(json.dumps(stats, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+# =============================
+# Planning
+# =============================
+
+def _ucb(entry: Dict[str, Any], ticks: int, exploration: float) -> float:
+    runs = int(entry.get("runs", 0))
+    if runs == 0:
+        return math.inf
+    bonus = exploration * math.sqrt(math.log(max(ticks, 2)) / runs)
+    return float(entry.get("reward", 0.0)) + bonus
+
+
+def plan_queries(cfg: AppConfig, queries: List[str], stats: Dict[str, Any]) -> List[str]:
+    """
+    Order (and optionally cap) the queries for this tick by UCB1 over their
+    recent yield. Untried queries always go first; low-yield queries drift to
+    the back and fall outside the budget, but the exploration bonus grows while
+    they sit idle, so they get probed again after a while.
+    """
+    q_cfg = cfg.search.query
+    if not q_cfg.adaptive:
+        return list(queries)
+
+    ticks = int(stats.get("ticks", 0))
+    known = stats.get("queries", {})
+
+    ranked = sorted(
+        enumerate(queries),
+        key=lambda iq: (-_ucb(known.get(iq[1], {}), ticks, q_cfg.exploration), iq[0]),
+    )
+    planned = [q for _, q in ranked]
+
+    budget = q_cfg.max_queries_per_run
+    if budget and budget > 0:
+        planned = planned[:budget]
+    return planned
+
+
+# =============================
+# Recording
+# =============================
+
+def record_query_yields(
+    stats: Dict[str, Any],
+    yields: Dict[str, Dict[str, Any]],
+    seen: Container[str],
+    now: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Fold one tick's per-query results into the stats.
+
+    `yields` maps query -> {"hits": int, "urls": [kept urls]} in execution order.
+    A URL only counts as unique for the first query that returned it this tick,
+    so overlapping queries earn nothing for repeating each other.
+    `now` (ISO timestamp) defaults to the current time.
+    """
+    now = now or datetime.now(timezone.utc).isoformat(timespec="seconds")
+    claimed: set[str] = set()
+
+    stats["ticks"] = int(stats.get("ticks", 0)) + 1
+    queries = stats.setdefault("queries", {})
+
+    for q, y in yields.items():
+        urls = list(dict.fromkeys(y.get("urls", [])))
+        unique = [u for u in urls if u not in claimed]
+        claimed.update(unique)
+        new = [u for u in unique if u not in seen]
+
+        entry = queries.setdefault(
+            q, {"runs": 0, "hits": 0, "kept": 0, "unique": 0, "new": 0, "reward": 0.0}
+        )
+        reward = len(new) + _KEPT_WEIGHT * (len(unique) - len(new))
+        if entry["runs"] == 0:
+            entry["reward"] = float(reward)
+        else:
+            entry["reward"] = (1 - _EMA_ALPHA) * float(entry["reward"]) + _EMA_ALPHA * reward
+
+        entry["runs"] += 1
+        entry["hits"] += int(y.get("hits", 0))
+        entry["kept"] += len(urls)
+        entry["unique"] += len(unique)
+        entry["new"] += len(new)
+        entry["last_run"] = now
+        if new:
+            entry["last_new"] = now
+
+    return stats
+
+
+def query_last_runs(stats: Dict[str, Any]) -> Dict[str, str]:
+    """query -> ISO timestamp of its last successful run."""
+    return {
+        q: e["last_run"]
+        for q, e in (stats.get("queries") or {}).items()
+        if isinstance(e, dict) and e.get("last_run")
+    }
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass, field
+from typing import Dict, List
+from urllib.parse import parse_qs, urljoin, urlparse
+
+from lxml import html as lxml_html
+
+from src.discovery.normalize import normalize_text
+
+
+# Search endpoints that return plain server-rendered HTML.
+ENGINES: Dict[str, str] = {
+    "duckduckgo": "https://html.duckduckgo.com/html/",
+    "bing": "https://www.bing.com/search",
+}
+
+
+@dataclass(frozen=True)
+class SerpResult:
+    title: str
+    url: str
+    snippet: str
+
+
+@dataclass
+class SerpPage:
+    engine: str
+    results: List[SerpResult] = field(default_factory=list)
+    blocked: bool = False  # bot check / captcha instead of results
+
+
+def _has_class(cls: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+# Compiled once; XPath over lxml's C tree is far cheaper than BeautifulSoup.
+_BING_BLOCKED = f"//*[{_has_class('captcha')}] | //*[@id='turnstile-widget']"
+_BING_RESULTS = f"//li[{_has_class('b_algo')}]"
+_DDG_BLOCKED = f"//*[{_has_class('anomaly-modal__modal')}] | //form[@id='challenge-form']"
+_DDG_RESULTS = f"//div[{_has_class('result')} and not({_has_class('result--ad')})]"
+
+
+def _text(nodes: list) -> str:
+    if not nodes:
+        return ""
+    return normalize_text(nodes[0].text_content())
+
+
+def _bing_url(href: str) -> str:
+    # Tracking links: /ck/a?...&u=a1<base64url of the target>
+    if "/ck/a" in href:
+        u = (parse_qs(urlparse(href).query).get("u") or [""])[0]
+        if u.startswith("a1"):
+            b64 = u[2:]
+            try:
+                return base64.urlsafe_b64decode(b64 + "=" * (-len(b64) % 4)).decode("utf-8")
+            except (ValueError, UnicodeDecodeError):
+                return ""
+    return href
+
+
+def _ddg_url(href: str) -> str:
+    # Redirect links: //duckduckgo.com/l/?uddg=<target>&rut=...
+    if "uddg=" in href:
+        return (parse_qs(urlparse(urljoin("https:", href)).query).get("uddg") or [""])[0]
+    return href
+
+
+def _parse_bing(doc) -> SerpPage:
+    page = SerpPage(engine="bing")
+    for li in doc.xpath(_BING_RESULTS):
+        links = li.xpath(".//h2/a[@href]")
+        if not links:
+            continue
+        url = _bing_url(links[0].get("href", ""))
+        title = _text(links)
+        snippet = _text(li.xpath(f".//div[{_has_class('b_caption')}]//p | .//p[contains(@class, 'b_lineclamp')]"))
+        if url.startswith("http") and title:
+            page.results.append(SerpResult(title=title, url=url, snippet=snippet))
+    page.blocked = not page.results and bool(doc.xpath(_BING_BLOCKED))
+    return page
+
+
+def _parse_duckduckgo(doc) -> SerpPage:
+    page = SerpPage(engine="duckduckgo")
+    for div in doc.xpath(_DDG_RESULTS):
+        links = div.xpath(f".//a[{_has_class('result__a')}][@href]")
+        if not links:
+            continue
+        url = _ddg_url(links[0].get("href", ""))
+        title = _text(links)
+        snippet = _text(div.xpath(f".//*[{_has_class('result__snippet')}]"))
+        if url.startswith("http") and title:
+            page.results.append(SerpResult(title=title, url=url, snippet=snippet))
+    page.blocked = not page.results and bool(doc.xpath(_DDG_BLOCKED))
+    return page
+
+
+_PARSERS = {"bing": _parse_bing, "duckduckgo": _parse_duckduckgo}
+
+
+def parse_serp(engine: str, content: bytes | str) -> SerpPage:
+    """Parse one result page. Unknown engines and empty pages give no results."""
+    parser = _PARSERS.get(engine)
+    if parser is None or not content:
+        return SerpPage(engine=engine)
+    return parser(lxml_html.fromstring(content))
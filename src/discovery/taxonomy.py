@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+
+# JobTech taxonomy concept IDs for the places people usually put in
+# search.locations. City names map to their län on purpose: a Stockholm
+# student also wants Solna/Sundbyberg/Nacka ads, which the free-text
+# query used to catch whenever the ad mentioned the city.
+#
+# name (lowercase) -> (JobSearch parameter, concept id)
+LOCATION_CONCEPTS: Dict[str, tuple[str, str]] = {
+    "stockholm": ("region", "CifL_Rzy_Mku"),
+    "stockholms län": ("region", "CifL_Rzy_Mku"),
+    "stockholms kommun": ("municipality", "AvNB_uwa_6n6"),
+    "göteborg": ("region", "zdoY_6u5_Krt"),
+    "västra götalands län": ("region", "zdoY_6u5_Krt"),
+    "göteborgs kommun": ("municipality", "PVZL_BQT_XtL"),
+    "malmö": ("region", "CaRE_1nn_cSU"),
+    "skåne län": ("region", "CaRE_1nn_cSU"),
+    "malmö kommun": ("municipality", "oYPt_yRA_Smm"),
+    "uppsala": ("region", "zBon_eET_fFU"),
+    "uppsala län": ("region", "zBon_eET_fFU"),
+    "uppsala kommun": ("municipality", "otaF_bQY_4ZD"),
+}
+
+
+def resolve_location_params(
+    locations: List[str],
+    overrides: Optional[Dict[str, str]] = None,
+) -> Optional[Dict[str, List[str]]]:
+    """
+    Turn search.locations into JobSearch params, e.g. {"region": ["CifL_Rzy_Mku"]}.
+
+    overrides (search.location_concepts in config.yaml) maps a name to
+    "municipality:<id>" or "region:<id>" for places not in the bundled table.
+
+    All-or-nothing: if any location can't be resolved we return None and the
+    caller keeps the free-text location, so nothing silently falls out of scope.
+    """
+    table = dict(LOCATION_CONCEPTS)
+    for name, spec in (overrides or {}).items():
+        kind, _, concept_id = str(spec).partition(":")
+        if kind in ("municipality", "region") and concept_id:
+            table[str(name).strip().lower()] = (kind, concept_id.strip())
+
+    params: Dict[str, List[str]] = {}
+    for loc in locations:
+        hit = table.get(loc.strip().lower())
+        if hit is None:
+            return None
+        kind, concept_id = hit
+        ids = params.setdefault(kind, [])
+        if concept_id not in ids:
+            ids.append(concept_id)
+
+    return params or None
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Container, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from lxml import etree
+
+from src.config import AppConfig
+from src.discovery.gates import (
+    DROP_REASONS,
+    Gates,
+    ParsedHit,
+    QueryBatch,
+    _lower_terms,
+    build_gates,
+    gate_batch,
+)
+from src.discovery.serp import SerpPage, SerpResult, parse_serp
+from src.discovery.web_sources import Source
+from src.models import Listing
+from src.storage.atomic import atomic_write_bytes, atomic_write_text
+from src.storage.blobs import BlobStore
+
+
+# Same honest agent as the JobTech client. An engine that answers it with a
+# bot check (or 403/429) is left alone for web_search.backoff_hours.
+_HEADERS = {
+    "User-Agent": "LIA_FINDER_AI_ASSISTANT/1.0",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "sv-SE,sv;q=0.9,en;q=0.8",
+}
+_BLOCKED_STATUS = (403, 429)
+
+# Errors that fail one query. lxml raises ParserError for an empty document,
+# and ValueError for str input with an encoding declaration.
+_QUERY_ERRORS = (httpx.HTTPError, etree.LxmlError, UnicodeDecodeError, ValueError)
+
+
+def engine_for(source: Source) -> str:
+    """Web-search sources are named "WebSearch:<engine>"."""
+    return source.name.split(":", 1)[-1].lower()
+
+
+def web_search_queries(cfg: AppConfig) -> List[str]:
+    return list(cfg.web_search.queries or cfg.linkedin.queries or [])
+
+
+def query_label(engine: str, q: str) -> str:
+    # Kept apart from JobTech queries in query_stats (same text, different source).
+    return f"[{engine}] {q}"
+
+
+def web_search_gates(cfg: AppConfig) -> Gates:
+    """The normal gates, plus the linkedin section's stricter settings."""
+    gates = build_gates(cfg)
+    extra = _lower_terms(cfg.linkedin.not_lia_terms or [])
+    return replace(
+        gates,
+        not_lia=gates.not_lia + tuple(t for t in extra if t not in gates.not_lia),
+        title_must_contain_lia=gates.title_must_contain_lia and cfg.linkedin.strict,
+    )
+
+
+# =============================
+# Page cache
+# =============================
+
+class SerpCache:
+    """
+    Raw result pages under <root>/<key>.html.gz, reused for `ttl_hours`.
+    Bot-check pages are never cached.
+    """
+
+    def __init__(self, root: Path, ttl_hours: int = 6):
+        self.root = Path(root)
+        self.ttl_seconds = max(0, ttl_hours) * 3600
+
+    def _path(self, engine: str, text: str) -> Path:
+        key = hashlib.blake2b(f"{engine}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+        return self.root / f"{key}.html.gz"
+
+    def get(self, engine: str, text: str) -> Optional[bytes]:
+        path = self._path(engine, text)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                return None
+            return gzip.decompress(path.read_bytes())
+        except (OSError, EOFError):
+            return None
+
+    def put(self, engine: str, text: str, content: bytes) -> None:
+        if not self.ttl_seconds:
+            return
+        path = self._path(engine, text)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(path, gzip.compress(content, 6))
+
+    def sweep(self, now: float) -> int:
+        """Delete pages past their TTL as of `now` (epoch seconds); returns how many."""
+        removed = 0
+        for path in self.root.glob("*.html.gz"):
+            try:
+                if now - path.stat().st_mtime > self.ttl_seconds:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+def serp_cache(cfg: AppConfig) -> SerpCache:
+    return SerpCache(Path(cfg.output.data_dir) / "cache" / "serp", cfg.web_search.cache_ttl_hours)
+
+
+# =============================
+# Back-off
+# =============================
+
+def _backoff_path(cfg: AppConfig) -> Path:
+    return Path(cfg.output.data_dir) / "cache" / "serp" / "backoff.json"
+
+
+def backed_off_until(cfg: AppConfig, now: Optional[datetime] = None) -> Dict[str, datetime]:
+    """engine -> end of its back-off, for engines still backed off at `now`."""
+    now = now or datetime.now(timezone.utc)
+    try:
+        raw = json.loads(_backoff_path(cfg).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    out = {}
+    for engine, until in (raw if isinstance(raw, dict) else {}).items():
+        try:
+            ts = datetime.fromisoformat(str(until))
+        except ValueError:
+            continue
+        if ts > now:
+            out[engine] = ts
+    return out
+
+
+def back_off(cfg: AppConfig, engine: str, now: Optional[datetime] = None) -> datetime:
+    """Stop querying `engine` for web_search.backoff_hours; returns when that ends."""
+    now = now or datetime.now(timezone.utc)
+    until = now + timedelta(hours=cfg.web_search.backoff_hours)
+    state = {k: v.isoformat(timespec="seconds") for k, v in backed_off_until(cfg, now).items()}
+    state[engine] = until.isoformat(timespec="seconds")
+    path = _backoff_path(cfg)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps(state, indent=2))
+    return until
+
+
+# =============================
+# Fetch
+# =============================
+
+def search_text(cfg: AppConfig, q: str) -> str:
+    sites = [s for s in (cfg.web_search.sites or []) if s]
+    if not sites:
+        return q
+    scope = " OR ".join(f"site:{s}" for s in sites)
+    return f"({scope}) {q}" if len(sites) > 1 else f"{scope} {q}"
+
+
+def _request_params(engine: str, text: str) -> dict:
+    if engine == "bing":
+        return {"q": text, "count": 30, "setlang": "sv"}
+    return {"q": text, "kl": "se-sv"}
+
+
+def fetch_serp(client: httpx.Client, cache: SerpCache, source: Source, text: str) -> Tuple[SerpPage, bool]:
+    """One result page, from cache when fresh. Returns (page, from_cache)."""
+    engine = engine_for(source)
+    cached = cache.get(engine, text)
+    if cached is not None:
+        return parse_serp(engine, cached), True
+
+    resp = client.get(source.base_url, params=_request_params(engine, text))
+    if resp.status_code in _BLOCKED_STATUS:
+        return SerpPage(engine=engine, blocked=True), False
+    resp.raise_for_status()
+    page = parse_serp(engine, resp.content)
+    if not page.blocked:
+        cache.put(engine, text, resp.content)
+    return page, False
+
+
+_TITLE_SUFFIXES = (" | LinkedIn", " - LinkedIn", " | Indeed", " - Indeed")
+
+
+def result_to_listing(source: Source, r: SerpResult) -> Listing:
+    """
+    Best-effort Listing from a result. LinkedIn titles look like
+    "Company hiring Title in Location | LinkedIn"; anything else keeps the
+    whole title and leaves company/location empty.
+    """
+    title = r.title
+    for suffix in _TITLE_SUFFIXES:
+        if title.endswith(suffix):
+            title = title[: -len(suffix)]
+            break
+
+    company = location = ""
+    if " hiring " in title:
+        company, title = title.split(" hiring ", 1)
+        if " in " in title:
+            title, location = title.rsplit(" in ", 1)
+
+    return Listing(
+        title=title.strip(),
+        company=company.strip(),
+        location=location.strip(),
+        url=r.url,
+        description=r.snippet or None,
+        source=source.name,
+    )
+
+
+def iter_web_search(
+    cfg: AppConfig,
+    sources: List[Source],
+    seen: Optional[Container[str]] = None,
+    blobs: Optional[BlobStore] = None,
+    transport: Optional[httpx.BaseTransport] = None,
+) -> Iterator[QueryBatch]:
+    """
+    Run every (web-search source, query) concurrently and yield one gated
+    QueryBatch per page as it completes. Results already in `seen`, or
+    already returned by another page this run, are skipped before gating.
+
+    The first bot check from an engine backs it off (see back_off): its
+    queries that haven't been sent yet are dropped, and later runs skip
+    the engine until the back-off ends.
+    """
+    sources = [s for s in sources if s.kind == "web_search"]
+    queries = web_search_queries(cfg)
+    if not sources or not queries:
+        return
+
+    backed_off = backed_off_until(cfg)
+    for s in sources:
+        until = backed_off.get(engine_for(s))
+        if until is not None:
+            print(f"{s.name}: backed off after a bot check, skipped until {until:%Y-%m-%d %H:%M} UTC")
+    blocked = set(backed_off)
+    sources = [s for s in sources if engine_for(s) not in blocked]
+    if not sources:
+        return
+
+    gates = web_search_gates(cfg)
+    cache = serp_cache(cfg)
+    claimed: set[str] = set()
+
+    def run(source: Source, q: str) -> Tuple[Source, str, Optional[SerpPage], bool, float]:
+        # Queued before another thread hit a bot check: don't send it.
+        if engine_for(source) in blocked:
+            return source, q, None, False, 0.0
+        started = time.perf_counter()
+        page, cached = fetch_serp(client, cache, source, search_text(cfg, q))
+        if page.blocked:
+            blocked.add(page.engine)
+        return source, q, page, cached, time.perf_counter() - started
+
+    with httpx.Client(headers=_HEADERS, timeout=20.0, follow_redirects=True, transport=transport) as client:
+        with ThreadPoolExecutor(max_workers=max(1, cfg.web_search.concurrency)) as pool:
+            futures = [pool.submit(run, s, q) for s in sources for q in queries]
+            for fut in as_completed(futures):
+                try:
+                    source, q, page, cached, seconds = fut.result()
+                except _QUERY_ERRORS as e:
+                    # One bad page (network, empty or undecodable HTML) costs one query, not the run.
+                    print(f"Web search failed: {type(e).__name__}: {e}")
+                    continue
+
+                if page is None:
+                    continue
+                label = query_label(page.engine, q)
+                if page.blocked:
+                    if page.engine not in backed_off:
+                        backed_off[page.engine] = until = back_off(cfg, page.engine)
+                        print(
+                            f"{source.name}: bot check instead of results for {q!r}; "
+                            f"backing off until {until:%Y-%m-%d %H:%M} UTC"
+                        )
+                    yield QueryBatch(source.name, label, 0, [], {r: 0 for r in DROP_REASONS}, seconds)
+                    continue
+
+                fresh: List[SerpResult] = []
+                for r in page.results:
+                    if r.url in claimed or (seen is not None and r.url in seen):
+                        continue
+                    claimed.add(r.url)
+                    fresh.append(r)
+
+                parsed = []
+                for r in fresh:
+                    listing = result_to_listing(source, r)
+                    title_l = listing.title.lower()
+                    parsed.append(ParsedHit(listing, title_l, f"{title_l}\n{(listing.description or '').lower()}"))
+
+                batch = gate_batch(gates, source, label, page.results, parsed, blobs)
+                batch.seconds = 0.0 if cached else seconds
+                yield batch
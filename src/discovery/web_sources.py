@@ -6,18 +6,28 @@ from typing import List
 from src.config import AppConfig
 
 
+# Web-search sources are named "WebSearch:<engine>".
+WEB_SOURCE_PREFIX = "WebSearch:"
+
 @dataclass(frozen=True)
 class Source:
     name: str
-    kind: str  # "jobtech_jobsearch"
+    kind: str  # "jobtech_jobsearch" | "web_search"
     base_url: str
 
 
 def build_default_sources(cfg: AppConfig) -> List[Source]:
-    return [
+    sources = [
         Source(
             name="JobTechJobSearch",
             kind="jobtech_jobsearch",
             base_url="https://jobsearch.api.jobtechdev.se",
         )
     ]
+    if cfg.web_search.enabled:
+        from src.discovery.serp import ENGINES
+
+        for engine in cfg.web_search.engines or []:
+            if engine in ENGINES:
+                sources.append(Source(name=f"{WEB_SOURCE_PREFIX}{engine}", kind="web_search", base_url=ENGINES[engine]))
+    return sources
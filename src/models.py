@@ -12,9 +12,16 @@ class Listing:
     url: str
     description: Optional[str] = None
     source: Optional[str] = None
+    # Set when `description` is only a snippet; full text is in the blob store.
+    description_hash: Optional[str] = None
+    # UTC ISO timestamps from the source, when it has them (JobTech does).
+    published: Optional[str] = None
+    deadline: Optional[str] = None
 
 
 @dataclass
 class ScoredListing(Listing):
     score: float = 0.0
     reasons: Optional[list[str]] = None
+    # companies.yaml entry this ad's employer matched, if any
+    target_company: Optional[str] = None
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import heapq
+import time
+from typing import Any, Callable, Container, Dict, Iterable, List, Optional, Tuple
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.table import Table
+from rich.text import Text
+
+from src.discovery.gates import DROP_REASONS, QueryBatch, record_batch
+from src.models import Listing, ScoredListing
+
+
+class LiveDashboard:
+    """
+    In-place monitor view fed one QueryBatch at a time:
+    per-query progress, running filter counters and a top-N table.
+    """
+
+    def __init__(self, queries: List[str], top_n: int = 15):
+        self.queries = list(queries)
+        self.top_n = top_n
+        self.started = time.perf_counter()
+        self.first_result_at: Optional[float] = None
+
+        self.done: Dict[str, Tuple[int, int, int, float]] = {}  # query -> hits, kept, new, seconds
+        self.hits = 0
+        self.kept = 0
+        self.dropped = {reason: 0 for reason in DROP_REASONS}
+        self.by_url: Dict[str, ScoredListing] = {}
+        self.new_urls: set[str] = set()
+
+    def add(self, batch: QueryBatch, scored: List[ScoredListing], seen: Container[str]) -> None:
+        new = 0
+        for item in scored:
+            if item.url in self.by_url:
+                continue
+            self.by_url[item.url] = item
+            if item.url not in seen:
+                self.new_urls.add(item.url)
+                new += 1
+
+        prev = self.done.get(batch.query, (0, 0, 0, 0.0))
+        self.done[batch.query] = (
+            prev[0] + batch.hits,
+            prev[1] + len(batch.kept),
+            prev[2] + new,
+            prev[3] + batch.seconds,
+        )
+        self.hits += batch.hits
+        self.kept += len(batch.kept)
+        for reason, n in batch.dropped.items():
+            self.dropped[reason] = self.dropped.get(reason, 0) + n
+
+        if self.first_result_at is None and self.by_url:
+            self.first_result_at = time.perf_counter() - self.started
+
+    def results(self) -> List[ScoredListing]:
+        return sorted(self.by_url.values(), key=lambda x: x.score, reverse=True)
+
+    # ---- rendering ----
+
+    def _progress(self) -> Table:
+        table = Table(title=f"Queries {len(self.done)}/{len(self.queries)}", expand=False)
+        table.add_column("", width=1)
+        table.add_column("Query")
+        table.add_column("Hits", justify="right")
+        table.add_column("Kept", justify="right")
+        table.add_column("New", justify="right")
+        table.add_column("ms", justify="right")
+        for q in self.queries:
+            if q in self.done:
+                hits, kept, new, secs = self.done[q]
+                table.add_row(
+                    "✓", q[:48], str(hits), str(kept),
+                    f"[green]{new}[/green]" if new else "0", f"{secs * 1000:.0f}",
+                )
+            else:
+                table.add_row("…", f"[dim]{q[:48]}[/dim]", "", "", "", "")
+        return table
+
+    def _counters(self) -> Text:
+        elapsed = time.perf_counter() - self.started
+        first = f"{self.first_result_at:.1f}s" if self.first_result_at is not None else "—"
+        dropped = ", ".join(f"{reason}={n}" for reason, n in self.dropped.items())
+        return Text.from_markup(
+            f"[bold]hits[/bold] {self.hits}  [bold]kept[/bold] {self.kept}  "
+            f"[bold]unique[/bold] {len(self.by_url)}  [bold green]new[/bold green] {len(self.new_urls)}  "
+            f"[dim]dropped: {dropped}  |  first result {first}, elapsed {elapsed:.1f}s[/dim]"
+        )
+
+    def _top(self) -> Table:
+        table = Table(title=f"Top {self.top_n} so far")
+        table.add_column("Score", justify="right")
+        table.add_column("", width=3)
+        table.add_column("Title")
+        table.add_column("Company")
+        table.add_column("Location")
+        table.add_column("Link")
+        best = heapq.nlargest(self.top_n, self.by_url.values(), key=lambda x: x.score)
+        for item in best:
+            company = (item.company or "")[:28]
+            if item.target_company:
+                company = f"[bold magenta]★ {company[:26]}[/bold magenta]"
+            table.add_row(
+                f"{item.score:.1f}",
+                "[green]NEW[/green]" if item.url in self.new_urls else "",
+                (item.title or "")[:50],
+                company,
+                (item.location or "")[:18],
+                (item.url or "")[:80],
+            )
+        return table
+
+    def render(self) -> Group:
+        return Group(self._progress(), self._counters(), self._top())
+
+
+def stream_monitor(
+    console: Console,
+    batches: Iterable[QueryBatch],
+    score_batch: Callable[[List[Listing]], List[ScoredListing]],
+    seen: Container[str],
+    queries: List[str],
+    yields: Optional[Dict[str, Dict[str, Any]]] = None,
+    top_n: int = 15,
+) -> List[ScoredListing]:
+    """
+    Consume batches as they arrive, scoring each one and redrawing the
+    dashboard in place. Returns every unique listing, best first.
+    """
+    dash = LiveDashboard(queries, top_n=top_n)
+    with Live(dash.render(), console=console, refresh_per_second=8) as live:
+        for batch in batches:
+            if yields is not None:
+                record_batch(yields, batch)
+            dash.add(batch, score_batch(batch.kept), seen)
+            live.update(dash.render())
+    return dash.results()
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.discovery.gates import QueryBatch
+from src.storage.retention import RetentionReport
+
+
+# =============================
+# Metric types
+# =============================
+#
+# Single writer (the monitor loop), any number of readers (the HTTP thread).
+# Writers only ever assign dict items / list slots, and readers copy with
+# list(dict.items()), which CPython does atomically, so there are no locks.
+# A scrape may see a histogram mid-update (count bumped, sum not yet), which
+# Prometheus tolerates.
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_labels(self.label_names, k)} {_fmt(v)}" for k, v in list(self._values.items())]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = float(value)
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_labels(self.label_names, k)} {_fmt(v)}" for k, v in list(self._values.items())]
+
+
+# Seconds; covers a fast cached page up to a stalled JobTech request.
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = [0.0] * (len(self.buckets) + 2)
+            self._series[key] = series
+        i = 0
+        while i < len(self.buckets) and value > self.buckets[i]:
+            i += 1
+        series[i] += 1
+        series[-1] += value
+
+    def _samples(self) -> List[str]:
+        out = []
+        for key, series in list(self._series.items()):
+            counts = list(series)
+            cumulative = 0.0
+            for bound, n in zip(self.buckets + (float("inf"),), counts[:-1]):
+                cumulative += n
+                le = 'le="' + _fmt(bound) + '"'
+                out.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {_fmt(cumulative)}")
+            out.append(f"{self.name}_sum{_labels(self.label_names, key)} {_fmt(counts[-1])}")
+            out.append(f"{self.name}_count{_labels(self.label_names, key)} {_fmt(cumulative)}")
+        return out
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def _add(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+# =============================
+# Monitor metrics
+# =============================
+
+class MonitorMetrics:
+    """Everything the monitor daemon exports, under the lia_ prefix."""
+
+    def __init__(self):
+        self.registry = r = MetricsRegistry()
+        self.request_seconds = r.histogram(
+            "lia_fetch_request_seconds", "Latency of one search request.", ("source", "query"))
+        self.hits = r.counter("lia_fetch_hits_total", "Hits returned by searches.", ("source", "query"))
+        self.kept = r.counter("lia_fetch_kept_total", "Hits that passed every gate.", ("source", "query"))
+        self.dropped = r.counter("lia_fetch_dropped_total", "Hits dropped, by gate.", ("source", "reason"))
+        self.score_seconds = r.histogram("lia_score_seconds", "Time spent scoring one tick's listings.")
+        self.storage_seconds = r.histogram(
+            "lia_storage_seconds", "Time spent writing listings.json, stats, seen index and history.")
+        self.tick_seconds = r.histogram(
+            "lia_tick_seconds", "Duration of one monitor tick.", buckets=(1, 5, 10, 30, 60, 120, 300, 600))
+        self.ticks = r.counter("lia_ticks_total", "Monitor ticks by outcome.", ("outcome",))
+        self.seen_size = r.gauge("lia_seen_ads", "Ads in the seen index.")
+        self.new_items = r.counter("lia_new_listings_total", "Listings not seen before.")
+        self.last_success = r.gauge(
+            "lia_last_success_timestamp_seconds", "Unix time the last successful tick finished.")
+        self.last_tick = r.gauge("lia_last_tick_timestamp_seconds", "Unix time the last tick finished.")
+        self.expired = r.counter("lia_expired_listings_total", "Listings moved to the cold archive.")
+        self.hot_listings = r.gauge("lia_hot_listings", "Listings in listings.db after the last retention run.")
+        self.retention_seconds = r.histogram("lia_retention_seconds", "Duration of one retention/compaction run.")
+
+    def observe_batch(self, batch: QueryBatch) -> None:
+        self.request_seconds.observe(batch.seconds, source=batch.source, query=batch.query)
+        self.hits.inc(batch.hits, source=batch.source, query=batch.query)
+        self.kept.inc(len(batch.kept), source=batch.source, query=batch.query)
+        for reason, n in batch.dropped.items():
+            if n:
+                self.dropped.inc(n, source=batch.source, reason=reason)
+
+    def retention_finished(self, report: RetentionReport) -> None:
+        self.expired.inc(report.expired)
+        self.hot_listings.set(report.hot)
+        self.retention_seconds.observe(report.seconds)
+
+    def tick_finished(self, ok: bool, seconds: float) -> None:
+        now = time.time()
+        self.ticks.inc(outcome="ok" if ok else "error")
+        self.tick_seconds.observe(seconds)
+        self.last_tick.set(now)
+        if ok:
+            self.last_success.set(now)
+
+
+# =============================
+# HTTP endpoint
+# =============================
+
+def serve_metrics(registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108) -> ThreadingHTTPServer:
+    """Serve GET /metrics (Prometheus text format) from a background thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass  # keep scrapes out of the console
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+def start_metrics_server(metrics: MonitorMetrics, host: str, port: int) -> Optional[ThreadingHTTPServer]:
+    """serve_metrics, or None if the port is disabled (0) or taken."""
+    if not port:
+        return None
+    try:
+        return serve_metrics(metrics.registry, host, port)
+    except OSError as e:
+        print(f"Metrics endpoint not started on {host}:{port}: {e}")
+        return None
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Container, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+
+from src.config import AppConfig
+from src.discovery.fetch import build_queries, fetch_listings, iter_fetch
+from src.discovery.gates import QueryBatch
+from src.discovery.planner import (
+    load_query_stats,
+    plan_queries,
+    query_last_runs,
+    record_query_yields,
+    save_query_stats,
+)
+from src.discovery.web_search import engine_for, query_label, web_search_queries
+from src.discovery.web_sources import Source
+from src.models import Listing, ScoredListing
+from src.monitor.metrics import MonitorMetrics
+from src.ranking.companies import CompanyMatcher
+from src.ranking.score import score_listings
+from src.storage.archive import raw_archive
+from src.storage.blobs import BlobStore, blob_store
+from src.storage.index import index_listings, indexed_urls
+from src.storage.retention import RetentionReport, run_retention
+from src.storage.save import update_listings_json
+from src.storage.seen import SeenIndex, open_seen_index
+
+
+def persist_results(
+    cfg: AppConfig,
+    scored: List[ScoredListing],
+    query_stats: Dict[str, Any],
+    yields: Dict[str, Dict[str, Any]],
+    seen: SeenIndex,
+    blobs: Optional[BlobStore] = None,
+    now: Optional[str] = None,
+    on_retention: Optional[Callable[[RetentionReport], None]] = None,
+) -> List[ScoredListing]:
+    """
+    Everything a monitor tick writes once results are scored: query yield
+    stats, the seen index and the history index, then (when due) retention:
+    closed ads out to data/cold/ and compaction. Last, listings.json, the
+    snapshot of every open listing (this tick's merged in, expired ones out).
+    Returns the listings that were not seen before this tick.
+    `now` (ISO timestamp) overrides the tick time, e.g. for simulated runs.
+    on_retention: called with the report whenever retention actually ran.
+    """
+    save_query_stats(cfg, record_query_yields(query_stats, yields, seen, now=now))
+    new_items = [x for x in scored if x.url not in seen]
+
+    # Update seen with all current URLs
+    for x in scored:
+        seen.add(x.url)
+
+    # Keep full history searchable (python main.py search ...)
+    index_listings(cfg, scored, seen_at=now, blobs=blobs)
+
+    open_urls = None
+    if cfg.retention.enabled:
+        report = run_retention(cfg, seen, blobs, now=datetime.fromisoformat(now) if now else None)
+        if report.ran:
+            open_urls = indexed_urls(cfg)
+            if on_retention is not None:
+                on_retention(report)
+
+    update_listings_json(cfg, scored, open_urls)
+    return new_items
+
+
+# =============================
+# One monitor tick
+# =============================
+
+@dataclass
+class TickResult:
+    queries: int = 0                # planned this tick
+    all_queries: int = 0
+    hits: int = 0
+    scored: List[ScoredListing] = field(default_factory=list)
+    new_items: List[ScoredListing] = field(default_factory=list)
+    seen_count: int = 0
+    retention: Optional[RetentionReport] = None
+    fetch_seconds: float = 0.0      # includes scoring when streamed
+    score_seconds: float = 0.0
+    persist_seconds: float = 0.0
+
+
+# Live dashboard: (batches, score_batch, seen, query labels, yields) -> every scored listing
+StreamFn = Callable[
+    [Iterator[QueryBatch], Callable[[List[Listing]], List[ScoredListing]], Container[str], List[str], Dict[str, Any]],
+    List[ScoredListing],
+]
+
+
+def _observed(batches: Iterable[QueryBatch], on_batch: Callable[[QueryBatch], None]) -> Iterator[QueryBatch]:
+    for batch in batches:
+        on_batch(batch)
+        yield batch
+
+
+def _web_labels(cfg: AppConfig, sources: List[Source]) -> List[str]:
+    return [
+        query_label(engine_for(s), q)
+        for s in sources if s.kind == "web_search"
+        for q in web_search_queries(cfg)
+    ]
+
+
+def run_tick(
+    cfg: AppConfig,
+    sources: List[Source],
+    matcher: Optional[CompanyMatcher] = None,
+    metrics: Optional[MonitorMetrics] = None,
+    stream: Optional[StreamFn] = None,
+    on_retention: Optional[Callable[[RetentionReport], None]] = None,
+    now: Optional[datetime] = None,
+    transport: Optional[httpx.BaseTransport] = None,
+) -> TickResult:
+    """
+    One monitor run: plan the queries, fetch and gate, score, persist.
+    `python main.py monitor/live/daemon` and the soak harness all go through here.
+
+    stream:    show results as they arrive (live mode) instead of scoring at the end.
+    now:       the tick's time (default: the wall clock), e.g. a simulated clock.
+    transport: httpx transport for the JobTech client, e.g. a stub board.
+    """
+    result = TickResult()
+    query_stats = load_query_stats(cfg)
+    all_queries = build_queries(cfg)
+    queries = plan_queries(cfg, all_queries, query_stats)
+    result.queries, result.all_queries = len(queries), len(all_queries)
+
+    clock = (lambda: now) if now is not None else None
+    blobs = blob_store(cfg, clock)
+    archive = raw_archive(cfg, clock) if cfg.output.archive_raw_hits else None
+    last_runs = query_last_runs(query_stats)
+    yields: Dict[str, Dict[str, Any]] = {}
+
+    def on_batch(batch: QueryBatch) -> None:
+        result.hits += batch.hits
+        if metrics is not None:
+            metrics.observe_batch(batch)
+
+    def score(kept: List[Listing]) -> List[ScoredListing]:
+        return score_listings(cfg, kept, blobs=blobs, matcher=matcher)
+
+    def retention_done(report: RetentionReport) -> None:
+        result.retention = report
+        if metrics is not None:
+            metrics.retention_finished(report)
+        if on_retention is not None:
+            on_retention(report)
+
+    with open_seen_index(cfg) as seen:
+        started = time.perf_counter()
+        if stream is not None:
+            batches = iter_fetch(cfg, sources, queries, last_runs, blobs, archive, seen, transport, now)
+            scored = stream(_observed(batches, on_batch), score, seen, queries + _web_labels(cfg, sources), yields)
+            result.fetch_seconds = time.perf_counter() - started
+        else:
+            listings = fetch_listings(
+                cfg,
+                sources,
+                queries=queries,
+                yields=yields,
+                last_runs=last_runs,
+                blobs=blobs,
+                archive=archive,
+                seen=seen,
+                on_batch=on_batch,
+                transport=transport,
+                now=now,
+            )
+            result.fetch_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            scored = score(listings)
+            result.score_seconds = time.perf_counter() - started
+            if metrics is not None:
+                metrics.score_seconds.observe(result.score_seconds)
+
+        started = time.perf_counter()
+        tick_time = now.isoformat(timespec="seconds") if now is not None else None
+        result.new_items = persist_results(
+            cfg, scored, query_stats, yields, seen, blobs=blobs, now=tick_time, on_retention=retention_done
+        )
+        result.seen_count = len(seen)
+        result.persist_seconds = time.perf_counter() - started
+
+    if metrics is not None:
+        metrics.storage_seconds.observe(result.persist_seconds)
+        metrics.seen_size.set(result.seen_count)
+        metrics.new_items.inc(len(result.new_items))
+    result.scored = scored
+    return result
+
+
+def run_guarded(
+    tick: Callable[[], Any],
+    metrics: Optional[MonitorMetrics] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> bool:
+    """
+    The daemon's error policy for one tick: an exception is passed to
+    `on_error` and counted in metrics, never raised, so the next tick runs.
+    Returns whether the tick succeeded.
+    """
+    started = time.perf_counter()
+    try:
+        tick()
+    except Exception as e:
+        if metrics is not None:
+            metrics.tick_finished(False, time.perf_counter() - started)
+        if on_error is not None:
+            on_error(e)
+        return False
+    if metrics is not None:
+        metrics.tick_finished(True, time.perf_counter() - started)
+    return True
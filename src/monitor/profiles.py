@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import yaml
+
+from src.config import AppConfig, load_config
+from src.discovery.details import ad_cache, fill_details, two_phase_enabled
+from src.discovery.fetch import (
+    build_queries,
+    build_search_params,
+    jobtech_headers,
+    parse_hits,
+    search_hits,
+    server_exclusions,
+)
+from src.discovery.gates import Gates, build_gates, gate_batch, record_batch
+from src.discovery.planner import load_query_stats, plan_queries, query_last_runs
+from src.discovery.taxonomy import resolve_location_params
+from src.discovery.web_sources import Source
+from src.models import Listing, ScoredListing
+from src.monitor.pipeline import persist_results
+from src.ranking.companies import CompanyMatcher, load_company_matcher
+from src.ranking.score import score_listings
+from src.storage.archive import RawArchive, raw_archive
+from src.storage.blobs import BlobStore, blob_store
+from src.storage.save import ensure_dirs
+from src.storage.seen import open_seen_index
+
+
+# =============================
+# Loading
+# =============================
+
+@dataclass
+class MonitorProfile:
+    name: str
+    cfg: AppConfig
+    companies: str = "companies.yaml"
+
+
+def load_profiles(path: str = "profiles.yaml") -> List[MonitorProfile]:
+    """
+    profiles.yaml:
+      profiles:
+        - name: anna
+          config: profiles/anna/config.yaml      # its own output.data_dir
+          companies: profiles/anna/companies.yaml  # optional
+    """
+    raw = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    out: List[MonitorProfile] = []
+    for p in raw.get("profiles", []) or []:
+        name = str(p.get("name", "") or "").strip()
+        config = p.get("config", "") or ""
+        if not name or not config:
+            continue
+        out.append(
+            MonitorProfile(
+                name=name,
+                cfg=load_config(config),
+                companies=p.get("companies", "companies.yaml") or "companies.yaml",
+            )
+        )
+
+    data_dirs = [str(Path(p.cfg.output.data_dir).resolve()) for p in out]
+    if len(set(data_dirs)) != len(data_dirs):
+        raise ValueError("Every profile needs its own output.data_dir (seen sets and listings are per profile).")
+    return out
+
+
+# =============================
+# Shared fetch
+# =============================
+
+@dataclass
+class _ProfileRun:
+    profile: MonitorProfile
+    gates: Gates
+    queries: List[str]
+    query_stats: Dict[str, Any]
+    last_runs: Dict[str, str]
+    blobs: BlobStore
+    archive: Optional[RawArchive]
+    matcher: Optional[CompanyMatcher]
+    yields: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    kept: List[Listing] = field(default_factory=list)
+
+
+@dataclass
+class _SharedRequest:
+    source: Source
+    params: Dict[str, Any]
+    wanted: List[Tuple[_ProfileRun, str]] = field(default_factory=list)
+    # published-after (minutes) per wanting profile; None = full window
+    windows: List[Optional[int]] = field(default_factory=list)
+    # server-side "-term" exclusions per wanting profile
+    exclusions: List[List[str]] = field(default_factory=list)
+
+    def shared_exclusions(self) -> List[str]:
+        """Terms every wanting profile excludes; each profile's extras are left to its local gate."""
+        if not self.exclusions:
+            return []
+        return [t for t in self.exclusions[0] if all(t in e for e in self.exclusions[1:])]
+
+
+@dataclass
+class ProfileResult:
+    name: str
+    queries: int
+    kept: int
+    scored: List[ScoredListing]
+    new_items: List[ScoredListing]
+    seen_count: int
+
+
+@dataclass
+class SharedRunReport:
+    profiles: List[ProfileResult]
+    requests: int           # distinct requests actually sent
+    requests_separate: int  # what one process per profile would have sent
+    seconds: float
+
+
+def _prepare(profile: MonitorProfile) -> _ProfileRun:
+    cfg = profile.cfg
+    ensure_dirs(cfg)
+    stats = load_query_stats(cfg)
+    return _ProfileRun(
+        profile=profile,
+        gates=build_gates(cfg),
+        queries=plan_queries(cfg, build_queries(cfg), stats),
+        query_stats=stats,
+        last_runs=query_last_runs(stats),
+        blobs=blob_store(cfg),
+        archive=raw_archive(cfg) if cfg.output.archive_raw_hits else None,
+        matcher=load_company_matcher(profile.companies),
+    )
+
+
+def _merge_requests(runs: List[_ProfileRun], sources: List[Source]) -> List[_SharedRequest]:
+    """
+    Group every profile's (source, query) into distinct requests. Requests that
+    differ only in published-after or in "-term" exclusions are merged, using
+    the widest window and the exclusions all of them share, so each profile
+    still sees everything it would have fetched on its own. The terms only
+    some profiles exclude are left to those profiles' not_lia gate.
+    """
+    merged: Dict[Tuple[str, str, str], _SharedRequest] = {}
+    for run in runs:
+        cfg = run.profile.cfg
+        location_params = resolve_location_params(cfg.search.locations, cfg.search.location_concepts)
+        for s in sources:
+            if getattr(s, "kind", "") != "jobtech_jobsearch":
+                continue
+            for q in run.queries:
+                params = build_search_params(cfg, q, location_params, run.last_runs.get(q), exclusions=[])
+                window = params.pop("published-after", None)
+                key = (s.name, s.base_url, json.dumps(params, sort_keys=True, ensure_ascii=False))
+
+                req = merged.get(key)
+                if req is None:
+                    req = merged[key] = _SharedRequest(source=s, params=params)
+                req.wanted.append((run, q))
+                req.windows.append(window)
+                req.exclusions.append(server_exclusions(cfg))
+    return list(merged.values())
+
+
+def run_shared_monitor(
+    profiles: List[MonitorProfile],
+    sources: List[Source],
+    transport: Optional[httpx.BaseTransport] = None,
+) -> SharedRunReport:
+    """
+    Monitor several profiles with one fetch pass: each distinct JobSearch
+    request is sent once, its hits are parsed/normalized/lowercased once, and
+    every profile that asked for it gates the same parsed batch with its own
+    terms. Scoring, listings.json, query stats, seen sets and history stay
+    per profile. Only JobTech sources are fetched; web_search isn't shared.
+
+    Gating is the same gate_batch per wanting profile, not one pass for all
+    of them: the parse/normalize work is shared, the term matching isn't.
+    The detail fetch runs at the highest detail_concurrency any profile asks
+    for, and the ad cache lives under the first profile's data_dir (so its
+    retention settings sweep it). Raw archives stay per profile.
+    """
+    started = time.perf_counter()
+    runs = [_prepare(p) for p in profiles]
+    requests = _merge_requests(runs, sources)
+
+    # X-Fields only if every profile is happy with the projected payload, and
+    # headline-only searches only if every profile runs two-phase on top of it.
+    first = profiles[0].cfg
+    two_phase = all(two_phase_enabled(r.profile.cfg) for r in runs)
+    headers = jobtech_headers(first, two_phase=two_phase)
+    if not all(r.profile.cfg.search.query.server_filters for r in runs):
+        headers.pop("X-Fields", None)
+    # The detail cache is shared like the requests: an ad is the same for everyone.
+    cache = ad_cache(first) if two_phase else None
+
+    with ExitStack() as stack:
+        client = stack.enter_context(httpx.Client(headers=headers, timeout=25.0, transport=transport))
+        pool = None
+        if two_phase:
+            workers = max(r.profile.cfg.search.query.detail_concurrency for r in runs)
+            pool = stack.enter_context(ThreadPoolExecutor(max_workers=max(1, workers)))
+        for req in requests:
+            params = dict(req.params)
+            params["q"] = " ".join([params["q"]] + [f"-{t}" for t in req.shared_exclusions()])
+            if req.windows and None not in req.windows:
+                params["published-after"] = max(req.windows)
+
+            t0 = time.perf_counter()
+            hits = search_hits(client, req.source, params)
+            partial, failed = None, 0
+            if two_phase:
+                # Worth fetching if any wanting profile's title gates keep it.
+                wanting = [run.gates for run, _ in req.wanted]
+                details = fill_details(client, req.source, hits, wanting, cache, pool)
+                hits, partial, failed = details.hits, details.partial, details.failed
+            parsed = parse_hits(req.source, hits)
+            elapsed = time.perf_counter() - t0
+
+            for run, q in req.wanted:
+                batch = gate_batch(run.gates, req.source, q, hits, parsed, run.blobs, run.archive, partial, failed)
+                batch.seconds = elapsed
+                record_batch(run.yields, batch)
+                run.kept.extend(batch.kept)
+
+    results: List[ProfileResult] = []
+    for run in runs:
+        cfg = run.profile.cfg
+
+        uniq: Dict[str, Listing] = {}
+        for l in run.kept:
+            uniq.setdefault(l.url, l)
+
+        scored = score_listings(cfg, list(uniq.values()), blobs=run.blobs, matcher=run.matcher)
+        with open_seen_index(cfg) as seen:
+            new_items = persist_results(cfg, scored, run.query_stats, run.yields, seen, blobs=run.blobs)
+            seen_count = len(seen)
+
+        results.append(
+            ProfileResult(
+                name=run.profile.name,
+                queries=len(run.queries),
+                kept=len(scored),
+                scored=scored,
+                new_items=new_items,
+                seen_count=seen_count,
+            )
+        )
+
+    return SharedRunReport(
+        profiles=results,
+        requests=len(requests),
+        requests_separate=sum(len(r.wanted) for r in requests),
+        seconds=time.perf_counter() - started,
+    )
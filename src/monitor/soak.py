@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+import csv
+import os
+import random
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from src.config import AppConfig
+from src.discovery.fetch import build_queries
+from src.discovery.web_sources import Source
+from src.monitor.metrics import MonitorMetrics
+from src.monitor.pipeline import TickResult, run_guarded, run_tick
+from src.ranking.companies import load_company_matcher
+from src.storage.save import ensure_dirs
+
+
+# =============================
+# Simulated clock
+# =============================
+
+class SimulatedClock:
+    """
+    Injectable clock: time only moves when the harness says so. It starts at
+    the real time, so simulated time is never behind the mtimes of files the
+    run writes (retention and the caches compare the two).
+    """
+
+    def __init__(self, start: Optional[datetime] = None):
+        self._now = start or datetime.now(timezone.utc).replace(second=0, microsecond=0)
+
+    def now(self) -> datetime:
+        return self._now
+
+    def iso(self) -> str:
+        return self._now.isoformat(timespec="seconds")
+
+    def advance(self, minutes: float) -> None:
+        self._now += timedelta(minutes=minutes)
+
+
+# =============================
+# Stub job board
+# =============================
+
+# (headline, description) templates. The first group passes the default
+# gates, the second is the senior/permanent/non-Java noise around it.
+_RELEVANT = [
+    ("LIA Java-utvecklare", "Vi söker en LIA-student inom Java och Spring Boot."),
+    ("LIA backend Java", "Praktik i vårt backendteam: Java, REST, Kafka."),
+    ("Praktik systemutvecklare Java", "Lärande i arbete med Java, JUnit och Maven."),
+    ("LIA testautomatisering", "LIA inom testautomation med Java och Selenium."),
+    ("LIA Kotlin/Java", "YH-praktik i ett team som bygger microservices i Kotlin."),
+]
+_NOISE = [
+    ("Senior Java-utvecklare", "Fast anställning, heltid. Java, Spring."),
+    ("Backendutvecklare", "Tillsvidare. Java och Kubernetes."),
+    ("LIA UX-design", "Praktik inom UX och Figma."),
+    ("Lagerarbetare", "Heltid, skift."),
+    ("Tech lead Java", "Permanent full-time role, Java/JVM."),
+]
+_EMPLOYERS = [f"Exempelbolag {i} AB" for i in range(400)]
+_PLACES = ["Stockholm", "Solna", "Sundbyberg", "Nacka", "Kista", "Uppsala", "Göteborg", "Södertälje"]
+
+
+@dataclass
+class _Ad:
+    id: str
+    published: datetime
+    expires: datetime
+    queries: frozenset
+    ad: Dict[str, Any]
+
+
+class StubJobBoard:
+    """
+    In-memory JobSearch stand-in with realistic churn: ads arrive as a
+    Poisson process, live for an exponential number of days and are
+    matched by a few of the monitor's queries each.
+
+    `transport` serves it over httpx the way JobSearch does (/search with
+    q, limit, published-after and the X-Fields mask; /ad/{id}, 404 once the
+    ad has expired), so the monitor's real client, two-phase fetch and ad
+    cache run against it. A fault is a connection error on any request.
+    """
+
+    def __init__(
+        self,
+        clock: SimulatedClock,
+        queries: List[str],
+        ads_per_day: float = 40.0,
+        mean_lifetime_days: float = 21.0,
+        relevant_share: float = 0.3,
+        fault_rate: float = 0.0,
+        seed: int = 1,
+        location_suffix: str = "",
+    ):
+        self.clock = clock
+        self.location_suffix = location_suffix
+        self.queries = [self._key(q) for q in queries]
+        self.ads_per_day = ads_per_day
+        self.mean_lifetime_days = mean_lifetime_days
+        self.relevant_share = relevant_share
+        self.fault_rate = fault_rate
+        self.rng = random.Random(seed)
+        self.active: List[_Ad] = []
+        self.by_id: Dict[str, _Ad] = {}
+        self.created = 0
+        self.requests = 0
+        self._last = clock.now()
+        self.transport = httpx.MockTransport(self._handle)
+
+    def _key(self, q: str) -> str:
+        """A query as sent, minus "-term" exclusions and the location text (sent as concept ids)."""
+        words = " ".join(w for w in q.split() if not w.startswith("-"))
+        if self.location_suffix and words.endswith(f" {self.location_suffix}"):
+            words = words[: -len(self.location_suffix)].rstrip()
+        return words
+
+    def _new_ad(self) -> _Ad:
+        self.created += 1
+        ad_id = f"stub-{self.created}"
+        relevant = self.rng.random() < self.relevant_share
+        headline, text = self.rng.choice(_RELEVANT if relevant else _NOISE)
+        k = self.rng.randint(1, 4 if relevant else 2)
+        matched = frozenset(self.rng.sample(self.queries, min(k, len(self.queries))))
+        lifetime = self.rng.expovariate(1.0 / self.mean_lifetime_days)
+        employer = self.rng.choice(_EMPLOYERS)
+        now = self.clock.now()
+        return _Ad(
+            id=ad_id,
+            published=now,
+            expires=now + timedelta(days=lifetime),
+            queries=matched,
+            ad={
+                "id": ad_id,
+                "headline": f"{headline} #{self.created}",
+                "webpage_url": f"https://stub.example/ad/{ad_id}",
+                "employer": {"name": employer},
+                "workplace_address": {"municipality": self.rng.choice(_PLACES)},
+                "description": {"text": f"{text} {employer}. " + "Lorem ipsum. " * self.rng.randint(3, 30)},
+                "timestamp": int(now.timestamp() * 1000),
+                "publication_date": now.isoformat(timespec="seconds"),
+                "application_deadline": (now + timedelta(days=lifetime)).isoformat(timespec="seconds"),
+            },
+        )
+
+    def advance(self) -> None:
+        """Publish the ads that arrived since the last call and expire old ones."""
+        now = self.clock.now()
+        days = (now - self._last).total_seconds() / 86400
+        self._last = now
+
+        # Poisson arrivals via exponential gaps
+        t = self.rng.expovariate(self.ads_per_day) if self.ads_per_day > 0 else days + 1
+        while t < days:
+            a = self._new_ad()
+            self.active.append(a)
+            self.by_id[a.id] = a
+            t += self.rng.expovariate(self.ads_per_day)
+        expired = [a for a in self.active if a.expires <= now]
+        if expired:
+            self.active = [a for a in self.active if a.expires > now]
+            for a in expired:
+                del self.by_id[a.id]
+
+    def search(self, query: str, limit: int, published_after: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Newest first, like JobSearch; published_after mirrors its incremental filter."""
+        key = self._key(query)
+        out: List[Dict[str, Any]] = []
+        for a in reversed(self.active):
+            if published_after is not None and a.published <= published_after:
+                break  # active is in publication order
+            if key in a.queries:
+                out.append(a.ad)
+                if len(out) >= limit:
+                    break
+        return out
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.fault_rate and self.rng.random() < self.fault_rate:
+            raise httpx.ConnectError("simulated outage", request=request)
+
+        path = request.url.path
+        if path.startswith("/ad/"):
+            a = self.by_id.get(path[len("/ad/"):])
+            if a is None:
+                return httpx.Response(404, json={"message": "Ad not found"})
+            return httpx.Response(200, json=a.ad)
+        if path != "/search":
+            return httpx.Response(404)
+
+        params = request.url.params
+        since = None
+        if params.get("published-after"):
+            since = self.clock.now() - timedelta(minutes=int(params["published-after"]))
+        hits = self.search(params.get("q", ""), int(params.get("limit", 100)), published_after=since)
+        if "description" not in request.headers.get("X-Fields", "description"):
+            # Two-phase search mask: headlines only
+            hits = [{k: v for k, v in h.items() if k != "description"} for h in hits]
+        return httpx.Response(200, json={"total": {"value": len(hits)}, "hits": hits})
+
+
+# =============================
+# Measurements
+# =============================
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size now (Linux), or peak RSS where only that is available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+def _tree_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for e in entries:
+            if e.is_dir(follow_symlinks=False):
+                stack.append(Path(e.path))
+            elif e.is_file(follow_symlinks=False):
+                total += e.stat().st_size
+    return total
+
+
+# data_dir entries tracked separately in the CSV
+STORAGE_PARTS = {
+    "listings_json": ("listings.json",),
+    "listings_db": ("listings.db", "listings.db-wal", "listings.db-shm"),
+    "seen": ("seen", "seen_ads.json"),
+    "blobs": ("blobs",),
+    "archive": ("archive",),
+    "cold": ("cold",),
+    "cache": ("cache",),
+    "query_stats": ("query_stats.json",),
+}
+
+
+def storage_sizes(data_dir: Path) -> Dict[str, int]:
+    sizes = {
+        part: sum(_tree_size(data_dir / name) for name in names if (data_dir / name).exists())
+        for part, names in STORAGE_PARTS.items()
+    }
+    sizes["total"] = _tree_size(data_dir)
+    return sizes
+
+
+# =============================
+# Harness
+# =============================
+
+@dataclass
+class SoakReport:
+    ticks: int = 0
+    errors: int = 0
+    ads_created: int = 0
+    seen: int = 0
+    expired: int = 0
+    seconds: float = 0.0
+    csv_path: Optional[Path] = None
+    # mean tick latency (s) over one simulated day once the board has
+    # reached steady state (two ad lifetimes in), and over the last day
+    baseline_day: int = 0
+    baseline_latency: float = 0.0
+    last_day_latency: float = 0.0
+    rss_start: Optional[int] = None
+    rss_end: Optional[int] = None
+    storage_end: Dict[str, int] = field(default_factory=dict)
+    error_types: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def latency_growth(self) -> float:
+        return self.last_day_latency / self.baseline_latency if self.baseline_latency else 0.0
+
+
+CSV_FIELDS = [
+    "tick", "sim_time", "ok", "error", "queries", "hits", "kept", "new", "seen", "expired", "hot",
+    "fetch_s", "score_s", "persist_s", "tick_s", "rss_bytes",
+] + [f"storage_{p}" for p in STORAGE_PARTS] + ["storage_total"]
+
+
+def run_soak(
+    cfg: AppConfig,
+    out_dir: Path,
+    days: float = 180,
+    tick_minutes: float = 30,
+    ads_per_day: float = 40.0,
+    mean_lifetime_days: float = 21.0,
+    fault_rate: float = 0.002,
+    sample_every: int = 48,
+    seed: int = 1,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> SoakReport:
+    """
+    Run the monitor tick (pipeline.run_tick, under the daemon's run_guarded
+    error policy) against a stub JobSearch board for `days` of simulated
+    time, in a fresh data dir under out_dir. Only the clock and the HTTP
+    transport are simulated. Every tick writes a CSV row (latency split,
+    counts); RSS and per-part storage sizes are sampled every
+    `sample_every` ticks. What the monitor prints goes to soak.log.
+    """
+    data_dir = Path(out_dir) / "data"
+    if data_dir.exists() and any(data_dir.iterdir()):
+        raise ValueError(f"{data_dir} is not empty; pick a fresh --out for each soak run.")
+    cfg = replace(cfg, output=replace(cfg.output, data_dir=str(data_dir), applications_dir=str(Path(out_dir) / "applications")))
+    ensure_dirs(cfg)
+    # The stub doesn't check it, but the real client refuses to start without one.
+    os.environ.setdefault("JOBTECH_API_KEY", "soak")
+
+    clock = SimulatedClock()
+    board = StubJobBoard(
+        clock,
+        build_queries(cfg),
+        ads_per_day,
+        mean_lifetime_days,
+        fault_rate=fault_rate,
+        seed=seed,
+        location_suffix=" ".join(cfg.search.locations or ["Stockholm"]),
+    )
+    sources = [Source(name="StubJobBoard", kind="jobtech_jobsearch", base_url="https://stub.example")]
+    matcher = load_company_matcher("companies.yaml")
+    metrics = MonitorMetrics()
+
+    total_ticks = int(days * 24 * 60 / tick_minutes)
+    ticks_per_day = max(1, int(24 * 60 / tick_minutes))
+    report = SoakReport(rss_start=current_rss_bytes())
+    latencies: List[float] = []
+
+    csv_path = Path(out_dir) / "soak.csv"
+    started = time.perf_counter()
+
+    with open(csv_path, "w", encoding="utf-8", newline="") as f, \
+            open(Path(out_dir) / "soak.log", "w", encoding="utf-8") as log:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+
+        for tick in range(total_ticks):
+            clock.advance(tick_minutes)
+            board.advance()
+
+            row: Dict[str, Any] = {"tick": tick, "sim_time": clock.iso(), "ok": 1, "error": ""}
+            results: List[TickResult] = []
+
+            def one_tick() -> None:
+                with redirect_stdout(log):
+                    print(f"--- tick {tick} {clock.iso()}")
+                    results.append(run_tick(cfg, sources, matcher, metrics, now=clock.now(), transport=board.transport))
+
+            def failed(e: Exception) -> None:
+                name = type(e).__name__
+                report.errors += 1
+                report.error_types[name] = report.error_types.get(name, 0) + 1
+                row.update(ok=0, error=name)
+                print(f"tick {tick} failed: {name}: {e}", file=log)
+
+            t0 = time.perf_counter()
+            run_guarded(one_tick, metrics, on_error=failed)
+            tick_s = time.perf_counter() - t0
+
+            if results:
+                r = results[0]
+                if r.retention is not None:
+                    report.expired += r.retention.expired
+                    row.update(expired=r.retention.expired, hot=r.retention.hot)
+                row.update(
+                    queries=r.queries, hits=r.hits, kept=len(r.scored), new=len(r.new_items), seen=r.seen_count,
+                    fetch_s=round(r.fetch_seconds, 6), score_s=round(r.score_seconds, 6),
+                    persist_s=round(r.persist_seconds, 6),
+                )
+                report.seen = r.seen_count
+            latencies.append(tick_s)
+            row["tick_s"] = round(tick_s, 6)
+
+            if tick % sample_every == 0 or tick == total_ticks - 1:
+                row["rss_bytes"] = current_rss_bytes()
+                for part, size in storage_sizes(data_dir).items():
+                    row[f"storage_{part}"] = size
+
+            writer.writerow(row)
+            report.ticks += 1
+            if progress is not None and tick % ticks_per_day == 0:
+                progress(tick, total_ticks)
+
+    window = min(ticks_per_day, len(latencies))
+    if window:
+        report.baseline_day = min(int(2 * mean_lifetime_days), int(days // 2))
+        start = min(report.baseline_day * ticks_per_day, len(latencies) - window)
+        report.baseline_latency = sum(latencies[start:start + window]) / window
+        report.last_day_latency = sum(latencies[-window:]) / window
+    report.ads_created = board.created
+    report.rss_end = current_rss_bytes()
+    report.storage_end = storage_sizes(data_dir)
+    report.seconds = time.perf_counter() - started
+    report.csv_path = csv_path
+    return report
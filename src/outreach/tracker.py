@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import gzip
+import json
+from bisect import bisect_right, insort
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config import AppConfig
+from src.ranking.companies import normalize_company
+from src.storage.atomic import atomic_write_bytes
+
+
+# sent -> (follow_up_due) -> replied | rejected
+EVENT_TYPES = ("sent", "replied", "follow_up_due", "rejected")
+FOLLOW_UP_DAYS = 7
+
+
+@dataclass
+class Event:
+    seq: int
+    ts: str          # ISO timestamp (UTC)
+    type: str        # one of EVENT_TYPES
+    company: str
+    url: str = ""    # listing the event is about, if any
+    note: str = ""
+    due: str = ""    # YYYY-MM-DD, follow_up_due only
+
+
+@dataclass
+class CompanyState:
+    key: str                  # normalize_company(name)
+    name: str
+    status: str = ""          # last of sent/replied/rejected
+    events: int = 0
+    first_contact: str = ""
+    last_event: str = ""
+    follow_up_due: str = ""   # YYYY-MM-DD, cleared by replied/rejected
+    urls: List[str] = field(default_factory=list)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class ApplicationTracker:
+    """
+    Event-sourced record of what happened after outreach.
+
+    On disk (under applications_dir):
+      events.jsonl             append-only log, one Event per line, never rewritten
+      tracker_snapshot.json.gz folded CompanyState for every company, plus the
+                               log offset/seq it covers
+
+    Loading reads the snapshot and replays only the log tail written after it;
+    a new snapshot is taken every `snapshot_every` events. Two in-memory
+    indexes are kept up to date as events are applied: a sorted
+    (follow_up_due, company) list and the company-key map itself, so
+    "follow-ups due" is a bisect and "not contacted" a set lookup per company.
+    """
+
+    def __init__(self, root: Path, snapshot_every: int = 500):
+        self.root = Path(root)
+        self.snapshot_every = snapshot_every
+        self._log_path = self.root / "events.jsonl"
+        self._snapshot_path = self.root / "tracker_snapshot.json.gz"
+
+        self.companies: Dict[str, CompanyState] = {}
+        self._due: List[Tuple[str, str]] = []  # sorted (due, key)
+        self.seq = 0
+        self._offset = 0          # log bytes folded into state so far
+        self._snapshot_seq = 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load_snapshot()
+        self._replay_tail()
+
+    # ---- loading ----
+
+    def _load_snapshot(self) -> None:
+        try:
+            raw = json.loads(gzip.decompress(self._snapshot_path.read_bytes()))
+        except (OSError, EOFError, ValueError):
+            return
+        for c in raw.get("companies", []):
+            state = CompanyState(**c)
+            self.companies[state.key] = state
+            if state.follow_up_due:
+                self._due.append((state.follow_up_due, state.key))
+        self._due.sort()
+        self.seq = self._snapshot_seq = int(raw.get("seq", 0))
+        self._offset = int(raw.get("offset", 0))
+
+    def _replay_tail(self) -> None:
+        if not self._log_path.exists():
+            return
+        if self._log_path.stat().st_size < self._offset:
+            # Log was replaced behind the snapshot's back; rebuild from scratch.
+            self.companies, self._due = {}, []
+            self.seq = self._offset = self._snapshot_seq = 0
+
+        with open(self._log_path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn last write; it is retried/overwritten by the next append
+                self._offset += len(line)
+                try:
+                    event = Event(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+                self._apply(event)
+
+    # ---- state ----
+
+    def _set_due(self, state: CompanyState, due: str) -> None:
+        if state.follow_up_due:
+            item = (state.follow_up_due, state.key)
+            i = bisect_right(self._due, item) - 1
+            if i >= 0 and self._due[i] == item:
+                del self._due[i]
+        state.follow_up_due = due
+        if due:
+            insort(self._due, (due, state.key))
+
+    def _apply(self, event: Event) -> None:
+        key = normalize_company(event.company)
+        state = self.companies.get(key)
+        if state is None:
+            state = self.companies[key] = CompanyState(key=key, name=event.company)
+
+        state.events += 1
+        state.last_event = event.ts
+        if event.url and event.url not in state.urls:
+            state.urls.append(event.url)
+
+        if event.type == "sent":
+            state.status = "sent"
+            state.first_contact = state.first_contact or event.ts
+        elif event.type == "follow_up_due":
+            state.status = state.status or "sent"
+            self._set_due(state, event.due)
+        elif event.type in ("replied", "rejected"):
+            state.status = event.type
+            self._set_due(state, "")
+
+        self.seq = max(self.seq, event.seq)
+
+    # ---- writing ----
+
+    def record(
+        self,
+        type: str,
+        company: str,
+        url: str = "",
+        note: str = "",
+        due: str = "",
+        ts: Optional[str] = None,
+    ) -> Event:
+        if type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type {type!r} (expected one of {', '.join(EVENT_TYPES)})")
+        if not normalize_company(company):
+            raise ValueError("Company name is required.")
+        if type == "follow_up_due":
+            due = date.fromisoformat(due).isoformat()  # validates YYYY-MM-DD
+
+        event = Event(seq=self.seq + 1, ts=ts or _now_iso(), type=type, company=company.strip(),
+                      url=url, note=note, due=due)
+        line = (json.dumps(asdict(event), ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self._log_path, "ab") as f:
+            if f.tell() != self._offset:
+                f.truncate(self._offset)  # drop a torn tail before appending
+            f.write(line)
+        self._offset += len(line)
+        self._apply(event)
+
+        if self.seq - self._snapshot_seq >= self.snapshot_every:
+            self.snapshot()
+        return event
+
+    def sent(
+        self,
+        company: str,
+        url: str = "",
+        note: str = "",
+        follow_up_days: int = FOLLOW_UP_DAYS,
+    ) -> Event:
+        """Record outreach and schedule its follow-up."""
+        event = self.record("sent", company, url=url, note=note)
+        if follow_up_days > 0:
+            due = (datetime.fromisoformat(event.ts).date() + timedelta(days=follow_up_days)).isoformat()
+            self.record("follow_up_due", company, url=url, due=due, ts=event.ts)
+        return event
+
+    def snapshot(self) -> None:
+        payload = {
+            "seq": self.seq,
+            "offset": self._offset,
+            "companies": [asdict(c) for c in self.companies.values()],
+        }
+        atomic_write_bytes(self._snapshot_path, gzip.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"), 6))
+        self._snapshot_seq = self.seq
+
+    @property
+    def tail(self) -> int:
+        """Events the next load would have to replay."""
+        return self.seq - self._snapshot_seq
+
+    # ---- queries ----
+
+    def get(self, company: str) -> Optional[CompanyState]:
+        return self.companies.get(normalize_company(company))
+
+    def follow_ups_due(self, until: Optional[date] = None) -> List[CompanyState]:
+        """Open follow-ups due on or before `until` (default today), oldest first."""
+        limit = (until or date.today()).isoformat()
+        end = bisect_right(self._due, (limit, "\uffff"))
+        return [self.companies[key] for _, key in self._due[:end]]
+
+    def not_contacted(self, names: Iterable[str]) -> List[str]:
+        """Names (e.g. from companies.yaml) with no sent event yet."""
+        out = []
+        for name in names:
+            state = self.companies.get(normalize_company(name))
+            if state is None or not state.first_contact:
+                out.append(name)
+        return out
+
+    def history(self, company: str) -> List[Event]:
+        """Every event for one company, oldest first (full log scan)."""
+        key = normalize_company(company)
+        out: List[Event] = []
+        if not self._log_path.exists():
+            return out
+        with open(self._log_path, "rb") as f:
+            for line in f:
+                try:
+                    event = Event(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+                if normalize_company(event.company) == key:
+                    out.append(event)
+        return out
+
+    def close(self) -> None:
+        if self.tail >= self.snapshot_every:
+            self.snapshot()
+
+    def __enter__(self) -> "ApplicationTracker":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_tracker(cfg: AppConfig) -> ApplicationTracker:
+    return ApplicationTracker(Path(cfg.output.applications_dir))
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.outreach.generate import Company, load_companies
+
+
+# Tokens that say nothing about *which* employer it is.
+_NOISE_TOKENS = {
+    "ab", "publ", "aktiebolag", "hb", "kb", "ek", "for",
+    "sverige", "sweden", "svenska", "scandinavia", "nordic", "nordics",
+    "group", "koncern", "holding", "as", "asa", "oy", "aps", "ltd", "inc", "gmbh", "bv",
+}
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_company(name: str) -> str:
+    """
+    "Exempel Konsult i Sverige AB (publ)" -> "exempel konsult"
+    Case, diacritics (å/ä/ö -> a/a/o), punctuation and legal/country
+    suffixes are stripped so the same employer compares equal.
+    """
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = text.replace("&", " och ")
+    tokens = [t for t in _NON_WORD.split(text) if t]
+
+    # Drop trailing noise ("... i Sverige AB"), then any leftover noise tokens.
+    while tokens and (tokens[-1] in _NOISE_TOKENS or tokens[-1] == "i"):
+        tokens.pop()
+    kept = [t for t in tokens if t not in _NOISE_TOKENS]
+    return " ".join(kept or tokens)
+
+
+def _trigrams(norm: str) -> set[str]:
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class CompanyMatch:
+    company: Company
+    similarity: float
+
+
+class CompanyMatcher:
+    """
+    Fuzzy employer-name join against companies.yaml.
+
+    An inverted index trigram -> company ids means each lookup only scores
+    the few companies sharing trigrams with the name (Dice coefficient),
+    instead of comparing every listing with every company.
+    """
+
+    def __init__(self, companies: List[Company], threshold: float = 0.6):
+        self.threshold = threshold
+        self._companies: List[Company] = []
+        self._grams: List[set[str]] = []
+        self._exact: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+        for c in companies:
+            norm = normalize_company(c.name)
+            if not norm:
+                continue
+            idx = len(self._companies)
+            grams = _trigrams(norm)
+            self._companies.append(c)
+            self._grams.append(grams)
+            self._exact.setdefault(norm, idx)
+            for g in grams:
+                self._postings[g].append(idx)
+
+    def __len__(self) -> int:
+        return len(self._companies)
+
+    def match(self, name: str) -> Optional[CompanyMatch]:
+        norm = normalize_company(name)
+        if not norm:
+            return None
+
+        idx = self._exact.get(norm)
+        if idx is not None:
+            return CompanyMatch(self._companies[idx], 1.0)
+
+        grams = _trigrams(norm)
+        shared: Dict[int, int] = defaultdict(int)
+        for g in grams:
+            for i in self._postings.get(g, ()):
+                shared[i] += 1
+        if not shared:
+            return None
+
+        best_idx, best_sim = -1, 0.0
+        for i, n in shared.items():
+            sim = 2.0 * n / (len(grams) + len(self._grams[i]))
+            if sim > best_sim:
+                best_idx, best_sim = i, sim
+
+        if best_sim < self.threshold:
+            return None
+        return CompanyMatch(self._companies[best_idx], best_sim)
+
+
+def load_company_matcher(path: str = "companies.yaml") -> Optional[CompanyMatcher]:
+    """Matcher over companies.yaml, or None if there is no target list."""
+    if not Path(path).exists():
+        return None
+    matcher = CompanyMatcher(load_companies(path))
+    return matcher if len(matcher) else None
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+_DATA = Path(__file__).parent / "data"
+MUNICIPALITIES_CSV = _DATA / "municipalities.csv"
+# uint16 km between every pair of rows in the CSV, same order.
+# Rebuild with: python -m src.ranking.geo
+DISTANCE_MATRIX = _DATA / "municipality_km.npy"
+
+_EARTH_RADIUS_KM = 6371.0
+
+
+@dataclass(frozen=True)
+class Municipality:
+    code: str      # SCB kommunkod, e.g. "0184"
+    name: str
+    county: str
+    lat: float
+    lon: float
+
+
+def read_municipalities(path: Path = MUNICIPALITIES_CSV) -> List[Municipality]:
+    with open(path, encoding="utf-8", newline="") as f:
+        return [
+            Municipality(
+                code=row["code"].strip(),
+                name=row["name"].strip(),
+                county=row["county"].strip(),
+                lat=float(row["lat"]),
+                lon=float(row["lon"]),
+            )
+            for row in csv.DictReader(f)
+        ]
+
+
+def _read_aliases(path: Path = MUNICIPALITIES_CSV) -> Dict[str, List[str]]:
+    with open(path, encoding="utf-8", newline="") as f:
+        return {
+            row["code"].strip(): [a.strip() for a in (row.get("aliases") or "").split("|") if a.strip()]
+            for row in csv.DictReader(f)
+        }
+
+
+def build_distance_matrix(municipalities: Sequence[Municipality]) -> np.ndarray:
+    """Great-circle km between every pair of centroids, rounded to uint16."""
+    lat = np.radians(np.array([m.lat for m in municipalities], dtype=np.float64))
+    lon = np.radians(np.array([m.lon for m in municipalities], dtype=np.float64))
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:, None]) * np.cos(lat[None, :]) * np.sin(dlon / 2) ** 2
+    km = 2 * _EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    return np.rint(km).astype(np.uint16)
+
+
+class MunicipalityTable:
+    """
+    Bundled municipality centroids plus the precomputed distance matrix.
+    Name -> row is a dict lookup and row x row a single array read.
+    """
+
+    def __init__(self, municipalities: List[Municipality], km: np.ndarray, aliases: Dict[str, List[str]]):
+        self.municipalities = municipalities
+        self.km = km
+        self._by_name: Dict[str, int] = {}
+        self._by_county: Dict[str, List[int]] = {}
+
+        for i, m in enumerate(municipalities):
+            name = m.name.lower()
+            for key in (name, f"{name} kommun", f"{name}s kommun", m.code, *[a.lower() for a in aliases.get(m.code, [])]):
+                self._by_name.setdefault(key, i)
+            self._by_county.setdefault(m.county.lower(), []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.municipalities)
+
+    def lookup(self, text: str) -> Optional[int]:
+        """Row for a free-text location ("Solna", "Solna kommun", "Kista, Stockholm"), or None."""
+        if not text:
+            return None
+        t = text.strip().lower()
+        idx = self._by_name.get(t)
+        if idx is not None:
+            return idx
+        for part in t.replace("/", ",").split(","):
+            idx = self._by_name.get(part.strip())
+            if idx is not None:
+                return idx
+        return None
+
+    def lookup_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Rows for a batch of locations, -1 where unknown."""
+        return np.fromiter(
+            ((-1 if (i := self.lookup(t)) is None else i) for t in texts),
+            dtype=np.int32,
+            count=len(texts),
+        )
+
+    def homes(self, locations: Sequence[str]) -> List[int]:
+        """Rows for search.locations; a county name ("Stockholms län") means all of it."""
+        rows: List[int] = []
+        for loc in locations:
+            key = loc.strip().lower()
+            if key in self._by_county:
+                rows.extend(self._by_county[key])
+                continue
+            idx = self.lookup(loc)
+            if idx is not None:
+                rows.append(idx)
+        return sorted(set(rows))
+
+
+@lru_cache(maxsize=1)
+def load_municipalities() -> MunicipalityTable:
+    municipalities = read_municipalities()
+    km = None
+    if DISTANCE_MATRIX.exists():
+        km = np.load(DISTANCE_MATRIX)
+        if km.shape != (len(municipalities), len(municipalities)):
+            km = None  # CSV changed since the matrix was built
+    if km is None:
+        km = build_distance_matrix(municipalities)
+    return MunicipalityTable(municipalities, km, _read_aliases())
+
+
+# =============================
+# Location score
+# =============================
+
+@dataclass
+class LocationScorer:
+    """
+    Distance-decay score for one set of home municipalities:
+    boost * 0.5 ** (km to the nearest home / half_life_km),
+    computed once per municipality, so each listing is an index lookup.
+    """
+    table: MunicipalityTable
+    home_km: np.ndarray   # float32, km from each municipality to the nearest home
+    boost: np.ndarray     # float32, score for a listing in each municipality
+
+    def score_many(self, locations: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """(score, km) per location; NaN where the location is unknown."""
+        idx = self.table.lookup_many(locations)
+        known = idx >= 0
+        safe = np.where(known, idx, 0)
+        score = np.where(known, self.boost[safe], np.nan).astype(np.float32)
+        km = np.where(known, self.home_km[safe], np.nan).astype(np.float32)
+        return score, km
+
+
+def location_scorer(
+    locations: Sequence[str],
+    max_boost: float,
+    half_life_km: float,
+) -> Optional[LocationScorer]:
+    """None if none of search.locations is a bundled municipality or county."""
+    table = load_municipalities()
+    homes = table.homes(locations)
+    if not homes:
+        return None
+    home_km = table.km[homes].min(axis=0).astype(np.float32)
+    boost = (max_boost * np.power(0.5, home_km / max(half_life_km, 1e-6))).astype(np.float32)
+    return LocationScorer(table=table, home_km=home_km, boost=boost)
+
+
+if __name__ == "__main__":
+    rows = read_municipalities()
+    matrix = build_distance_matrix(rows)
+    np.save(DISTANCE_MATRIX, matrix)
+    print(f"Wrote {DISTANCE_MATRIX} ({len(rows)} municipalities, {matrix.nbytes} bytes)")
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.config import AppConfig
+from src.discovery.fetch import hit_to_listing
+from src.discovery.gates import GATE_REASONS, build_gates, gate_listing
+from src.discovery.web_sources import Source
+from src.models import Listing, ScoredListing
+from src.ranking.companies import CompanyMatcher
+from src.ranking.score import score_listings
+from src.storage.archive import iter_partition, raw_archive
+
+
+# url -> (archived at, listing, drop reason before, drop reason now)
+_Replay = Dict[str, Tuple[str, Listing, Optional[str], Optional[str]]]
+
+
+@dataclass
+class RescoreReport:
+    partitions: int = 0
+    records: int = 0
+    # headline-only records from the two-phase fetch, skipped
+    partial: int = 0
+    ads: int = 0
+    kept_before: int = 0
+    kept_now: int = 0
+    added: List[ScoredListing] = field(default_factory=list)
+    removed: List[Tuple[Listing, str]] = field(default_factory=list)
+    dropped_now: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+def _replay_partition(args: Tuple[AppConfig, Optional[AppConfig], Path]) -> Tuple[int, int, _Replay]:
+    """
+    Worker: run one archive partition through the gates.
+    "Before" is the baseline config if given, otherwise the outcome recorded at fetch time.
+    Headline-only ("partial") records are counted and skipped: without the
+    description the gates can't judge them.
+    """
+    cfg, baseline, path = args
+    gates = build_gates(cfg)
+    base_gates = build_gates(baseline) if baseline is not None else None
+
+    records = 0
+    partial = 0
+    out: _Replay = {}
+    for rec in iter_partition(path):
+        records += 1
+        if rec.get("partial"):
+            partial += 1
+            continue
+        src = Source(
+            name=rec.get("source") or "",
+            kind="jobtech_jobsearch",
+            base_url=rec.get("base_url") or "",
+        )
+        listing = hit_to_listing(src, rec.get("hit") or {})
+        if not (listing.title and listing.url):
+            continue
+
+        desc = listing.description or ""
+        now = gate_listing(gates, listing.title, desc)
+        if base_gates is not None:
+            before = gate_listing(base_gates, listing.title, desc)
+        else:
+            before = rec.get("drop")
+
+        # Records are appended in time order, so the latest one wins.
+        out[listing.url] = (rec.get("at") or "", listing, before, now)
+    return records, partial, out
+
+
+def rescore_archive(
+    cfg: AppConfig,
+    baseline: Optional[AppConfig] = None,
+    days: Optional[int] = None,
+    workers: Optional[int] = None,
+    matcher: Optional[CompanyMatcher] = None,
+) -> RescoreReport:
+    """
+    Replay archived raw hits through the gates and score_listings, fully offline,
+    and report what the current config adds or removes compared to the baseline.
+    Partitions are replayed in parallel processes.
+
+    matcher: companies.yaml matcher, so target-company boosts score as in the monitor.
+    """
+    started = time.perf_counter()
+    partitions = raw_archive(cfg).partitions(days=days)
+    report = RescoreReport(partitions=len(partitions))
+    if not partitions:
+        return report
+
+    jobs = [(cfg, baseline, p) for p in partitions]
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+
+    if workers <= 1 or len(jobs) == 1:
+        results = [_replay_partition(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_replay_partition, jobs))
+
+    merged: _Replay = {}
+    for records, partial, part in results:  # partitions are in date order
+        report.records += records
+        report.partial += partial
+        merged.update(part)
+
+    report.ads = len(merged)
+    report.dropped_now = {reason: 0 for reason in GATE_REASONS}
+
+    kept_now: List[Listing] = []
+    added_urls = set()
+    for url, (_, listing, before, now) in merged.items():
+        if before is None:
+            report.kept_before += 1
+        if now is None:
+            kept_now.append(listing)
+            if before is not None:
+                added_urls.add(url)
+        else:
+            report.dropped_now[now] = report.dropped_now.get(now, 0) + 1
+            if before is None:
+                report.removed.append((listing, now))
+
+    report.kept_now = len(kept_now)
+    scored = score_listings(cfg, kept_now, matcher=matcher)
+    report.added = [x for x in scored if x.url in added_urls]
+    report.seconds = time.perf_counter() - started
+    return report
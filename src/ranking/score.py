@@ -1,22 +1,53 @@
 from __future__ import annotations
 
-from typing import List
+import math
+from typing import List, Optional
 
 from src.config import AppConfig
 from src.models import Listing, ScoredListing
+from src.ranking.companies import CompanyMatcher
+from src.ranking.geo import location_scorer
+from src.storage.blobs import BlobStore
 
 
-def score_listings(cfg: AppConfig, listings: List[Listing]) -> List[ScoredListing]:
+# Ads from employers already in companies.yaml float to the top.
+TARGET_COMPANY_BOOST = 15.0
+
+# Location score for ads in a bundled municipality: full boost in a home
+# municipality, halving every LOCATION_HALF_LIFE_KM (Solna/Sundbyberg from
+# Stockholm ~4, Uppsala ~0.3). Unknown places keep the old +3 text match.
+LOCATION_BOOST = 5.0
+LOCATION_HALF_LIFE_KM = 15.0
+LOCATION_TEXT_MATCH = 3.0
+
+
+def score_listings(
+    cfg: AppConfig,
+    listings: List[Listing],
+    blobs: Optional[BlobStore] = None,
+    matcher: Optional[CompanyMatcher] = None,
+) -> List[ScoredListing]:
     scored: List[ScoredListing] = []
 
-    for l in listings:
+    java_terms = [(kw, kw.lower()) for kw in cfg.search.java_terms]
+    locations_l = [loc.lower() for loc in cfg.search.locations]
+
+    # One vectorized lookup for the whole batch: (score, km) per listing, NaN if unknown.
+    scorer = location_scorer(cfg.search.locations, LOCATION_BOOST, LOCATION_HALF_LIFE_KM)
+    if scorer is not None:
+        loc_scores, loc_km = scorer.score_many([l.location or "" for l in listings])
+    else:
+        loc_scores = loc_km = None
+
+    for i, l in enumerate(listings):
         score = 0.0
         reasons: list[str] = []
 
-        text = f"{l.title} {l.location} {l.description or ''}".lower()
+        description = blobs.text_for(l) if blobs is not None else (l.description or "")
+        text = f"{l.title} {l.location} {description}".lower()
 
-        for kw in cfg.search.java_terms:
-            if kw.lower() in text:
+        for kw, kw_l in java_terms:
+            if kw_l in text:
                 score += 10
                 reasons.append(f"Matched keyword: {kw}")
 
@@ -24,10 +55,23 @@ def score_listings(cfg: AppConfig, listings: List[Listing]) -> List[ScoredListin
             score += 5
             reasons.append("Remote mention")
 
-        if any(loc.lower() in text for loc in cfg.search.locations):
-            score += 3
+        loc_score = float(loc_scores[i]) if loc_scores is not None else math.nan
+        if not math.isnan(loc_score):
+            if loc_score >= 0.1:
+                score += round(loc_score, 1)
+                reasons.append(f"Location: {l.location.strip()} (~{loc_km[i]:.0f} km)")
+        elif any(loc in text for loc in locations_l):
+            score += LOCATION_TEXT_MATCH
             reasons.append("Location match")
 
+        target = None
+        if matcher is not None and l.company:
+            m = matcher.match(l.company)
+            if m is not None:
+                target = m.company.name
+                score += TARGET_COMPANY_BOOST
+                reasons.append(f"Target company: {target}")
+
         scored.append(
             ScoredListing(
                 title=l.title,
@@ -36,8 +80,12 @@ def score_listings(cfg: AppConfig, listings: List[Listing]) -> List[ScoredListin
                 url=l.url,
                 description=l.description,
                 source=l.source,
+                description_hash=l.description_hash,
+                published=l.published,
+                deadline=l.deadline,
                 score=score,
                 reasons=reasons,
+                target_company=target,
             )
         )
 
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from src.config import AppConfig
+from src.discovery.web_sources import Source
+
+
+class RawArchive:
+    """
+    Append-only archive of every raw JobSearch hit, kept or dropped.
+
+    One gzip file per UTC day (<root>/YYYY-MM-DD.jsonl.gz). Each append adds
+    a new gzip member, which gzip readers treat as one continuous stream, so
+    nothing is ever rewritten. Records look like:
+
+        {"at": iso, "source": name, "base_url": url, "query": q,
+         "drop": reason-or-null, "hit": {...}}
+
+    plus "partial": true when the hit is a headline-only search result (the
+    two-phase fetch never downloaded the full ad), which rescore can't replay.
+    """
+
+    def __init__(self, root: Path, clock: Optional[Callable[[], datetime]] = None):
+        self.root = Path(root)
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+
+    def _partition(self, day: str) -> Path:
+        return self.root / f"{day}.jsonl.gz"
+
+    def append(
+        self,
+        source: Source,
+        query: str,
+        hits: List[Dict[str, Any]],
+        outcomes: List[Optional[str]],
+        partial: Optional[Sequence[bool]] = None,
+    ) -> Path:
+        now = self.clock()
+        at = now.isoformat(timespec="seconds")
+        path = self._partition(now.strftime("%Y-%m-%d"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        lines = []
+        for i, (h, drop) in enumerate(zip(hits, outcomes)):
+            rec = {
+                "at": at,
+                "source": source.name,
+                "base_url": source.base_url,
+                "query": query,
+                "drop": drop,
+                "hit": h,
+            }
+            if partial is not None and partial[i]:
+                rec["partial"] = True
+            lines.append(json.dumps(rec, ensure_ascii=False))
+
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def partitions(self, days: Optional[int] = None) -> List[Path]:
+        """Partition files, oldest first; `days` keeps only the most recent N days."""
+        if not self.root.exists():
+            return []
+        paths = sorted(self.root.glob("*.jsonl.gz"))
+        if days:
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%d")
+            paths = [p for p in paths if p.name[:10] >= cutoff]
+        return paths
+
+
+def iter_partition(path: Path) -> Iterator[Dict[str, Any]]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    except (EOFError, gzip.BadGzipFile):
+        # A crash mid-append can leave a torn last member; everything before it is fine.
+        return
+
+
+def raw_archive(cfg: AppConfig, clock: Optional[Callable[[], datetime]] = None) -> RawArchive:
+    return RawArchive(Path(cfg.output.data_dir) / "archive" / "raw", clock)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional
+
+
+def _tmp_path(path: Path) -> Path:
+    # Same directory (os.replace can't cross filesystems); pid + thread so
+    # concurrent writers of the same file never share a temp file.
+    return path.with_name(f"{path.name}.tmp{os.getpid()}.{threading.get_ident()}")
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "wb", mtime: Optional[float] = None, **kwargs: Any) -> Iterator[IO]:
+    """
+    Open a temp file next to `path` and move it over `path` when the block
+    exits cleanly, so readers only ever see the old or the new file. On an
+    exception the temp file is removed and `path` is left as it was.
+
+    mtime: Unix time to stamp on the file (e.g. from a simulated clock).
+    kwargs go to open() (encoding, newline, ...).
+    """
+    path = Path(path)
+    tmp = _tmp_path(path)
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+        if mtime is not None:
+            os.utime(tmp, (mtime, mtime))
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes, mtime: Optional[float] = None) -> None:
+    with atomic_open(path, "wb", mtime=mtime) as f:
+        f.write(data)
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    with atomic_open(path, "w", encoding=encoding) as f:
+        f.write(text)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional, Set
+
+from src.config import AppConfig
+from src.models import Listing
+from src.storage.atomic import atomic_write_bytes
+
+
+class BlobStore:
+    """
+    Content-addressed, zlib-compressed text store.
+
+    Keys are blake2b hashes of the UTF-8 text, files live under
+    <root>/<key[:2]>/<key>.z and are written once. A small LRU keeps the
+    texts touched this run in memory so put -> score -> index doesn't
+    re-read disk. A new file's mtime is `clock()`, which sweep's age check
+    compares against.
+    """
+
+    def __init__(self, root: Path, cache_size: int = 512, clock: Optional[Callable[[], datetime]] = None):
+        self.root = Path(root)
+        self.cache_size = cache_size
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.z"
+
+    def _remember(self, key: str, text: str) -> None:
+        self._cache[key] = text
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def put(self, text: str) -> str:
+        key = self.key_for(text)
+        path = self._path(key)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(path, zlib.compress(text.encode("utf-8"), 6), mtime=self.clock().timestamp())
+        self._remember(key, text)
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        path = self._path(key)
+        if not path.exists():
+            return None
+        text = zlib.decompress(path.read_bytes()).decode("utf-8")
+        self._remember(key, text)
+        return text
+
+    def sweep(self, live: Set[str], older_than: float) -> int:
+        """
+        Delete blobs whose key is not in `live` and whose file is older than
+        `older_than` (Unix time), so a concurrent writer's fresh blob survives.
+        Returns the number removed.
+        """
+        removed = 0
+        if not self.root.exists():
+            return 0
+        for path in self.root.glob("*/*.z"):
+            key = path.stem
+            if key in live:
+                continue
+            try:
+                if path.stat().st_mtime >= older_than:
+                    continue
+                path.unlink()
+            except OSError:
+                continue
+            self._cache.pop(key, None)
+            removed += 1
+        return removed
+
+    def text_for(self, listing: Listing) -> str:
+        """Full description if stored, otherwise whatever is inline."""
+        if listing.description_hash:
+            text = self.get(listing.description_hash)
+            if text is not None:
+                return text
+        return listing.description or ""
+
+
+def blob_store(cfg: AppConfig, clock: Optional[Callable[[], datetime]] = None) -> BlobStore:
+    return BlobStore(Path(cfg.output.data_dir) / "blobs", clock=clock)
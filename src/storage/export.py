@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import csv
+import heapq
+import importlib.util
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.config import AppConfig
+from src.storage.atomic import atomic_open
+from src.storage.index import connect_index, index_path
+from src.storage.retention import iter_cold
+
+
+# Column order for both formats. description is opt-in (it is most of the bytes).
+EXPORT_COLUMNS = (
+    "url", "title", "company", "location", "source", "score",
+    "first_seen", "last_seen", "published", "deadline",
+)
+# ISO text in listings.db, timestamp[s, UTC] in Parquet ('' becomes null).
+TIMESTAMP_COLUMNS = ("first_seen", "last_seen", "published", "deadline")
+# Low-cardinality text columns, dictionary-encoded in Parquet.
+DICTIONARY_COLUMNS = ("company", "location", "source")
+
+ROW_GROUP_SIZE = 50_000
+
+
+@dataclass
+class ExportReport:
+    format: str
+    rows: int = 0
+    files: List[Path] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def export_dir(cfg: AppConfig) -> Path:
+    return Path(cfg.output.data_dir) / "export"
+
+
+def iter_listing_batches(
+    cfg: AppConfig,
+    days: Optional[int] = None,
+    descriptions: bool = False,
+    batch_size: int = ROW_GROUP_SIZE,
+    include_cold: bool = False,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream listings.db in first_seen order, `batch_size` rows at a time,
+    so an export never holds more than one row group in memory.
+    include_cold: merge in expired listings from data/cold/ (same order).
+    """
+    since = ""
+    if days:
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat(timespec="seconds")
+
+    columns = list(EXPORT_COLUMNS) + (["description"] if descriptions else [])
+    streams = [_iter_hot(cfg, columns, since, batch_size)]
+    if include_cold:
+        streams.append({c: r.get(c, "") for c in columns} for r in iter_cold(cfg, since))
+
+    rows = heapq.merge(*streams, key=lambda r: r["first_seen"])
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        yield batch
+
+
+def _iter_hot(cfg: AppConfig, columns: List[str], since: str, batch_size: int) -> Iterator[Dict[str, Any]]:
+    if not index_path(cfg).exists():
+        return
+    with closing(connect_index(cfg)) as conn:
+        cur = conn.execute(
+            f"SELECT {', '.join(columns)} FROM listings WHERE first_seen >= ? ORDER BY first_seen, id",
+            (since,),
+        )
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from (dict(r) for r in rows)
+
+
+# =============================
+# CSV (always available)
+# =============================
+
+def export_csv(
+    cfg: AppConfig,
+    out: Optional[Path] = None,
+    days: Optional[int] = None,
+    descriptions: bool = False,
+    include_cold: bool = False,
+) -> ExportReport:
+    started = time.perf_counter()
+    report = ExportReport(format="csv")
+    if not index_path(cfg).exists() and not include_cold:
+        return report
+
+    batches = iter_listing_batches(cfg, days=days, descriptions=descriptions, include_cold=include_cold)
+    first = next(batches, None)
+    if first is None:
+        return report  # nothing in the window: keep the previous export as it is
+
+    path = Path(out or export_dir(cfg)) / "listings.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fields = list(EXPORT_COLUMNS) + (["description"] if descriptions else [])
+    # utf-8-sig so Excel opens å/ä/ö correctly
+    with atomic_open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for batch in chain([first], batches):
+            writer.writerows(batch)
+            report.rows += len(batch)
+
+    report.files.append(path)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+# =============================
+# Parquet (needs pyarrow)
+# =============================
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _parse_ts(value: str) -> Optional[datetime]:
+    try:
+        ts = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def export_parquet(
+    cfg: AppConfig,
+    out: Optional[Path] = None,
+    days: Optional[int] = None,
+    descriptions: bool = False,
+    row_group_size: int = ROW_GROUP_SIZE,
+    include_cold: bool = False,
+) -> ExportReport:
+    """
+    Write <out>/listings/month=YYYY-MM/part-0.parquet (Hive-style partitions,
+    readable as one dataset by pandas, polars and DuckDB).
+
+    Rows arrive sorted by first_seen, so months come one after another and
+    only one writer is open at a time; each fetched batch becomes one row
+    group, so memory stays bounded by `row_group_size`.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    started = time.perf_counter()
+    root = Path(out or export_dir(cfg)) / "listings"
+    report = ExportReport(format="parquet")
+
+    batches = iter_listing_batches(
+        cfg, days=days, descriptions=descriptions, batch_size=row_group_size, include_cold=include_cold
+    )
+    first = next(batches, None)
+    if first is None:
+        return report  # nothing in the window: keep the previous export as it is
+
+    # Replace the previous export's partitions, not anything else in the folder.
+    for old in root.glob("month=*/*.parquet"):
+        old.unlink()
+
+    schema_fields = [
+        pa.field("url", pa.string()),
+        pa.field("title", pa.string()),
+        pa.field("company", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("location", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("source", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("score", pa.float64()),
+        pa.field("first_seen", pa.timestamp("s", tz="UTC")),
+        pa.field("last_seen", pa.timestamp("s", tz="UTC")),
+        pa.field("published", pa.timestamp("s", tz="UTC")),
+        pa.field("deadline", pa.timestamp("s", tz="UTC")),
+    ]
+    if descriptions:
+        schema_fields.append(pa.field("description", pa.string()))
+    schema = pa.schema(schema_fields)
+
+    writer = None
+    month = None
+
+    def to_table(rows: List[Dict[str, Any]]):
+        arrays = []
+        for f in schema:
+            values = [r[f.name] for r in rows]
+            if f.name in TIMESTAMP_COLUMNS:
+                arrays.append(pa.array([_parse_ts(v) for v in values], type=f.type))
+            elif f.name in DICTIONARY_COLUMNS:
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=f.type))
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    try:
+        for batch in chain([first], batches):
+            # Split the batch on month boundaries (it is sorted by first_seen).
+            start = 0
+            while start < len(batch):
+                m = batch[start]["first_seen"][:7]
+                end = start
+                while end < len(batch) and batch[end]["first_seen"][:7] == m:
+                    end += 1
+
+                if m != month:
+                    if writer is not None:
+                        writer.close()
+                    path = root / f"month={m}" / "part-0.parquet"
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    writer = pq.ParquetWriter(
+                        path,
+                        schema,
+                        compression="zstd",
+                        use_dictionary=list(DICTIONARY_COLUMNS),
+                    )
+                    report.files.append(path)
+                    month = m
+
+                writer.write_table(to_table(batch[start:end]), row_group_size=row_group_size)
+                report.rows += end - start
+                start = end
+    finally:
+        if writer is not None:
+            writer.close()
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def export_listings(
+    cfg: AppConfig,
+    format: str = "parquet",
+    out: Optional[Path] = None,
+    days: Optional[int] = None,
+    descriptions: bool = False,
+    row_group_size: int = ROW_GROUP_SIZE,
+    include_cold: bool = False,
+) -> ExportReport:
+    """
+    Parquet when asked for and pyarrow is installed, CSV otherwise.
+    include_cold: also export listings retention has moved to data/cold/.
+    """
+    if format == "parquet" and parquet_available():
+        return export_parquet(
+            cfg, out, days=days, descriptions=descriptions, row_group_size=row_group_size, include_cold=include_cold
+        )
+    return export_csv(cfg, out, days=days, descriptions=descriptions, include_cold=include_cold)
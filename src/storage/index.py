@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from src.config import AppConfig
+from src.models import ScoredListing
+from src.storage.blobs import BlobStore
+
+
+# =============================
+# Schema
+# =============================
+
+# `listings` holds one row per URL (first_seen is never overwritten),
+# `listings_fts` is an external-content FTS5 table kept in sync by triggers,
+# `meta` is small key/value state (e.g. when retention last ran).
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    id          INTEGER PRIMARY KEY,
+    url         TEXT NOT NULL UNIQUE,
+    title       TEXT NOT NULL DEFAULT '',
+    company     TEXT NOT NULL DEFAULT '',
+    location    TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    source      TEXT NOT NULL DEFAULT '',
+    score       REAL NOT NULL DEFAULT 0,
+    first_seen  TEXT NOT NULL,
+    last_seen   TEXT NOT NULL,
+    published   TEXT NOT NULL DEFAULT '',
+    deadline    TEXT NOT NULL DEFAULT ''
+);
+
+CREATE INDEX IF NOT EXISTS idx_listings_first_seen ON listings(first_seen);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS listings_fts USING fts5(
+    title, company, location, description, source,
+    content='listings',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS listings_ai AFTER INSERT ON listings BEGIN
+    INSERT INTO listings_fts(rowid, title, company, location, description, source)
+    VALUES (new.id, new.title, new.company, new.location, new.description, new.source);
+END;
+
+CREATE TRIGGER IF NOT EXISTS listings_ad AFTER DELETE ON listings BEGIN
+    INSERT INTO listings_fts(listings_fts, rowid, title, company, location, description, source)
+    VALUES ('delete', old.id, old.title, old.company, old.location, old.description, old.source);
+END;
+
+CREATE TRIGGER IF NOT EXISTS listings_au AFTER UPDATE ON listings BEGIN
+    INSERT INTO listings_fts(listings_fts, rowid, title, company, location, description, source)
+    VALUES ('delete', old.id, old.title, old.company, old.location, old.description, old.source);
+    INSERT INTO listings_fts(rowid, title, company, location, description, source)
+    VALUES (new.id, new.title, new.company, new.location, new.description, new.source);
+END;
+"""
+
+# bm25 column weights: title, company, location, description, source
+_BM25_WEIGHTS = "10.0, 5.0, 2.0, 1.0, 0.5"
+
+
+@dataclass
+class SearchHit:
+    url: str
+    title: str
+    company: str
+    location: str
+    source: str
+    score: float
+    first_seen: str
+    last_seen: str
+    rank: float
+    closed: bool = False       # from the cold archive (see retention.search_cold)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def index_path(cfg: AppConfig) -> Path:
+    return Path(cfg.output.data_dir) / "listings.db"
+
+
+def connect_index(cfg: AppConfig) -> sqlite3.Connection:
+    path = index_path(cfg)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    _migrate(conn)
+    return conn
+
+
+# Columns added after the first release: name -> definition.
+_ADDED_COLUMNS = {
+    "published": "TEXT NOT NULL DEFAULT ''",
+    "deadline": "TEXT NOT NULL DEFAULT ''",
+}
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    have = {r["name"] for r in conn.execute("PRAGMA table_info(listings)")}
+    for name, definition in _ADDED_COLUMNS.items():
+        if name not in have:
+            conn.execute(f"ALTER TABLE listings ADD COLUMN {name} {definition}")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_listings_deadline ON listings(deadline)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_listings_last_seen ON listings(last_seen)")
+
+
+def get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else None
+
+
+def set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+# =============================
+# Writing
+# =============================
+
+def index_listings(
+    cfg: AppConfig,
+    listings: List[ScoredListing],
+    seen_at: Optional[str] = None,
+    blobs: Optional[BlobStore] = None,
+) -> int:
+    """
+    Upsert kept listings into the history index.
+    first_seen is set once per URL; everything else follows the latest run,
+    except that a known published/deadline is not blanked by a hit without one.
+    With a blob store the full description is indexed, not just the snippet.
+    """
+    ts = seen_at or _now_iso()
+    rows = [
+        (
+            x.url,
+            x.title or "",
+            x.company or "",
+            x.location or "",
+            (blobs.text_for(x) if blobs is not None else x.description) or "",
+            x.source or "",
+            float(x.score or 0.0),
+            ts,
+            ts,
+            x.published or "",
+            x.deadline or "",
+        )
+        for x in listings
+        if x.url
+    ]
+    if not rows:
+        return 0
+
+    with closing(connect_index(cfg)) as conn, conn:
+        conn.executemany(
+            """
+            INSERT INTO listings (url, title, company, location, description, source, score,
+                                  first_seen, last_seen, published, deadline)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                title = excluded.title,
+                company = excluded.company,
+                location = excluded.location,
+                description = excluded.description,
+                source = excluded.source,
+                score = excluded.score,
+                last_seen = excluded.last_seen,
+                published = CASE WHEN excluded.published != '' THEN excluded.published ELSE listings.published END,
+                deadline = CASE WHEN excluded.deadline != '' THEN excluded.deadline ELSE listings.deadline END
+            """,
+            rows,
+        )
+    return len(rows)
+
+
+# =============================
+# Searching
+# =============================
+
+def _to_match_expr(query: str) -> str:
+    """
+    Turn free text into an FTS5 expression: every word must match (implicit AND).
+    Words are quoted so things like "spring-boot" or "c#" never raise syntax errors;
+    a trailing * is kept as a prefix search.
+    """
+    parts = []
+    for token in query.split():
+        prefix = token.endswith("*")
+        token = token.rstrip("*").replace('"', '""')
+        if not token:
+            continue
+        parts.append(f'"{token}"' + ("*" if prefix else ""))
+    return " ".join(parts)
+
+
+def search_index(
+    cfg: AppConfig,
+    query: str,
+    days: Optional[int] = None,
+    limit: int = 25,
+) -> List[SearchHit]:
+    """
+    Ranked full-text search over the history index (best match first).
+    `days` restricts results to listings first seen within that many days.
+    """
+    expr = _to_match_expr(query)
+    if not expr or not index_path(cfg).exists():
+        return []
+
+    since = ""
+    if days:
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat(timespec="seconds")
+
+    with closing(connect_index(cfg)) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT l.url, l.title, l.company, l.location, l.source, l.score,
+                   l.first_seen, l.last_seen,
+                   bm25(listings_fts, {_BM25_WEIGHTS}) AS rank
+            FROM listings_fts
+            JOIN listings l ON l.id = listings_fts.rowid
+            WHERE listings_fts MATCH ? AND l.first_seen >= ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (expr, since, int(limit)),
+        ).fetchall()
+
+    return [SearchHit(**dict(r)) for r in rows]
+
+
+def indexed_urls(cfg: AppConfig) -> set[str]:
+    if not index_path(cfg).exists():
+        return set()
+    with closing(connect_index(cfg)) as conn:
+        return {r[0] for r in conn.execute("SELECT url FROM listings")}
+
+
+def count_indexed(cfg: AppConfig) -> int:
+    if not index_path(cfg).exists():
+        return 0
+    with closing(connect_index(cfg)) as conn:
+        return int(conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0])
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import gzip
+import json
+import time
+import unicodedata
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.config import AppConfig
+from src.discovery.details import ad_cache
+from src.discovery.web_search import serp_cache
+from src.discovery.web_sources import WEB_SOURCE_PREFIX
+from src.storage.blobs import BlobStore, blob_store
+from src.storage.index import SearchHit, connect_index, get_meta, index_path, set_meta
+from src.storage.save import load_seen_urls, save_seen_urls
+from src.storage.seen import SeenIndex, open_seen_index
+
+
+# Rows moved per transaction, so a first run on a large history stays bounded.
+EXPIRE_BATCH = 5_000
+
+_LAST_RUN_KEY = "retention_last_run"
+
+BLOB_MIN_AGE_SECONDS = 3600
+
+
+@dataclass
+class RetentionReport:
+    ran: bool = False
+    expired: int = 0
+    hot: int = 0               # listings left in listings.db
+    seen_removed: int = 0
+    blobs_removed: int = 0
+    cache_removed: int = 0     # cached full ads + web-search pages
+    cold_files: List[Path] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def cold_dir(cfg: AppConfig) -> Path:
+    return Path(cfg.output.data_dir) / "cold"
+
+
+def _iso(ts: datetime) -> str:
+    return ts.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+# =============================
+# Cold archive
+# =============================
+
+def _append_cold(root: Path, rows: List[Dict[str, Any]], expired_at: str) -> List[Path]:
+    """
+    Append rows to <root>/listings-YYYY-MM.jsonl.gz by first_seen month,
+    one gzip member per call (same layout trick as RawArchive).
+    """
+    by_month: Dict[str, List[str]] = {}
+    for r in rows:
+        rec = dict(r, expired_at=expired_at)
+        by_month.setdefault(r["first_seen"][:7], []).append(json.dumps(rec, ensure_ascii=False))
+
+    paths = []
+    root.mkdir(parents=True, exist_ok=True)
+    for month, lines in sorted(by_month.items()):
+        path = root / f"listings-{month}.jsonl.gz"
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        paths.append(path)
+    return paths
+
+
+def iter_cold(cfg: AppConfig, since: str = "") -> Iterator[Dict[str, Any]]:
+    """
+    Every expired listing first seen at or after `since`, in first_seen
+    order (month files are read one at a time). A url expired twice (a crash
+    between the cold write and the delete) comes out once.
+    """
+    for path in sorted(cold_dir(cfg).glob("listings-*.jsonl.gz")):
+        if since and path.name[len("listings-"):][:7] < since[:7]:
+            continue
+        by_url: Dict[str, Dict[str, Any]] = {}
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    rec = json.loads(line)
+                    by_url[rec.get("url", "")] = rec
+        rows = sorted(by_url.values(), key=lambda r: r.get("first_seen", ""))
+        yield from (r for r in rows if r.get("first_seen", "") >= since)
+
+
+def _fold(text: str) -> str:
+    # Case- and accent-insensitive, like the FTS5 unicode61 tokenizer.
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)).casefold()
+
+
+def search_cold(cfg: AppConfig, query: str, days: Optional[int] = None, limit: int = 25) -> List[SearchHit]:
+    """
+    Expired listings containing every word of `query` (a trailing * is
+    ignored: matching is by substring anyway), newest first. A linear scan
+    of data/cold/, so meant for the occasional look back, not ranking.
+    """
+    words = [_fold(w.rstrip("*")) for w in query.split() if w.rstrip("*")]
+    if not words:
+        return []
+    since = ""
+    if days:
+        since = _iso(datetime.now(timezone.utc) - timedelta(days=days))
+
+    hits: List[SearchHit] = []
+    for r in iter_cold(cfg, since):
+        text = _fold(" ".join(str(r.get(k) or "") for k in ("title", "company", "location", "description")))
+        if all(w in text for w in words):
+            hits.append(SearchHit(
+                url=r.get("url", ""),
+                title=r.get("title", ""),
+                company=r.get("company", ""),
+                location=r.get("location", ""),
+                source=r.get("source", ""),
+                score=float(r.get("score") or 0.0),
+                first_seen=r.get("first_seen", ""),
+                last_seen=r.get("last_seen", ""),
+                rank=0.0,
+                closed=True,
+            ))
+    hits.sort(key=lambda h: h.first_seen, reverse=True)
+    return hits[: max(0, int(limit))]
+
+
+# =============================
+# Expiry + compaction
+# =============================
+
+def expire_listings(cfg: AppConfig, now: datetime) -> tuple[List[str], List[Path]]:
+    """
+    Move closed listings from listings.db to the cold archive; returns
+    (expired urls, cold files written). Closed means the application deadline
+    passed more than grace_days ago, or there is no deadline and the ad hasn't
+    been seen for unseen_days. Anything seen within grace_days stays hot.
+
+    The unseen rule needs last_seen to advance while an ad is still up, which
+    only full (non-incremental) searches do: an incremental search asks for
+    ads published since its last run, so last_seen stops at the day an ad was
+    published. With search.query.incremental on, the rule is therefore only
+    applied to web-search hits, which carry no deadline and aren't searched
+    incrementally; their last_seen is when they were first found, so they
+    expire unseen_days after that.
+
+    Cold rows are written before the hot ones are deleted, so a crash in
+    between can duplicate a row in the cold archive but never lose one.
+    """
+    r_cfg = cfg.retention
+    grace_cutoff = _iso(now - timedelta(days=r_cfg.grace_days))
+    unseen_cutoff = _iso(now - timedelta(days=r_cfg.unseen_days))
+    unseen_sources = WEB_SOURCE_PREFIX + "%" if cfg.search.query.incremental else "%"
+    expired_at = _iso(now)
+
+    urls: List[str] = []
+    files: List[Path] = []
+    with closing(connect_index(cfg)) as conn:
+        while True:
+            rows = conn.execute(
+                """
+                SELECT * FROM listings
+                WHERE last_seen < :grace
+                  AND ((deadline != '' AND deadline < :grace)
+                       OR (deadline = '' AND last_seen < :unseen AND source LIKE :unseen_sources))
+                ORDER BY id
+                LIMIT :limit
+                """,
+                {"grace": grace_cutoff, "unseen": unseen_cutoff, "unseen_sources": unseen_sources,
+                 "limit": EXPIRE_BATCH},
+            ).fetchall()
+            if not rows:
+                break
+
+            batch = [dict(r) for r in rows]
+            for path in _append_cold(cold_dir(cfg), [{k: v for k, v in r.items() if k != "id"} for r in batch], expired_at):
+                if path not in files:
+                    files.append(path)
+            with conn:
+                conn.executemany("DELETE FROM listings WHERE id = ?", [(r["id"],) for r in batch])
+            urls.extend(r["url"] for r in batch)
+    return urls, files
+
+
+def _compact_index(cfg: AppConfig) -> int:
+    """Merge FTS segments, reclaim deleted pages; returns the hot row count."""
+    with closing(connect_index(cfg)) as conn:
+        with conn:
+            conn.execute("INSERT INTO listings_fts(listings_fts) VALUES ('optimize')")
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return int(conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0])
+
+
+def _live_blob_keys(cfg: AppConfig) -> set[str]:
+    """Blob keys of hot listings (the index stores the same full text the blob holds)."""
+    with closing(connect_index(cfg)) as conn:
+        return {
+            BlobStore.key_for(r[0])
+            for r in conn.execute("SELECT description FROM listings WHERE description != ''")
+        }
+
+
+def _forget_legacy_seen(cfg: AppConfig, urls: List[str]) -> None:
+    # open_seen_index re-imports seen_ads.json into an empty index, so expired
+    # URLs must go from there too or they'd come back.
+    legacy = load_seen_urls(cfg)
+    if legacy and not legacy.isdisjoint(urls):
+        save_seen_urls(cfg, legacy.difference(urls))
+
+
+def retention_due(cfg: AppConfig, now: datetime) -> bool:
+    if not index_path(cfg).exists():
+        return False
+    with closing(connect_index(cfg)) as conn:
+        last = get_meta(conn, _LAST_RUN_KEY)
+    if not last:
+        return True
+    try:
+        last_ts = datetime.fromisoformat(last)
+    except ValueError:
+        return True
+    return now - last_ts >= timedelta(hours=cfg.retention.compact_every_hours)
+
+
+def run_retention(
+    cfg: AppConfig,
+    seen: Optional[SeenIndex] = None,
+    blobs: Optional[BlobStore] = None,
+    now: Optional[datetime] = None,
+    force: bool = False,
+) -> RetentionReport:
+    """
+    Expire closed listings into data/cold/ and compact what stays hot:
+    listings.db (FTS optimize + VACUUM), the seen index and the blob store.
+    Runs at most once per retention.compact_every_hours unless `force`;
+    the last run time is kept in listings.db's meta table.
+
+    seen: the already-open seen index (the monitor holds it for the whole
+          tick); opened here if not given.
+    """
+    now = now or datetime.now(timezone.utc)
+    report = RetentionReport()
+    if not force and not retention_due(cfg, now):
+        return report
+    if not index_path(cfg).exists():
+        return report
+
+    started = time.perf_counter()
+    report.ran = True
+
+    urls, report.cold_files = expire_listings(cfg, now)
+    report.expired = len(urls)
+
+    if urls:
+        if seen is not None:
+            report.seen_removed = seen.remove(urls)
+        else:
+            with open_seen_index(cfg) as s:
+                report.seen_removed = s.remove(urls)
+        _forget_legacy_seen(cfg, urls)
+
+    report.hot = _compact_index(cfg)
+
+    # Every blob this process wrote belongs to a listing indexed above; the
+    # hour spares another process's blobs that aren't indexed yet.
+    store = blobs or blob_store(cfg)
+    report.blobs_removed = store.sweep(_live_blob_keys(cfg), older_than=now.timestamp() - BLOB_MIN_AGE_SECONDS)
+
+    report.cache_removed = ad_cache(cfg).sweep(
+        older_than=now.timestamp() - cfg.retention.ad_cache_days * 86400
+    ) + serp_cache(cfg).sweep(now.timestamp())
+
+    with closing(connect_index(cfg)) as conn, conn:
+        set_meta(conn, _LAST_RUN_KEY, _iso(now))
+
+    report.seconds = time.perf_counter() - started
+    return report
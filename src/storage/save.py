@@ -3,10 +3,11 @@ from __future__ import annotations
 import json
 from dataclasses import asdict
 from pathlib import Path
-from typing import List, Set
+from typing import Any, Container, Dict, List, Optional, Set
 
 from src.config import AppConfig
 from src.models import ScoredListing
+from src.storage.atomic import atomic_write_text
 
 
 def ensure_dirs(cfg: AppConfig) -> None:
@@ -14,10 +15,36 @@ def ensure_dirs(cfg: AppConfig) -> None:
     Path(cfg.output.applications_dir).mkdir(parents=True, exist_ok=True)
 
 
-def save_listings_json(cfg: AppConfig, listings: List[ScoredListing]) -> Path:
+def load_listings_json(cfg: AppConfig) -> List[Dict[str, Any]]:
+    """The last listings.json as plain dicts; empty if missing or unreadable."""
     path = Path(cfg.output.data_dir) / "listings.json"
-    payload = [asdict(x) for x in listings]
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    return [x for x in data if isinstance(x, dict) and x.get("url")] if isinstance(data, list) else []
+
+
+def update_listings_json(
+    cfg: AppConfig,
+    listings: List[ScoredListing],
+    open_urls: Optional[Container[str]] = None,
+) -> Path:
+    """
+    Merge this run's listings into listings.json, which holds every open
+    listing, best first. An incremental search only returns new ads, so the
+    file can't just be this run's results. open_urls: if given, anything
+    not in it (expired by retention) is dropped.
+    """
+    merged: Dict[str, Dict[str, Any]] = {x["url"]: x for x in load_listings_json(cfg)}
+    for x in listings:
+        if x.url:
+            merged[x.url] = asdict(x)
+    rows = [x for url, x in merged.items() if open_urls is None or url in open_urls]
+    rows.sort(key=lambda x: float(x.get("score") or 0.0), reverse=True)
+
+    path = Path(cfg.output.data_dir) / "listings.json"
+    atomic_write_text(path, json.dumps(rows, ensure_ascii=False, indent=2))
     return path
 
 
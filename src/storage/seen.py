@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+from src.config import AppConfig
+from src.storage.atomic import atomic_open, atomic_write_bytes
+from src.storage.save import load_seen_urls
+
+
+def url_key(url: str) -> int:
+    """64-bit key for a URL (or ad id). Collisions are negligible at our scale."""
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# =============================
+# Bloom filter
+# =============================
+
+_BLOOM_HEADER = struct.Struct("<QQ")  # bits, hashes
+_BLOOM_BITS_PER_KEY = 10               # ~1% false positives with 7 hashes
+_BLOOM_HASHES = 7
+
+
+class BloomFilter:
+    def __init__(self, bits: int, hashes: int = _BLOOM_HASHES, data: Optional[bytearray] = None):
+        self.bits = max(64, bits)
+        self.hashes = hashes
+        self.data = data if data is not None else bytearray((self.bits + 7) // 8)
+
+    @classmethod
+    def for_keys(cls, keys: Iterable[int], count: int) -> "BloomFilter":
+        bloom = cls(bits=max(1 << 16, count * _BLOOM_BITS_PER_KEY))
+        for k in keys:
+            bloom.add(k)
+        return bloom
+
+    def _positions(self, key: int):
+        # Kirsch–Mitzenmacher double hashing on the two halves of the 64-bit key.
+        h1 = key & 0xFFFFFFFF
+        h2 = (key >> 32) | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, key: int) -> None:
+        for pos in self._positions(key):
+            self.data[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: int) -> bool:
+        return all(self.data[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def save(self, path: Path) -> None:
+        with atomic_open(path, "wb") as f:
+            f.write(_BLOOM_HEADER.pack(self.bits, self.hashes))
+            f.write(self.data)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["BloomFilter"]:
+        try:
+            raw = path.read_bytes()
+            bits, hashes = _BLOOM_HEADER.unpack_from(raw)
+        except (OSError, struct.error):
+            return None
+        data = bytearray(raw[_BLOOM_HEADER.size:])
+        if len(data) != (bits + 7) // 8:
+            return None
+        return cls(bits=bits, hashes=hashes, data=data)
+
+
+# =============================
+# Seen index
+# =============================
+
+class SeenIndex:
+    """
+    Compact "have we shown this ad before?" set.
+
+    On disk (under <data_dir>/seen/):
+      base.u64    sorted, unique uint64 URL keys, memory-mapped, binary-searched
+      base.bloom  Bloom filter over base.u64, so most misses never touch it
+      log.u64     append-only keys added since the last merge
+
+    The log is small and lives in memory as a set of ints; once it passes
+    `merge_threshold` keys it is merged into a new base (and a new bloom).
+    Memory is ~8 bytes per seen ad in the page cache instead of a Python str each.
+    """
+
+    def __init__(self, root: Path, merge_threshold: int = 4096):
+        self.root = Path(root)
+        self.merge_threshold = merge_threshold
+        self._base_path = self.root / "base.u64"
+        self._bloom_path = self.root / "base.bloom"
+        self._log_path = self.root / "log.u64"
+
+        self._mm: Optional[mmap.mmap] = None
+        self._base: Optional[memoryview] = None
+        self._bloom: Optional[BloomFilter] = None
+        self._log: Set[int] = set()
+        self._pending: List[int] = []
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._open_base()
+        self._load_log()
+
+    # ---- open / close ----
+
+    def _open_base(self) -> None:
+        if self._base_path.exists() and self._base_path.stat().st_size >= 8:
+            with open(self._base_path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            usable = len(self._mm) - len(self._mm) % 8
+            self._base = memoryview(self._mm)[:usable].cast("Q")
+            self._bloom = BloomFilter.load(self._bloom_path)
+            if self._bloom is None:
+                self._bloom = BloomFilter.for_keys(self._base, len(self._base))
+                self._bloom.save(self._bloom_path)
+
+    def _close_base(self) -> None:
+        if self._base is not None:
+            self._base.release()
+            self._base = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._bloom = None
+
+    def _load_log(self) -> None:
+        if self._log_path.exists():
+            raw = self._log_path.read_bytes()
+            keys = array("Q")
+            keys.frombytes(raw[: len(raw) - len(raw) % 8])
+            self._log = set(keys)
+
+    def close(self) -> None:
+        self.flush()
+        self._close_base()
+
+    def __enter__(self) -> "SeenIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- queries ----
+
+    def _in_base(self, key: int) -> bool:
+        if self._base is None or (self._bloom is not None and key not in self._bloom):
+            return False
+        i = bisect_left(self._base, key)
+        return i < len(self._base) and self._base[i] == key
+
+    def contains_key(self, key: int) -> bool:
+        return key in self._log or self._in_base(key)
+
+    def __contains__(self, url: object) -> bool:
+        return isinstance(url, str) and self.contains_key(url_key(url))
+
+    def __len__(self) -> int:
+        return (len(self._base) if self._base is not None else 0) + len(self._log)
+
+    # ---- updates ----
+
+    def add(self, url: str) -> bool:
+        """Add a URL; returns True if it was new."""
+        key = url_key(url)
+        if self.contains_key(key):
+            return False
+        self._log.add(key)
+        self._pending.append(key)
+        return True
+
+    def flush(self) -> None:
+        """Persist pending keys to the append log; merge if the log got big."""
+        if self._pending:
+            with open(self._log_path, "ab") as f:
+                f.write(array("Q", self._pending).tobytes())
+            self._pending = []
+        if len(self._log) >= self.merge_threshold:
+            self.merge()
+
+    def remove(self, urls: Iterable[str]) -> int:
+        """Forget URLs (e.g. expired ads) by rewriting the base; returns how many were present."""
+        drop = {k for k in map(url_key, urls) if self.contains_key(k)}
+        if drop:
+            self.flush()
+            self.merge(drop)
+        return len(drop)
+
+    def merge(self, drop: Optional[Set[int]] = None) -> None:
+        """Fold the log into a new sorted base file (minus `drop`) and rebuild the bloom filter."""
+        keys = array("Q")
+        if self._base is not None:
+            keys.frombytes(self._base.tobytes())
+        keys.extend(self._log)
+        merged = array("Q", sorted(set(keys) - (drop or set())))
+
+        self._close_base()  # must unmap before replacing the file (Windows)
+        atomic_write_bytes(self._base_path, merged.tobytes())
+        BloomFilter.for_keys(merged, len(merged)).save(self._bloom_path)
+
+        self._log_path.write_bytes(b"")
+        self._log = set()
+        self._pending = []
+        self._open_base()
+
+
+def open_seen_index(cfg: AppConfig) -> SeenIndex:
+    """
+    Open the seen index, importing the legacy seen_ads.json on first use.
+    """
+    index = SeenIndex(Path(cfg.output.data_dir) / "seen")
+    if len(index) == 0:
+        legacy = load_seen_urls(cfg)
+        if legacy:
+            for u in legacy:
+                index.add(u)
+            index.flush()
+            index.merge()
+    return index
@@ -0,0 +1,87 @@
+"""
+SERP parser benchmark: lxml (src/discovery/serp.py) against a BeautifulSoup
+reference over the saved pages, in ms/page.
+
+    python -m tests.bench_serp [--rounds 50]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.discovery.serp import SerpPage, SerpResult, _bing_url, _ddg_url, parse_serp
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+REPO = FIXTURES.parent.parent
+
+# (engine, page): two with results, two bot checks saved from real runs
+PAGES: List[Tuple[str, Path]] = [
+    ("duckduckgo", FIXTURES / "serp_duckduckgo.html"),
+    ("bing", FIXTURES / "serp_bing.html"),
+    ("duckduckgo", REPO / "data" / "debug_duckduckgo.html"),
+    ("bing", REPO / "data" / "debug_bing.html"),
+]
+
+
+def parse_serp_bs4(engine: str, content: bytes | str) -> SerpPage:
+    """The BeautifulSoup equivalent of parse_serp: the reference and the baseline."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
+    page = SerpPage(engine=engine)
+    if engine == "bing":
+        for li in soup.select("li.b_algo"):
+            a = li.select_one("h2 a[href]")
+            p = li.select_one(".b_caption p")
+            if a:
+                page.results.append(SerpResult(a.get_text(" ", strip=True), _bing_url(a["href"]), p.get_text(" ", strip=True) if p else ""))
+        page.blocked = not page.results and bool(soup.select_one(".captcha, #turnstile-widget"))
+    elif engine == "duckduckgo":
+        for div in soup.select("div.result:not(.result--ad)"):
+            a = div.select_one("a.result__a[href]")
+            p = div.select_one(".result__snippet")
+            if a:
+                page.results.append(SerpResult(a.get_text(" ", strip=True), _ddg_url(a["href"]), p.get_text(" ", strip=True) if p else ""))
+        page.blocked = not page.results and bool(soup.select_one(".anomaly-modal__modal, form#challenge-form"))
+    return page
+
+
+PARSERS: Dict[str, Callable[[str, bytes], SerpPage]] = {"lxml": parse_serp, "bs4": parse_serp_bs4}
+
+
+def time_parser(fn: Callable[[str, bytes], SerpPage], engine: str, content: bytes, rounds: int) -> Optional[float]:
+    """Mean ms/page over `rounds` parses, or None if the parser's library is missing."""
+    try:
+        fn(engine, content)  # warm-up
+    except ImportError:
+        return None
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn(engine, content)
+    return (time.perf_counter() - t0) / rounds * 1000
+
+
+def bench(rounds: int = 50) -> List[Dict[str, object]]:
+    rows = []
+    for engine, path in PAGES:
+        if not path.exists():
+            continue
+        content = path.read_bytes()
+        page = parse_serp(engine, content)
+        row: Dict[str, object] = {"page": path.name, "engine": engine, "results": len(page.results), "blocked": page.blocked}
+        for name, fn in PARSERS.items():
+            row[name] = time_parser(fn, engine, content, rounds)
+        rows.append(row)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m tests.bench_serp")
+    parser.add_argument("--rounds", type=int, default=50)
+    ns = parser.parse_args()
+    for row in bench(ns.rounds):
+        timings = "  ".join(f"{k} {row[k]:.2f} ms/page" for k in PARSERS if row[k] is not None)
+        print(f"{row['page']:<24} {row['engine']:<10} results={row['results']} blocked={row['blocked']}  {timings}")
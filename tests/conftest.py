@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from src.config import AppConfig, load_config
+from src.discovery.details import AD_FIELDS
+from src.discovery.web_sources import Source
+
+
+REPO = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def cfg(tmp_path: Path) -> AppConfig:
+    """The repo's config.yaml with all output under tmp_path."""
+    base = load_config(str(REPO / "config.yaml"))
+    return replace(
+        base,
+        output=replace(base.output, data_dir=str(tmp_path / "data"), applications_dir=str(tmp_path / "apps")),
+    )
+
+
+@pytest.fixture
+def jobtech_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("JOBTECH_API_KEY", "test")
+
+
+class FakeJobSearch:
+    """
+    Three ads behind /search and /ad/{id}. Searches honour the X-Fields mask
+    as far as the description goes; `calls` records every path requested,
+    `searches` every q sent, and `fail` holds ad ids whose detail request errors.
+    """
+
+    ADS = {
+        "1": {"headline": "LIA Java-utvecklare", "text": "LIA inom Java och Spring Boot."},
+        "2": {"headline": "Senior Java developer", "text": "Java, Spring, Kafka."},
+        "3": {"headline": "LIA frontend", "text": "React och TypeScript."},
+    }
+
+    source = Source(name="JobTechJobSearch", kind="jobtech_jobsearch", base_url="https://jobsearch.test")
+
+    def __init__(self):
+        self.calls: List[str] = []
+        self.searches: List[str] = []
+        self.fail: Dict[str, int] = {}  # ad id -> failures left
+        self.transport = httpx.MockTransport(self._handle)
+
+    def ad(self, ad_id: str, full: bool = True) -> dict:
+        a = self.ADS[ad_id]
+        ad = {
+            "id": ad_id,
+            "headline": a["headline"],
+            "webpage_url": f"https://jobsearch.test/ad/{ad_id}",
+            "employer": {"name": f"Bolag {ad_id} AB"},
+            "timestamp": 1,
+        }
+        if full:
+            ad["description"] = {"text": a["text"]}
+        return ad
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.url.path)
+        if request.url.path == "/search":
+            self.searches.append(request.url.params.get("q", ""))
+            full = "description" in request.headers.get("X-Fields", "description")
+            return httpx.Response(200, json={"hits": [self.ad(i, full) for i in self.ADS]})
+        assert request.headers.get("X-Fields") == AD_FIELDS
+        ad_id = request.url.path.rsplit("/", 1)[1]
+        if self.fail.get(ad_id):
+            self.fail[ad_id] -= 1
+            return httpx.Response(503)
+        return httpx.Response(200, json=self.ad(ad_id))
+
+
+@pytest.fixture
+def board() -> FakeJobSearch:
+    return FakeJobSearch()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import pytest
+
+from src.storage.atomic import atomic_open, atomic_write_bytes, atomic_write_text
+
+
+def test_replaces_the_file_and_leaves_no_temp(tmp_path):
+    path = tmp_path / "listings.json"
+    atomic_write_text(path, "old")
+    atomic_write_bytes(path, b"new", mtime=1_700_000_000)
+
+    assert path.read_bytes() == b"new"
+    assert path.stat().st_mtime == 1_700_000_000
+    assert [p.name for p in tmp_path.iterdir()] == ["listings.json"]
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = tmp_path / "listings.csv"
+    atomic_write_text(path, "header\nrow\n")
+
+    with pytest.raises(RuntimeError):
+        with atomic_open(path, "w", encoding="utf-8") as f:
+            f.write("half")
+            raise RuntimeError("disk full")
+
+    assert path.read_text(encoding="utf-8") == "header\nrow\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["listings.csv"]
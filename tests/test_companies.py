@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+
+from src.outreach.generate import Company
+from src.ranking.companies import CompanyMatcher, load_company_matcher, normalize_company
+
+
+@pytest.mark.parametrize(
+    "name, norm",
+    [
+        ("Exempel Konsult i Sverige AB (publ)", "exempel konsult"),
+        ("Ångström & Co AB", "angstrom och co"),
+        ("Nordic Group AB", ""),  # nothing left that identifies an employer
+        ("", ""),
+    ],
+)
+def test_normalize_company(name, norm):
+    assert normalize_company(name) == norm
+
+
+def test_matcher_exact_fuzzy_and_threshold():
+    matcher = CompanyMatcher([
+        Company(name="Exempel Konsult AB"),
+        Company(name="Kodbolaget Stockholm AB"),
+        Company(name="   "),  # nothing to match on: skipped
+    ])
+    assert len(matcher) == 2
+
+    exact = matcher.match("EXEMPEL KONSULT i Sverige AB (publ)")
+    assert exact.company.name == "Exempel Konsult AB" and exact.similarity == 1.0
+
+    fuzzy = matcher.match("Kodbolaget i Stockholm")
+    assert fuzzy.company.name == "Kodbolaget Stockholm AB" and 0.6 <= fuzzy.similarity < 1.0
+
+    assert matcher.match("Helt Annat Företag AB") is None
+    assert matcher.match("Sverige AB") is None
+    assert matcher.match("") is None
+
+
+def test_load_company_matcher_without_a_list(tmp_path):
+    assert load_company_matcher(str(tmp_path / "missing.yaml")) is None
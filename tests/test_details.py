@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from src.discovery.details import DETAIL_ATTEMPTS
+from src.discovery.fetch import iter_fetch
+from src.storage.archive import iter_partition, raw_archive
+
+
+def test_two_phase_fetches_details_for_title_survivors_only(cfg, jobtech_key, board):
+    batches = list(iter_fetch(cfg, [board.source], queries=["LIA Java"], transport=board.transport))
+    assert sorted(board.calls) == ["/ad/1", "/ad/3", "/search"]
+    assert [l.title for l in batches[0].kept] == ["LIA Java-utvecklare"]
+
+    # Second run: details come from data/cache/ads.
+    board.calls.clear()
+    list(iter_fetch(cfg, [board.source], queries=["LIA Java"], transport=board.transport))
+    assert board.calls == ["/search"]
+
+
+def test_no_detail_requests_without_server_filters(cfg, jobtech_key, board):
+    q = replace(cfg.search.query, server_filters=False, two_phase=True)
+    cfg = replace(cfg, search=replace(cfg.search, query=q))
+
+    batches = list(iter_fetch(cfg, [board.source], queries=["LIA Java"], transport=board.transport))
+    assert board.calls == ["/search"]
+    assert [l.title for l in batches[0].kept] == ["LIA Java-utvecklare"]
+
+
+def test_failed_detail_is_retried_then_dropped(cfg, jobtech_key, board):
+    board.fail = {"1": 1, "3": 5}  # ad 1 recovers on retry, ad 3 never does
+    archive = raw_archive(cfg)
+
+    batch = list(iter_fetch(cfg, [board.source], queries=["LIA Java"], archive=archive, transport=board.transport))[0]
+    assert board.calls.count("/ad/1") == 2
+    assert board.calls.count("/ad/3") == DETAIL_ATTEMPTS
+    assert [l.title for l in batch.kept] == ["LIA Java-utvecklare"]
+    assert batch.hits == 3
+    assert batch.dropped["detail_error"] == 1
+
+    # The failed ad is neither kept on its headline nor archived as if complete.
+    archived = {r["hit"]["id"] for p in archive.partitions() for r in iter_partition(p)}
+    assert archived == {"1", "2"}
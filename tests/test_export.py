@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import csv
+from datetime import datetime, timezone
+
+import pytest
+
+from src.models import ScoredListing
+from src.storage.export import EXPORT_COLUMNS, export_csv, export_parquet
+from src.storage.index import index_listings
+
+
+def _index(cfg):
+    index_listings(
+        cfg,
+        [
+            ScoredListing(
+                title="LIA Java", company="A AB", location="Kista", url="https://x/1", source="JobTech", score=6.0,
+                published="2026-09-01T08:00:00+00:00", deadline="2026-10-31T23:59:59+00:00",
+            ),
+            ScoredListing(title="LIA Kotlin", company="B AB", location="Solna", url="https://x/2", source="JobTech"),
+        ],
+        seen_at="2026-09-02T10:00:00+00:00",
+    )
+
+
+def test_csv_has_published_and_deadline(cfg):
+    _index(cfg)
+    report = export_csv(cfg)
+
+    with open(report.files[0], encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert tuple(rows[0]) == EXPORT_COLUMNS
+    assert rows[0]["published"] == "2026-09-01T08:00:00+00:00"
+    assert rows[0]["deadline"] == "2026-10-31T23:59:59+00:00"
+    assert rows[1]["published"] == rows[1]["deadline"] == ""
+
+
+def test_parquet_dates_are_timestamps(cfg):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    _index(cfg)
+    report = export_parquet(cfg)
+    table = pq.read_table(report.files[0])
+
+    for name in ("first_seen", "last_seen", "published", "deadline"):
+        # Parquet has no seconds unit; timestamp[s] reads back as ms
+        t = table.schema.field(name).type
+        assert pa.types.is_timestamp(t) and t.tz == "UTC"
+    assert table.column("deadline").to_pylist() == [datetime(2026, 10, 31, 23, 59, 59, tzinfo=timezone.utc), None]
+
+
+def test_empty_window_keeps_previous_csv(cfg):
+    _index(cfg)
+    csv_file = export_csv(cfg).files[0]
+    before = csv_file.read_bytes()
+
+    # first_seen is 2026-09-02; a 1-day window has nothing in it.
+    assert export_csv(cfg, days=1).rows == 0
+    assert csv_file.read_bytes() == before
+
+
+def test_empty_window_keeps_previous_parquet_partitions(cfg):
+    pytest.importorskip("pyarrow")
+
+    _index(cfg)
+    parts = export_parquet(cfg).files
+    report = export_parquet(cfg, days=1)
+
+    assert report.rows == 0 and report.files == []
+    assert parts and all(p.exists() for p in parts)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from src.ranking.geo import build_distance_matrix, load_municipalities, location_scorer
+
+
+def test_bundled_matrix_matches_the_csv():
+    table = load_municipalities()
+    fresh = build_distance_matrix(table.municipalities)
+    assert table.km.shape == (len(table), len(table))
+    assert np.abs(table.km.astype(int) - fresh.astype(int)).max() <= 1
+
+    sthlm, upps, gbg = (table.lookup(n) for n in ("Stockholm", "Uppsala", "Göteborg"))
+    assert 60 <= table.km[sthlm, upps] <= 70
+    assert 390 <= table.km[sthlm, gbg] <= 405
+    assert table.km[sthlm, sthlm] == 0 and table.km[sthlm, upps] == table.km[upps, sthlm]
+
+
+@pytest.mark.parametrize("text", ["Solna", "solna kommun", "0184", "Arenastaden", "Arenastaden, Solna", "Bromma/Solna"])
+def test_lookup_by_name_code_and_alias(text):
+    table = load_municipalities()
+    row = table.lookup(text)
+    assert row is not None
+    assert table.municipalities[row].name == ("Stockholm" if text.startswith("Bromma") else "Solna")
+
+
+def test_score_decays_with_distance_to_the_nearest_home():
+    scorer = location_scorer(["Stockholm"], max_boost=6.0, half_life_km=15.0)
+    score, km = scorer.score_many(["Stockholm", "Kista", "Solna", "Uppsala", "Göteborg", "Mars"])
+
+    assert score[0] == score[1] == pytest.approx(6.0)
+    assert score[0] > score[2] > score[3] > score[4]
+    assert score[2] == pytest.approx(6.0 * 0.5 ** (float(km[2]) / 15.0), rel=1e-4)
+    assert score[4] < 0.01
+    assert math.isnan(score[5]) and math.isnan(km[5])
+
+    # A county means every municipality in it is home.
+    county = location_scorer(["Stockholms län"], max_boost=6.0, half_life_km=15.0)
+    assert county.score_many(["Solna"])[0][0] == pytest.approx(6.0)
+    assert location_scorer(["Atlantis"], max_boost=6.0, half_life_km=15.0) is None
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.models import ScoredListing
+from src.storage.index import _to_match_expr, index_listings, search_index
+
+
+@pytest.mark.parametrize(
+    "query, expr",
+    [
+        ("kafka java", '"kafka" "java"'),
+        ("spring-boot c#", '"spring-boot" "c#"'),
+        ("utveckl*", '"utveckl"*'),
+        ('say "hi"', '"say" """hi"""'),
+        ("* ** ", ""),
+    ],
+)
+def test_match_expr_quotes_every_word(query, expr):
+    assert _to_match_expr(query) == expr
+
+
+def _iso(ts: datetime) -> str:
+    return ts.isoformat(timespec="seconds")
+
+
+def test_search_ranks_matches_and_honours_the_days_window(cfg):
+    now = datetime.now(timezone.utc)
+    old = ScoredListing(title="LIA Kafka", company="Gammal AB", location="Kista", url="https://x/old",
+                        description="Kafka streams.", source="JobTech")
+    new = ScoredListing(title="LIA C# och spring-boot", company="Ny AB", location="Solna", url="https://x/new",
+                        description="Kafka, .NET och spring-boot.", source="JobTech")
+    index_listings(cfg, [old], seen_at=_iso(now - timedelta(days=30)))
+    index_listings(cfg, [new], seen_at=_iso(now - timedelta(days=1)))
+
+    # Title matches outrank description-only matches.
+    assert [h.url for h in search_index(cfg, "kafka")] == ["https://x/old", "https://x/new"]
+    assert [h.url for h in search_index(cfg, "kafka", days=7)] == ["https://x/new"]
+    # Punctuation in a query is searched, not parsed as FTS syntax.
+    assert [h.url for h in search_index(cfg, "spring-boot c#")] == ["https://x/new"]
+    assert [h.url for h in search_index(cfg, "kaf*")] == ["https://x/old", "https://x/new"]
+    assert search_index(cfg, "") == []
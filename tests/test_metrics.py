@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import httpx
+
+from src.discovery.gates import QueryBatch
+from src.models import Listing
+from src.monitor.metrics import MetricsRegistry, MonitorMetrics, serve_metrics
+
+
+def test_text_format():
+    r = MetricsRegistry()
+    hits = r.counter("lia_hits_total", "Hits.", ("query",))
+    seen = r.gauge("lia_seen_ads", "Seen ads.")
+    latency = r.histogram("lia_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    hits.inc(3, query='LIA "Java"\nStockholm')
+    hits.inc(query='LIA "Java"\nStockholm')
+    seen.set(12)
+    for v in (0.05, 0.5, 2.0):
+        latency.observe(v)
+
+    assert r.render() == "\n".join([
+        "# HELP lia_hits_total Hits.",
+        "# TYPE lia_hits_total counter",
+        'lia_hits_total{query="LIA \\"Java\\"\\nStockholm"} 4',
+        "# HELP lia_seen_ads Seen ads.",
+        "# TYPE lia_seen_ads gauge",
+        "lia_seen_ads 12",
+        "# HELP lia_seconds Latency.",
+        "# TYPE lia_seconds histogram",
+        'lia_seconds_bucket{le="0.1"} 1',
+        'lia_seconds_bucket{le="1"} 2',
+        'lia_seconds_bucket{le="+Inf"} 3',
+        "lia_seconds_sum 2.55",
+        "lia_seconds_count 3",
+    ]) + "\n"
+
+
+def test_monitor_metrics_served_over_http():
+    metrics = MonitorMetrics()
+    kept = [Listing(title="LIA Java", company="A", location="Kista", url="https://x/1")]
+    metrics.observe_batch(QueryBatch("JobTechJobSearch", "LIA Java", hits=5, kept=kept,
+                                     dropped={"not_lia": 3, "not_java": 0}, seconds=0.2))
+    metrics.tick_finished(ok=False, seconds=3.0)
+
+    server = serve_metrics(metrics.registry, port=0)
+    try:
+        resp = httpx.get(f"http://127.0.0.1:{server.server_port}/metrics")
+    finally:
+        server.shutdown()
+    body = resp.text
+
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'lia_fetch_hits_total{source="JobTechJobSearch",query="LIA Java"} 5' in body
+    assert 'lia_fetch_kept_total{source="JobTechJobSearch",query="LIA Java"} 1' in body
+    assert 'lia_fetch_dropped_total{source="JobTechJobSearch",reason="not_lia"} 3' in body
+    assert "not_java" not in body
+    assert 'lia_ticks_total{outcome="error"} 1' in body
+    # A failed tick sets the last-tick gauge but not the last-success one.
+    samples = [l.split(" ")[0] for l in body.splitlines() if not l.startswith("#")]
+    assert "lia_last_tick_timestamp_seconds" in samples
+    assert "lia_last_success_timestamp_seconds" not in samples
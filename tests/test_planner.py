@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from src.discovery.planner import plan_queries, query_last_runs, record_query_yields
+
+
+def _with_query(cfg, **kw):
+    return replace(cfg, search=replace(cfg.search, query=replace(cfg.search.query, **kw)))
+
+
+def test_record_yields_claims_each_url_once_and_keeps_an_ema():
+    stats = {"ticks": 0, "queries": {}}
+    yields = {
+        "LIA Java": {"hits": 10, "urls": ["a", "b", "c"]},
+        "LIA Kotlin": {"hits": 4, "urls": ["b", "d"]},  # b was claimed by LIA Java
+    }
+    record_query_yields(stats, yields, seen={"c"}, now="2026-06-01T08:00:00+00:00")
+
+    java, kotlin = stats["queries"]["LIA Java"], stats["queries"]["LIA Kotlin"]
+    assert stats["ticks"] == 1
+    assert (java["kept"], java["unique"], java["new"]) == (3, 3, 2)
+    assert java["reward"] == pytest.approx(2 + 0.25 * 1)
+    assert (kotlin["kept"], kotlin["unique"], kotlin["new"]) == (2, 1, 1)
+    assert java["last_run"] == java["last_new"] == "2026-06-01T08:00:00+00:00"
+
+    # A dry tick moves the reward 30% of the way towards zero.
+    record_query_yields(stats, {"LIA Java": {"hits": 10, "urls": ["a"]}}, seen={"a"}, now="2026-06-01T09:00:00+00:00")
+    assert java["reward"] == pytest.approx(0.7 * 2.25 + 0.3 * 0.25)
+    assert java["runs"] == 2 and java["last_new"] == "2026-06-01T08:00:00+00:00"
+    assert query_last_runs(stats) == {
+        "LIA Java": "2026-06-01T09:00:00+00:00",
+        "LIA Kotlin": "2026-06-01T08:00:00+00:00",
+    }
+
+
+def test_plan_puts_untried_first_then_ranks_by_ucb(cfg):
+    cfg = _with_query(cfg, adaptive=True, max_queries_per_run=2, exploration=1.0)
+    stats = {
+        "ticks": 10,
+        "queries": {
+            "good": {"runs": 5, "reward": 4.0},
+            "poor": {"runs": 5, "reward": 0.1},
+            "rare": {"runs": 1, "reward": 0.1},  # big exploration bonus
+        },
+    }
+    assert plan_queries(cfg, ["poor", "good", "new", "rare"], stats) == ["new", "good"]
+
+    full = _with_query(cfg, max_queries_per_run=0)
+    assert plan_queries(full, ["poor", "good", "new", "rare"], stats) == ["new", "good", "rare", "poor"]
+
+    # Without exploration, a lone dry run ranks by reward only.
+    greedy = _with_query(full, exploration=0.0)
+    assert plan_queries(greedy, ["rare", "poor", "good"], stats) == ["good", "rare", "poor"]
+
+
+def test_plan_keeps_order_when_not_adaptive(cfg):
+    cfg = _with_query(cfg, adaptive=False, max_queries_per_run=1)
+    stats = {"ticks": 3, "queries": {"b": {"runs": 3, "reward": 9.0}}}
+    assert plan_queries(cfg, ["a", "b"], stats) == ["a", "b"]
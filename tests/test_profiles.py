@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from src.monitor.profiles import MonitorProfile, run_shared_monitor
+
+
+def _profile(cfg, tmp_path, name, extra_terms):
+    search = replace(cfg.search, not_lia_terms=list(cfg.search.not_lia_terms) + extra_terms)
+    output = replace(cfg.output, data_dir=str(tmp_path / name))
+    return MonitorProfile(name=name, cfg=replace(cfg, search=search, output=output), companies=str(tmp_path / "none.yaml"))
+
+
+def test_profiles_with_different_exclusions_share_requests(cfg, jobtech_key, board, tmp_path):
+    anna = _profile(cfg, tmp_path, "anna", ["konsult", "spring"])
+    bob = _profile(cfg, tmp_path, "bob", ["konsult"])
+    report = run_shared_monitor([anna, bob], [board.source], transport=board.transport)
+
+    # One request per query for both, excluding only the terms both exclude.
+    assert report.requests == len(board.searches) == report.requests_separate // 2
+    for q in board.searches:
+        words = q.split()
+        assert "-senior" in words and "-konsult" in words
+        assert "-spring" not in words
+
+    # anna's extra term is applied locally: the Spring Boot ad is hers to drop.
+    kept = {r.name: [x.title for x in r.scored] for r in report.profiles}
+    assert kept == {"anna": [], "bob": ["LIA Java-utvecklare"]}
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from src.discovery.fetch import iter_fetch
+from src.outreach.generate import Company
+from src.ranking.companies import CompanyMatcher
+from src.ranking.rescore import rescore_archive
+from src.storage.archive import iter_partition, raw_archive
+
+
+def test_rescore_skips_headline_only_records(cfg, jobtech_key, board):
+    archive = raw_archive(cfg)
+    batches = list(iter_fetch(cfg, [board.source], queries=["LIA Java"], archive=archive, transport=board.transport))
+
+    # Two-phase: the senior ad is dropped on its headline and never fetched.
+    assert sorted(board.calls) == ["/ad/1", "/ad/3", "/search"]
+    assert [l.title for l in batches[0].kept] == ["LIA Java-utvecklare"]
+
+    records = [r for p in archive.partitions() for r in iter_partition(p)]
+    by_id = {r["hit"]["id"]: r for r in records}
+    assert by_id["2"].get("partial") is True and "description" not in by_id["2"]["hit"]
+    assert not by_id["1"].get("partial") and by_id["1"]["hit"]["description"]
+    assert by_id["3"]["drop"] == "not_java"
+
+    # Relax the Java gate: the frontend ad (complete record) comes back; the
+    # headline-only record is skipped and counted rather than replayed blind.
+    relaxed = replace(cfg, search=replace(cfg.search, strict=replace(cfg.search.strict, must_contain_java=False)))
+    report = rescore_archive(relaxed, baseline=cfg, workers=1)
+
+    assert report.records == 3
+    assert report.partial == 1
+    assert report.ads == 2
+    assert [x.title for x in report.added] == ["LIA frontend"]
+    assert report.removed == []
+    assert report.added[0].target_company is None
+
+    # Target companies boost the replayed scores as they do in the monitor.
+    matcher = CompanyMatcher([Company(name="Bolag 3 AB")])
+    boosted = rescore_archive(relaxed, baseline=cfg, workers=1, matcher=matcher)
+    assert boosted.added[0].target_company == "Bolag 3 AB"
+    assert boosted.added[0].score > report.added[0].score
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+from src.discovery.details import ad_cache
+from src.discovery.web_search import serp_cache
+from src.models import ScoredListing
+from src.monitor.pipeline import persist_results
+from src.storage.export import export_csv
+from src.storage.index import count_indexed, index_listings, search_index
+from src.storage.retention import iter_cold, run_retention, search_cold
+from src.storage.save import load_listings_json
+from src.storage.seen import open_seen_index
+
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def _iso(ts: datetime) -> str:
+    return ts.isoformat(timespec="seconds")
+
+
+def _index_two(cfg):
+    closed = ScoredListing(
+        title="LIA Kafka-utvecklare", company="Gammal AB", location="Kista", url="https://x/closed",
+        description="Kafka och Java.", source="JobTech", score=7.0,
+        deadline=_iso(NOW - timedelta(days=10)),
+    )
+    open_ = ScoredListing(
+        title="LIA Kafka backend", company="Ny AB", location="Solna", url="https://x/open",
+        description="Kafka, Spring.", source="JobTech", score=5.0,
+        deadline=_iso(NOW + timedelta(days=10)),
+    )
+    index_listings(cfg, [closed], seen_at=_iso(NOW - timedelta(days=40)))
+    index_listings(cfg, [open_], seen_at=_iso(NOW - timedelta(days=1)))
+
+
+def test_expired_listings_stay_searchable_and_exportable(cfg):
+    _index_two(cfg)
+    report = run_retention(cfg, now=NOW, force=True)
+
+    assert report.expired == 1 and report.hot == 1
+    assert count_indexed(cfg) == 1
+    assert [h.url for h in search_index(cfg, "kafka")] == ["https://x/open"]
+
+    cold = search_cold(cfg, "KAFKA kista")
+    assert [(h.url, h.closed) for h in cold] == [("https://x/closed", True)]
+    assert [r["url"] for r in iter_cold(cfg)] == ["https://x/closed"]
+
+    hot_only = export_csv(cfg)
+    assert hot_only.rows == 1
+    everything = export_csv(cfg, include_cold=True)
+    assert everything.rows == 2
+    lines = everything.files[0].read_text(encoding="utf-8-sig").splitlines()
+    # first_seen order across hot and cold
+    assert [l.split(",")[0] for l in lines[1:]] == ["https://x/closed", "https://x/open"]
+
+
+def test_unseen_rule_only_without_incremental(cfg):
+    stale = ScoredListing(title="LIA Java", company="A", location="Kista", url="https://x/stale", source="JobTech")
+    web = ScoredListing(title="LIA Java", company="B", location="", url="https://x/web", source="WebSearch:bing")
+    fresh_web = ScoredListing(title="LIA Kotlin", company="C", location="", url="https://x/web2",
+                              source="WebSearch:duckduckgo")
+    index_listings(cfg, [stale, web], seen_at=_iso(NOW - timedelta(days=90)))
+    index_listings(cfg, [fresh_web], seen_at=_iso(NOW - timedelta(days=3)))
+
+    # Incremental searches never refresh last_seen, so no-deadline JobTech ads
+    # stay hot; web-search hits still expire unseen_days after they were found.
+    assert cfg.search.query.incremental
+    assert run_retention(cfg, now=NOW, force=True).expired == 1
+    assert [h.url for h in search_cold(cfg, "LIA")] == ["https://x/web"]
+
+    full = replace(cfg, search=replace(cfg.search, query=replace(cfg.search.query, incremental=False)))
+    assert run_retention(full, now=NOW, force=True).expired == 1
+
+
+def test_retention_sweeps_ad_and_serp_caches(cfg):
+    _index_two(cfg)
+    ads, pages = ad_cache(cfg), serp_cache(cfg)
+    ads.put("old", "1", {"id": "old"})
+    ads.put("new", "1", {"id": "new"})
+    pages.put("duckduckgo", "LIA Java", b"<html/>")
+
+    old = (NOW - timedelta(days=cfg.retention.ad_cache_days + 1)).timestamp()
+    os.utime(ads._path("old"), (old, old))
+    recent = (NOW - timedelta(days=1)).timestamp()
+    os.utime(ads._path("new"), (recent, recent))
+    os.utime(pages._path("duckduckgo", "LIA Java"), (recent, recent))
+
+    report = run_retention(cfg, now=NOW, force=True)
+
+    assert report.cache_removed == 2  # the unused ad + the page past its TTL
+    assert ads.get("new", "1") == {"id": "new"}
+    assert ads.get("old", "1") is None
+
+
+def test_cache_mtimes_follow_an_injected_clock(cfg):
+    _index_two(cfg)
+    later = NOW + timedelta(days=cfg.retention.ad_cache_days + 5)
+    ads = ad_cache(cfg, clock=lambda: NOW)
+    ads.put("kept", "1", {"id": "kept"})
+    ads.put("unused", "1", {"id": "unused"})
+    assert os.path.getmtime(ads._path("kept")) == NOW.timestamp()
+
+    # A hit on the simulated clock counts as use then, not at the wall-clock time.
+    assert ad_cache(cfg, clock=lambda: later).get("kept", "1") == {"id": "kept"}
+    assert os.path.getmtime(ads._path("kept")) == later.timestamp()
+
+    report = run_retention(cfg, now=later + timedelta(days=1), force=True)
+    assert report.cache_removed == 1
+    assert ads.get("kept", "1") is not None and ads.get("unused", "1") is None
+
+
+def test_listings_json_keeps_every_open_listing(cfg):
+    def tick(listings, now):
+        with open_seen_index(cfg) as seen:
+            persist_results(cfg, listings, {}, {}, seen, now=_iso(now))
+        return [x["url"] for x in load_listings_json(cfg)]
+
+    a = ScoredListing(title="LIA A", company="A", location="", url="https://x/a", score=3.0,
+                      deadline=_iso(NOW + timedelta(days=5)))
+    b = ScoredListing(title="LIA B", company="B", location="", url="https://x/b", score=5.0,
+                      deadline=_iso(NOW + timedelta(days=30)))
+
+    # An incremental tick only returns b; a stays in the snapshot.
+    assert tick([a], NOW) == ["https://x/a"]
+    assert tick([b], NOW + timedelta(hours=1)) == ["https://x/b", "https://x/a"]
+
+    # Once a's deadline (+ grace) has passed, retention expires it from the snapshot too.
+    assert tick([], NOW + timedelta(days=10)) == ["https://x/b"]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+from array import array
+from pathlib import Path
+
+from src.storage.seen import BloomFilter, SeenIndex, open_seen_index, url_key
+
+
+def _urls(n: int, prefix: str = "https://x/ad/") -> list:
+    return [f"{prefix}{i}" for i in range(n)]
+
+
+def _base_keys(root: Path) -> list:
+    keys = array("Q")
+    keys.frombytes((root / "base.u64").read_bytes())
+    return list(keys)
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives(tmp_path):
+    keys = [url_key(u) for u in _urls(2000)]
+    bloom = BloomFilter.for_keys(keys, len(keys))
+    assert all(k in bloom for k in keys)
+
+    others = [url_key(u) for u in _urls(2000, "https://y/ad/")]
+    assert sum(k in bloom for k in others) < 0.02 * len(others)
+
+    bloom.save(tmp_path / "b.bloom")
+    loaded = BloomFilter.load(tmp_path / "b.bloom")
+    assert loaded is not None and loaded.data == bloom.data and loaded.hashes == bloom.hashes
+    assert BloomFilter.load(tmp_path / "missing.bloom") is None
+
+
+def test_add_then_merge_at_threshold_into_sorted_base(tmp_path):
+    root = tmp_path / "seen"
+    urls = _urls(5)
+    with SeenIndex(root, merge_threshold=5) as seen:
+        assert seen.add(urls[0]) is True
+        assert seen.add(urls[0]) is False
+        assert urls[0] in seen and urls[1] not in seen
+
+        for u in urls[1:4]:
+            seen.add(u)
+        seen.flush()  # 4 keys: below the threshold, still in the log
+        assert not (root / "base.u64").exists()
+        assert (root / "log.u64").stat().st_size == 4 * 8
+
+        seen.add(urls[4])
+        seen.flush()  # 5 keys: merged
+        assert (root / "log.u64").stat().st_size == 0
+        base = _base_keys(root)
+        assert base == sorted({url_key(u) for u in urls})
+        assert all(u in seen for u in urls) and len(seen) == 5
+
+
+def test_reopen_from_disk_sees_base_and_log(tmp_path):
+    root = tmp_path / "seen"
+    with SeenIndex(root, merge_threshold=3) as seen:
+        for u in _urls(3):
+            seen.add(u)          # merged into the base on close
+    with SeenIndex(root, merge_threshold=3) as seen:
+        seen.add("https://x/late")  # stays in the log
+
+    (root / "base.bloom").unlink()  # rebuilt from the base if missing
+    with SeenIndex(root, merge_threshold=3) as seen:
+        assert len(seen) == 4
+        assert all(u in seen for u in _urls(3)) and "https://x/late" in seen
+        assert "https://x/never" not in seen
+    assert (root / "base.bloom").exists()
+
+
+def test_remove_forgets_urls_in_base_and_log(tmp_path):
+    root = tmp_path / "seen"
+    with SeenIndex(root, merge_threshold=3) as seen:
+        for u in _urls(3):
+            seen.add(u)
+        seen.flush()
+        seen.add("https://x/pending")
+
+        assert seen.remove(["https://x/ad/1", "https://x/pending", "https://x/unknown"]) == 2
+        assert "https://x/ad/1" not in seen and "https://x/pending" not in seen
+        assert seen.remove(["https://x/ad/1"]) == 0
+
+    with SeenIndex(root) as seen:
+        assert len(seen) == 2
+        assert "https://x/ad/0" in seen and "https://x/ad/2" in seen and "https://x/ad/1" not in seen
+
+
+def test_legacy_seen_ads_json_is_imported_once(cfg):
+    data = Path(cfg.output.data_dir)
+    data.mkdir(parents=True)
+    (data / "seen_ads.json").write_text(json.dumps(["https://x/a", "https://x/b"]), encoding="utf-8")
+
+    with open_seen_index(cfg) as seen:
+        assert "https://x/a" in seen and "https://x/b" in seen
+        assert _base_keys(data / "seen") == sorted({url_key("https://x/a"), url_key("https://x/b")})
+        seen.remove(["https://x/a"])
+
+    # The index is no longer empty, so the legacy file is not read again.
+    with open_seen_index(cfg) as seen:
+        assert "https://x/a" not in seen and "https://x/b" in seen
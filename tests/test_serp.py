@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src.discovery.serp import parse_serp
+from tests.bench_serp import PAGES, bench, parse_serp_bs4
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+REPO = FIXTURES.parent.parent
+
+LINKEDIN_AD = "https://se.linkedin.com/jobs/view/lia-java-utvecklare-at-kodbolaget-ab-4012345678"
+
+
+def test_duckduckgo_results():
+    page = parse_serp("duckduckgo", (FIXTURES / "serp_duckduckgo.html").read_bytes())
+
+    assert not page.blocked
+    # The ad is skipped; redirect links are unwrapped to the target.
+    assert [r.url for r in page.results] == [
+        LINKEDIN_AD,
+        "https://se.linkedin.com/jobs/view/praktik-backend-at-nordbank-4012349999",
+        "https://se.linkedin.com/jobs/java-jobb",
+    ]
+    first = page.results[0]
+    assert first.title == "Kodbolaget AB hiring LIA Java-utvecklare in Stockholm | LinkedIn"
+    assert first.snippet == "Vi söker en LIA-student inom Java och Spring Boot till vårt team i Kista."
+    assert page.results[2].snippet == ""
+
+
+def test_bing_results():
+    page = parse_serp("bing", (FIXTURES / "serp_bing.html").read_bytes())
+
+    assert not page.blocked
+    # Tracking links are decoded; the ad block isn't a b_algo result.
+    assert [r.url for r in page.results] == [
+        LINKEDIN_AD,
+        "https://www.jobbsafari.se/jobb/lia-backend-java-stockholm-123456",
+        "https://se.linkedin.com/jobs/java-jobb",
+    ]
+    assert page.results[1].title == "LIA backend Java, Stockholm - Jobbsafari"
+    assert page.results[1].snippet.startswith("Lärande i arbete hos ett fintechbolag")
+
+
+@pytest.mark.parametrize("engine", ["bing", "duckduckgo"])
+def test_bot_check_pages_are_blocked(engine):
+    # Saved from real runs: both engines answered with a bot check.
+    page = parse_serp(engine, (REPO / "data" / f"debug_{engine}.html").read_bytes())
+    assert page.blocked
+    assert page.results == []
+
+
+@pytest.mark.parametrize("engine", ["bing", "duckduckgo"])
+def test_lxml_parser_matches_beautifulsoup(engine):
+    pytest.importorskip("bs4")
+    content = (FIXTURES / f"serp_{engine}.html").read_bytes()
+    lxml_page, bs4_page = parse_serp(engine, content), parse_serp_bs4(engine, content)
+    assert [(r.url, r.title) for r in lxml_page.results] == [(r.url, r.title) for r in bs4_page.results]
+
+
+def test_unknown_engine_and_empty_page():
+    assert parse_serp("altavista", b"<html/>").results == []
+    assert parse_serp("bing", b"").results == []
+
+
+def test_lxml_parser_is_faster_than_beautifulsoup():
+    pytest.importorskip("bs4")
+    rows = bench(rounds=5)
+
+    assert len(rows) == len(PAGES)
+    for row in rows:
+        print(f"{row['page']}: lxml {row['lxml']:.2f} ms/page, bs4 {row['bs4']:.2f} ms/page")
+        assert row["lxml"] < row["bs4"], row
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import csv
+
+from src.monitor.soak import run_soak
+
+
+def test_soak_runs_the_monitor_tick_against_the_stub_board(cfg, tmp_path):
+    report = run_soak(cfg, tmp_path / "soak", days=2, fault_rate=0.0, sample_every=24)
+
+    assert report.ticks == 96 and report.errors == 0
+    assert report.seen > 0
+    rows = list(csv.DictReader(open(report.csv_path, encoding="utf-8")))
+    assert sum(int(r["hits"]) for r in rows) > 0
+    # Two-phase fetch: full ads land in the detail cache.
+    assert report.storage_end["cache"] > 0
+
+
+def test_soak_ticks_fail_like_the_daemons(cfg, tmp_path):
+    # Every request fails: each tick errors, is counted, and the run goes on.
+    report = run_soak(cfg, tmp_path / "soak", days=0.5, fault_rate=1.0)
+
+    assert report.ticks == 24
+    assert report.error_types == {"ConnectError": 24}
+    assert "simulated outage" in (tmp_path / "soak" / "soak.log").read_text(encoding="utf-8")
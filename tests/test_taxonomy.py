@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timezone
+
+from src.discovery.fetch import build_queries, build_search_params, server_exclusions
+from src.discovery.taxonomy import resolve_location_params
+
+
+STOCKHOLM_LAN = {"region": ["CifL_Rzy_Mku"]}
+
+
+def _with_query(cfg, **kw):
+    return replace(cfg, search=replace(cfg.search, query=replace(cfg.search.query, **kw)))
+
+
+def test_locations_resolve_to_concept_ids_all_or_nothing():
+    assert resolve_location_params(["Stockholm"]) == STOCKHOLM_LAN
+    # The city and its län are the same region, sent once.
+    assert resolve_location_params([" stockholm ", "Stockholms län"]) == STOCKHOLM_LAN
+    assert resolve_location_params(["Stockholm", "Uppsala kommun"]) == {
+        "region": ["CifL_Rzy_Mku"], "municipality": ["otaF_bQY_4ZD"],
+    }
+    # One unknown place keeps the whole query on free text.
+    assert resolve_location_params(["Stockholm", "Solna"]) is None
+    assert resolve_location_params(["Solna"], {"Solna": "municipality:zHxw_uJZ_NJ8", "Kista": "bogus"}) == {
+        "municipality": ["zHxw_uJZ_NJ8"],
+    }
+    assert resolve_location_params([]) is None
+
+
+def test_queries_carry_the_location_text(cfg):
+    queries = build_queries(cfg)
+    assert queries[0] == "LIA Java Stockholm"
+    assert len(queries) == len(set(queries))
+    assert "LIA Java distans" in queries  # remote_ok
+
+
+def test_search_params_strip_the_city_and_exclude_terms(cfg):
+    loc = resolve_location_params(cfg.search.locations)
+    params = build_search_params(cfg, "LIA Java Stockholm", loc)
+
+    # Single words only: "fast anställning" and "full-time" stay with the local gate.
+    assert server_exclusions(cfg) == ["tillsvidare", "heltid", "senior", "lead", "principal", "permanent"]
+    assert params["q"] == "LIA Java -tillsvidare -heltid -senior -lead -principal -permanent"
+    assert params["region"] == STOCKHOLM_LAN["region"]
+    assert params["limit"] == cfg.search.query.max_per_query
+
+    # Remote queries have no city suffix: no location filter, text unchanged.
+    remote = build_search_params(cfg, "LIA Java distans", loc, exclusions=[])
+    assert remote["q"] == "LIA Java distans" and "region" not in remote
+
+    # Unresolvable locations keep the free-text city.
+    assert build_search_params(cfg, "LIA Java Stockholm", None, exclusions=[])["q"] == "LIA Java Stockholm"
+
+
+def test_search_params_published_after_only_when_incremental(cfg):
+    now = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+    last = "2026-06-01T10:00:00+00:00"
+
+    params = build_search_params(_with_query(cfg, incremental=True), "LIA Java", None, last, now)
+    assert params["published-after"] == 120 + cfg.search.query.incremental_overlap_minutes
+    assert "published-after" not in build_search_params(_with_query(cfg, incremental=False), "LIA Java", None, last, now)
+
+    off = build_search_params(_with_query(cfg, server_filters=False), "LIA Java Stockholm", STOCKHOLM_LAN, last, now)
+    assert off == {"q": "LIA Java Stockholm", "limit": cfg.search.query.max_per_query}
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from datetime import date
+
+from src.outreach.tracker import ApplicationTracker
+
+
+def _state(tracker: ApplicationTracker) -> dict:
+    return {k: asdict(v) for k, v in sorted(tracker.companies.items())}
+
+
+def _fill(tracker: ApplicationTracker) -> None:
+    tracker.sent("Acme AB", url="https://x/1", follow_up_days=0)
+    tracker.record("follow_up_due", "Acme AB", due="2026-06-03", ts="2026-06-01T09:00:00+00:00")
+    tracker.sent("Beta Konsult AB", follow_up_days=0)
+    tracker.record("follow_up_due", "Beta Konsult AB", due="2026-06-10", ts="2026-06-01T09:00:00+00:00")
+    tracker.record("replied", "acme ab")
+    tracker.sent("Gamma AB", follow_up_days=0)
+    tracker.record("follow_up_due", "Gamma AB", due="2026-06-05", ts="2026-06-01T09:00:00+00:00")
+
+
+def test_snapshot_plus_tail_equals_full_replay(tmp_path):
+    with ApplicationTracker(tmp_path, snapshot_every=3) as tracker:
+        _fill(tracker)
+        expected = _state(tracker)
+    assert (tmp_path / "tracker_snapshot.json.gz").exists()
+
+    reloaded = ApplicationTracker(tmp_path, snapshot_every=3)
+    assert 0 < reloaded.tail < 3  # the snapshot covers most of the log, the rest is replayed
+    assert _state(reloaded) == expected
+
+    (tmp_path / "tracker_snapshot.json.gz").unlink()
+    replayed = ApplicationTracker(tmp_path, snapshot_every=3)
+    assert _state(replayed) == expected and replayed.seq == reloaded.seq == 7
+
+
+def test_snapshot_taken_every_n_events(tmp_path):
+    tracker = ApplicationTracker(tmp_path, snapshot_every=3)
+    tracker.record("sent", "A AB")
+    tracker.record("sent", "B AB")
+    assert not (tmp_path / "tracker_snapshot.json.gz").exists() and tracker.tail == 2
+
+    tracker.record("sent", "C AB")
+    assert (tmp_path / "tracker_snapshot.json.gz").exists() and tracker.tail == 0
+
+    tracker.record("sent", "D AB")
+    assert tracker.tail == 1
+
+
+def test_torn_last_line_is_ignored_and_overwritten(tmp_path):
+    with ApplicationTracker(tmp_path) as tracker:
+        tracker.record("sent", "Acme AB")
+    log = tmp_path / "events.jsonl"
+    with open(log, "ab") as f:
+        f.write(b'{"seq": 2, "ts": "2026-06-01T09:00:00+00:00", "type": "repl')
+
+    tracker = ApplicationTracker(tmp_path)
+    assert tracker.seq == 1 and tracker.get("Acme AB").status == "sent"
+
+    tracker.record("replied", "Acme AB")
+    lines = log.read_bytes().splitlines()
+    assert [json.loads(l)["type"] for l in lines] == ["sent", "replied"]
+    assert ApplicationTracker(tmp_path).get("Acme AB").status == "replied"
+
+
+def test_follow_ups_due_this_week(tmp_path):
+    tracker = ApplicationTracker(tmp_path)
+    _fill(tracker)
+
+    due = tracker.follow_ups_due(date(2026, 6, 7))
+    # Acme replied, so its follow-up is cleared; Beta is due later.
+    assert [c.name for c in due] == ["Gamma AB"]
+    assert [c.name for c in tracker.follow_ups_due(date(2026, 6, 30))] == ["Gamma AB", "Beta Konsult AB"]
+
+    tracker.record("rejected", "Gamma AB")
+    assert tracker.follow_ups_due(date(2026, 6, 7)) == []
+
+
+def test_companies_not_contacted(tmp_path):
+    tracker = ApplicationTracker(tmp_path)
+    tracker.sent("Acme AB")
+    tracker.record("follow_up_due", "Delta AB", due="2026-06-03")  # scheduled but never sent
+
+    names = ["ACME AB", "Beta Konsult AB", "Delta AB"]
+    assert tracker.not_contacted(names) == ["Beta Konsult AB", "Delta AB"]
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+import httpx
+
+from src.discovery.serp import ENGINES
+from src.discovery.web_search import backed_off_until, iter_web_search
+from src.discovery.web_sources import Source
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+REPO = FIXTURES.parent.parent
+
+DDG = Source(name="WebSearch:duckduckgo", kind="web_search", base_url=ENGINES["duckduckgo"])
+
+
+def _web_cfg(cfg):
+    ws = replace(cfg.web_search, enabled=True, queries=["LIA Java", "LIA backend", "praktik Java"], concurrency=1)
+    return replace(cfg, web_search=ws)
+
+
+def _serve(page: Path, agents: list):
+    def handle(request: httpx.Request) -> httpx.Response:
+        agents.append(request.headers["User-Agent"])
+        return httpx.Response(200, content=page.read_bytes())
+    return httpx.MockTransport(handle)
+
+
+def test_results_are_gated_and_cached(cfg):
+    cfg = _web_cfg(cfg)
+    agents: list = []
+    batches = list(iter_web_search(cfg, [DDG], transport=_serve(FIXTURES / "serp_duckduckgo.html", agents)))
+
+    assert len(batches) == 3 and len(agents) == 3
+    assert agents[0] == "LIA_FINDER_AI_ASSISTANT/1.0"
+    kept = [l.url for b in batches for l in b.kept]
+    # Same page for every query: the LinkedIn ad is kept once.
+    assert kept.count("https://se.linkedin.com/jobs/view/lia-java-utvecklare-at-kodbolaget-ab-4012345678") == 1
+
+    list(iter_web_search(cfg, [DDG], transport=_serve(FIXTURES / "serp_duckduckgo.html", agents)))
+    assert len(agents) == 3  # second run served from data/cache/serp
+
+
+def test_bot_check_backs_the_engine_off(cfg):
+    cfg = _web_cfg(cfg)
+    agents: list = []
+    batches = list(iter_web_search(cfg, [DDG], transport=_serve(REPO / "data" / "debug_duckduckgo.html", agents)))
+
+    # The first bot check stops the remaining queries.
+    assert len(agents) == 1
+    assert [b.hits for b in batches] == [0]
+    assert "duckduckgo" in backed_off_until(cfg)
+
+    assert list(iter_web_search(cfg, [DDG], transport=_serve(FIXTURES / "serp_duckduckgo.html", agents))) == []
+    assert len(agents) == 1
+
+
+def test_rate_limit_counts_as_a_bot_check(cfg):
+    cfg = _web_cfg(cfg)
+    transport = httpx.MockTransport(lambda request: httpx.Response(429))
+    batches = list(iter_web_search(cfg, [DDG], transport=transport))
+
+    assert len(batches) == 1
+    assert "duckduckgo" in backed_off_until(cfg)
+
+
+def test_unparseable_page_fails_only_its_query(cfg):
+    cfg = _web_cfg(cfg)
+    results = (FIXTURES / "serp_duckduckgo.html").read_bytes()
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        # Whitespace-only body: lxml raises ParserError("Document is empty").
+        return httpx.Response(200, content=b"   " if request.url.params["q"].endswith("LIA backend") else results)
+
+    batches = list(iter_web_search(cfg, [DDG], transport=httpx.MockTransport(handle)))
+    assert sorted(b.query for b in batches) == ["[duckduckgo] LIA Java", "[duckduckgo] praktik Java"]